@@ -0,0 +1,86 @@
+"""
+Columnar I/O Benchmark
+Compares loading a graph from Python literals, from a Parquet edge table
+into a connections dict, and from Parquet ID tables into a CompactGraph.
+
+Run with: python -m benchmarks.bench_columnar_io
+"""
+
+import ast
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import random_connections
+from columnar_io import read_edges, read_graph, write_edges, write_graph
+from graph_core import CompactGraph
+
+NUM_USERS = 100_000
+AVG_DEGREE = 20
+
+
+def _measure(load, pa):
+   start = time.perf_counter()
+   result = load()
+   elapsed = time.perf_counter() - start
+   # Tracing slows allocation-heavy loaders down, so memory gets its own run;
+   # Arrow buffers live outside the Python heap and are counted by a proxy pool
+   default_pool = pa.default_memory_pool()
+   pool = pa.proxy_memory_pool(default_pool)
+   pa.set_memory_pool(pool)
+   tracemalloc.start()
+   try:
+      load()
+      _, peak = tracemalloc.get_traced_memory()
+   finally:
+      tracemalloc.stop()
+      pa.set_memory_pool(default_pool)
+   return result, elapsed, peak, pool.max_memory()
+
+
+def main():
+   """Run the benchmark and print load time and peak Python and Arrow allocation per format."""
+   try:
+      import pyarrow as pa
+   except ImportError:
+      print("pyarrow is not installed; skipping the columnar I/O benchmark")
+      return
+   connections = random_connections(NUM_USERS, AVG_DEGREE, seed=49)
+   directory = tempfile.mkdtemp()
+   try:
+      literal_path = os.path.join(directory, "connections.py")
+      with open(literal_path, "w") as f:
+         f.write(repr(connections))
+      edges_path = os.path.join(directory, "edges.parquet")
+      write_edges(connections, edges_path)
+      graph_dir = os.path.join(directory, "graph")
+      write_graph(CompactGraph.from_connections(connections), graph_dir)
+
+      def literal():
+         with open(literal_path) as f:
+            return ast.literal_eval(f.read())
+
+      loaders = [
+         ("dict/set literal", literal_path, literal),
+         ("edge table -> dict", edges_path, lambda: read_edges(edges_path)),
+         ("edge table -> CSR", edges_path, lambda: CompactGraph.from_connections(read_edges(edges_path))),
+         ("ID tables -> CSR", graph_dir, lambda: read_graph(graph_dir)),
+      ]
+      print(f"{NUM_USERS} users, {sum(map(len, connections.values()))} directed edges")
+      print(f"{'format':<20} {'file MiB':>9} {'seconds':>8} {'peak MiB':>9} {'arrow MiB':>10}")
+      for name, path, load in loaders:
+         if os.path.isdir(path):
+            size = sum(os.path.getsize(os.path.join(path, entry)) for entry in os.listdir(path))
+         else:
+            size = os.path.getsize(path)
+         result, elapsed, peak, arrow_peak = _measure(load, pa)
+         assert len(result) == len(connections)
+         print(f"{name:<20} {size / 2**20:>9.2f} {elapsed:>8.2f} {peak / 2**20:>9.1f} {arrow_peak / 2**20:>10.1f}")
+   finally:
+      shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+   main()
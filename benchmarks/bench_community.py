@@ -0,0 +1,38 @@
+"""
+Community Detection Benchmark
+Reports runtime and modularity of label propagation and Louvain across graph sizes.
+
+Run with: python -m benchmarks.bench_community
+"""
+
+import time
+
+from benchmarks.synthetic import planted_partition_connections
+from community import label_propagation, louvain, modularity
+from graph_core import CompactGraph
+
+SIZES = (1_000, 10_000, 50_000)
+CONFIGS = (
+   ("label_propagation", label_propagation, 1, "thread"),
+   ("label_propagation", label_propagation, 4, "process"),
+   ("louvain", louvain, 1, "thread"),
+   ("louvain", louvain, 4, "process"),
+)
+
+
+def main():
+   """Run the benchmark and print one row per configuration."""
+   print(f"{'users':>8} {'edges':>9} {'method':<18} {'workers':>7} {'executor':<8} {'seconds':>8} {'Q':>7}")
+   for size in SIZES:
+      connections, _ = planted_partition_connections(size, max(2, size // 100), 8, 2, seed=size)
+      graph = CompactGraph.from_connections(connections, undirected=True)
+      for name, detect, workers, executor in CONFIGS:
+         start = time.perf_counter()
+         labels = detect(graph, workers=workers, executor=executor)
+         elapsed = time.perf_counter() - start
+         score = modularity(graph, labels)
+         print(f"{size:>8} {graph.num_edges:>9} {name:<18} {workers:>7} {executor:<8} {elapsed:>8.3f} {score:>7.4f}")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,58 @@
+"""
+Compressed Adjacency Benchmark
+Reports the compression ratio of the block-compressed adjacency against the
+uncompressed CSR and dict-of-sets forms, and its query slowdown.
+
+Run with: python -m benchmarks.bench_compressed_graph
+"""
+
+import random
+import sys
+import timeit
+
+from benchmarks.synthetic import random_connections
+from compressed_graph import CompressedGraph
+from graph_core import CompactGraph
+
+NUM_USERS = 50_000
+AVG_DEGREE = 40
+BLOCK_SIZES = (16, 64, 256)
+NUM_QUERIES = 2_000
+
+
+def _dict_bytes(connections):
+   total = sys.getsizeof(connections)
+   for name, friends in connections.items():
+      total += sys.getsizeof(name) + sys.getsizeof(friends)
+   return total
+
+
+def _best(statement, repeat=3):
+   return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main():
+   """Run the benchmark and print memory and query time per block size."""
+   connections = random_connections(NUM_USERS, AVG_DEGREE, seed=23)
+   compact = CompactGraph.from_connections(connections)
+   rng = random.Random(23)
+   users = sorted(connections)
+   pairs = [(rng.choice(users), rng.choice(users)) for _ in range(NUM_QUERIES)]
+
+   csr_bytes = len(compact.offsets) * compact.offsets.itemsize + len(compact.targets) * compact.targets.itemsize
+   baseline_edge = _best(lambda: [compact.has_edge(a, b) for a, b in pairs])
+   baseline_mutual = _best(lambda: [compact.mutual_neighbors(a, b) for a, b in pairs])
+   print(f"{NUM_USERS} users, {compact.num_edges} edges")
+   print(f"dict of sets: {_dict_bytes(connections) / 2**20:.1f} MiB, CSR: {csr_bytes / 2**20:.1f} MiB")
+   print(f"{'block':>6} {'MiB':>7} {'vs CSR':>7} {'bits/edge':>9} {'edge x':>7} {'mutual x':>8}")
+   for block_size in BLOCK_SIZES:
+      compressed = CompressedGraph.from_graph(compact, block_size)
+      size = compressed.nbytes()
+      edge = _best(lambda: [compressed.has_edge(a, b) for a, b in pairs])
+      mutual = _best(lambda: [compressed.mutual_neighbors(a, b) for a, b in pairs])
+      print(f"{block_size:>6} {size / 2**20:>7.2f} {csr_bytes / size:>6.1f}x {8 * size / compact.num_edges:>9.1f} "
+            f"{edge / baseline_edge:>6.1f}x {mutual / baseline_mutual:>7.1f}x")
+
+
+if __name__ == "__main__":
+   main()
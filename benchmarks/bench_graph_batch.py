@@ -0,0 +1,112 @@
+"""
+Graph Batch Benchmark
+Compares applying a mixed stream of edge and membership changes through a
+GraphBatch with applying them one at a time to the data and every index.
+
+Run with: python -m benchmarks.bench_graph_batch
+"""
+
+import copy
+import itertools
+import random
+import time
+
+from benchmarks.synthetic import random_connections, random_groups
+from graph_batch import DensityCounter, GraphBatch, MembershipIndex, ReverseAdjacency
+
+NUM_USERS = 100_000
+AVG_DEGREE = 20
+NUM_GROUPS = 200
+BATCH_SIZES = (1_000, 10_000, 100_000)
+RUN_LENGTHS = (1, 50)
+REPEAT = 3
+
+
+def _operations(connections, groups, count, rng, run_length=1):
+   """Random changes; run_length > 1 gives runs of the same change to one user or group."""
+   users = sorted(connections)
+   names = sorted(groups)
+   operations = []
+   for step in range(count):
+      if step % run_length == 0:
+         user = rng.choice(users)
+         group = rng.choice(names)
+         roll = rng.random()
+      if roll < 0.5:
+         operations.append(("add_edge", user, rng.choice(users)))
+      elif roll < 0.7 and connections[user]:
+         operations.append(("remove_edge", user, rng.choice(sorted(connections[user]))))
+      elif roll < 0.9:
+         operations.append(("add_member", group, rng.choice(users)))
+      else:
+         operations.append(("remove_member", group, rng.choice(users)))
+   return operations
+
+
+def _indexes(connections, groups):
+   return [ReverseAdjacency(connections), MembershipIndex(groups),
+           *(DensityCounter(groups[name], connections) for name in sorted(groups)[:5])]
+
+
+def apply_one_by_one(connections, groups, indexes, operations):
+   """Apply every change directly, updating all indexes each time."""
+   for op, owner, member in operations:
+      if op == "add_edge":
+         friends = connections.setdefault(owner, set())
+         if member not in friends:
+            friends.add(member)
+            for index in indexes:
+               if hasattr(index, "add_edge"):
+                  index.add_edge(owner, member)
+      elif op == "remove_edge":
+         if member in connections.get(owner, ()):
+            connections[owner].discard(member)
+            for index in indexes:
+               if hasattr(index, "remove_edge"):
+                  index.remove_edge(owner, member)
+      elif op == "add_member":
+         members = groups.setdefault(owner, set())
+         if member not in members:
+            members.add(member)
+            for index in indexes:
+               if hasattr(index, "add_member"):
+                  index.add_member(owner, member)
+      elif member in groups.get(owner, ()):
+         groups[owner].discard(member)
+         for index in indexes:
+            if hasattr(index, "remove_member"):
+               index.remove_member(owner, member)
+
+
+def apply_batched(connections, groups, indexes, operations):
+   """Queue every change in a GraphBatch and commit once."""
+   with GraphBatch(connections, groups, indexes) as batch:
+      queue = {"add_edge": batch.add_edge, "remove_edge": batch.remove_edge,
+               "add_member": batch.add_member, "remove_member": batch.remove_member}
+      for op, owner, member in operations:
+         queue[op](owner, member)
+
+
+def main():
+   """Run the benchmark and print changes per second for both strategies."""
+   connections = random_connections(NUM_USERS, AVG_DEGREE, seed=37)
+   groups = random_groups(sorted(connections), NUM_GROUPS, 2_000, seed=37)
+   print(f"{'batch':>7} {'run':>4} {'single/s':>10} {'batched/s':>10} {'speedup':>8}")
+   for size, run_length in itertools.product(BATCH_SIZES, RUN_LENGTHS):
+      operations = _operations(connections, groups, size, random.Random(size), run_length)
+      timings = []
+      for apply in (apply_one_by_one, apply_batched):
+         best = float("inf")
+         for _ in range(REPEAT):
+            data, memberships = copy.deepcopy(connections), copy.deepcopy(groups)
+            indexes = _indexes(data, memberships)
+            start = time.perf_counter()
+            apply(data, memberships, indexes, operations)
+            best = min(best, time.perf_counter() - start)
+         timings.append(best)
+      print(f"{size:>7} {run_length:>4} {size / timings[0]:>10.0f} {size / timings[1]:>10.0f} "
+            f"{timings[0] / timings[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,55 @@
+"""
+Graph Modes Benchmark
+Compares the memory and query time of the upper-triangular undirected graph
+with a symmetric CSR graph. Edge checks run on the upper triangle alone; the
+first neighborhood query builds the reverse index, whose build time and
+memory are reported separately.
+
+Run with: python -m benchmarks.bench_graph_modes
+"""
+
+import random
+import timeit
+
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph
+from graph_modes import UpperTriangularGraph
+
+NUM_USERS = 100_000
+AVG_DEGREE = 20
+NUM_QUERIES = 5_000
+
+
+def _best(statement, repeat=3):
+   return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main():
+   """Run the benchmark and print memory and query time per layout."""
+   connections = random_connections(NUM_USERS, AVG_DEGREE, seed=43)
+   symmetric = CompactGraph.from_connections(connections, undirected=True)
+   upper = UpperTriangularGraph.from_connections(connections)
+   rng = random.Random(43)
+   users = sorted(connections)
+   pairs = [(rng.choice(users), rng.choice(users)) for _ in range(NUM_QUERIES)]
+
+   def edge_us(graph):
+      return 1e6 * _best(lambda: [graph.has_edge(a, b) for a, b in pairs]) / NUM_QUERIES
+
+   def mutual_us(graph):
+      return 1e6 * _best(lambda: [graph.mutual_neighbors(a, b) for a, b in pairs]) / NUM_QUERIES
+
+   symmetric_bytes = 8 * (len(symmetric.offsets) + len(symmetric.targets))
+   rows = [("symmetric CSR", symmetric_bytes, edge_us(symmetric), f"{mutual_us(symmetric):.2f}"),
+           ("upper, edges only", upper.nbytes(), edge_us(upper), "-")]
+   build_time = timeit.timeit(upper.build_reverse_index, number=1)
+   rows.append(("upper + reverse index", upper.nbytes(), edge_us(upper), f"{mutual_us(upper):.2f}"))
+
+   print(f"{NUM_USERS} users, {upper.num_edges} undirected edges")
+   print(f"reverse index built on first neighborhood query in {build_time:.2f} s")
+   print(f"{'layout':<22} {'MiB':>7} {'edge us':>8} {'mutual us':>10}")
+   for name, size, edge_time, mutual_time in rows:
+      print(f"{name:<22} {size / 2**20:>7.2f} {edge_time:>8.2f} {mutual_time:>10}")
+
+if __name__ == "__main__":
+   main()
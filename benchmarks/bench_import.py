@@ -0,0 +1,89 @@
+"""
+Import Time Benchmark
+Measures the cumulative import time of the analysis module with
+``python -X importtime`` and fails if it exceeds the startup budget or pulls
+in a heavy back end.
+
+Run with: python -m benchmarks.bench_import [--budget-ms 25]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULE = "skeleton"
+RUNS = 15
+DEFAULT_BUDGET_MS = 25.0
+HEAVY_MODULES = (
+   "numpy",
+   "pyarrow",
+   "mmap",
+   "multiprocessing",
+   "concurrent.futures",
+   "tempfile",
+   "threading",
+   "re",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_us(module=MODULE):
+   """
+   Import a module in a fresh interpreter and read its cumulative import time.
+
+   Args:
+       module (str): Module to import
+
+   Returns:
+       int: Cumulative import time in microseconds
+   """
+   completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=ROOT, capture_output=True, text=True, check=True)
+   for line in completed.stderr.splitlines():
+      fields = [field.strip() for field in line.split("|")]
+      if len(fields) == 3 and fields[2] == module:
+         return int(fields[1])
+   raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def loaded_heavy_modules(module=MODULE):
+   """
+   List the heavy back-end modules loaded by a plain import.
+
+   Args:
+       module (str): Module to import
+
+   Returns:
+       list: Names from HEAVY_MODULES present in sys.modules after the import
+   """
+   code = (f"import sys, {module}\n"
+           f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+   completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+   output = completed.stdout.strip()
+   return output.split(",") if output else []
+
+
+def main():
+   """Measure import time, print a summary and exit non-zero on a regression."""
+   parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+   parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+   args = parser.parse_args()
+
+   import_time_us()  # warm the bytecode cache
+   samples = [import_time_us() / 1000 for _ in range(RUNS)]
+   median = statistics.median(samples)
+   heavy = loaded_heavy_modules()
+   print(f"import {MODULE}: median {median:.2f} ms, min {min(samples):.2f} ms, "
+         f"max {max(samples):.2f} ms over {RUNS} runs (budget {args.budget_ms:.1f} ms)")
+   print(f"heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+
+   if median > args.budget_ms or heavy:
+      print("FAILED: startup latency regression")
+      sys.exit(1)
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,46 @@
+"""
+Multi-Source BFS Benchmark
+Compares batched multi-source BFS with one traversal per seed.
+
+Run with: python -m benchmarks.bench_msbfs
+"""
+
+import random
+import time
+
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph
+from lazy_analysis import iter_all_connections
+from msbfs import batch_find_all_connections
+
+NUM_USERS = 20_000
+NUM_SEEDS = 512
+DEPTHS = (2, 3)
+
+
+def main():
+   """Run the benchmark and print one row per depth."""
+   connections = random_connections(NUM_USERS, 8, seed=5)
+   graph = CompactGraph.from_connections(connections)
+   seeds = random.Random(5).sample(sorted(connections), NUM_SEEDS)
+
+   print(f"{'depth':>5} {'per-seed s':>10} {'ms-bfs s':>8} {'counts s':>8} {'seeds/s':>9} {'speedup':>7}")
+   for depth in DEPTHS:
+      start = time.perf_counter()
+      expected = {seed: set(iter_all_connections(seed, connections, depth)) for seed in seeds}
+      loop_time = time.perf_counter() - start
+
+      start = time.perf_counter()
+      reached = batch_find_all_connections(seeds, graph, depth)
+      batch_time = time.perf_counter() - start
+      assert reached == expected
+
+      start = time.perf_counter()
+      batch_find_all_connections(seeds, graph, depth, counts_only=True)
+      count_time = time.perf_counter() - start
+      print(f"{depth:>5} {loop_time:>10.2f} {batch_time:>8.2f} {count_time:>8.2f} "
+            f"{NUM_SEEDS / count_time:>9.0f} {loop_time / count_time:>7.1f}")
+
+
+if __name__ == "__main__":
+   main()
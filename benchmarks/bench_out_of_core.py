@@ -0,0 +1,111 @@
+"""
+Out-of-Core Benchmark
+Writes a graph snapshot and compares BFS, connected components and degree
+statistics through buffer pools of several sizes with the in-memory path,
+reporting I/O volume and runtime.
+
+Run with: python -m benchmarks.bench_out_of_core
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import random_connections
+from graph_core import load_snapshot, save_snapshot
+from out_of_core import OutOfCoreGraph
+from reorder import reorder
+
+NUM_USERS = 200_000
+AVG_DEGREE = 10
+BFS_DEPTH = 6
+PAGE_SIZE = 64 * 1024
+POOL_PAGES = (4, 64, 1024)
+
+
+def _in_memory_bfs(graph, user, depth):
+   source = graph.interner.id_of(user)
+   visited = bytearray(graph.num_users)
+   visited[source] = 1
+   frontier = [source]
+   reached = 0
+   for _ in range(depth):
+      next_frontier = []
+      for uid in frontier:
+         for vid in graph.neighbors(uid):
+            if not visited[vid]:
+               visited[vid] = 1
+               next_frontier.append(vid)
+      reached += len(next_frontier)
+      frontier = next_frontier
+   return reached
+
+
+def _in_memory_components(graph):
+   parent = list(range(graph.num_users))
+
+   def find(uid):
+      while parent[uid] != uid:
+         parent[uid] = parent[parent[uid]]
+         uid = parent[uid]
+      return uid
+
+   for uid in range(graph.num_users):
+      for vid in graph.neighbors(uid):
+         root_u, root_v = find(uid), find(vid)
+         if root_u != root_v:
+            parent[max(root_u, root_v)] = min(root_u, root_v)
+   return parent
+
+
+def _in_memory_degrees(graph):
+   histogram = {}
+   for uid in range(graph.num_users):
+      degree = graph.degree(uid)
+      histogram[degree] = histogram.get(degree, 0) + 1
+   return histogram
+
+
+def _timed(function, *args):
+   start = time.perf_counter()
+   result = function(*args)
+   return result, time.perf_counter() - start
+
+
+def main():
+   """Run the benchmark and print runtime and I/O per buffer pool size."""
+   directory = tempfile.mkdtemp(prefix="ooc-bench-")
+   try:
+      graph, permutation = reorder(random_connections(NUM_USERS, AVG_DEGREE, seed=47), "rcm")
+      path = os.path.join(directory, "graph.snapshot")
+      save_snapshot(graph, path, permutation)
+      size = os.path.getsize(path)
+      user = "user1"
+      print(f"snapshot {size / 2**20:.1f} MiB, {graph.num_users} users, {len(graph.targets)} edges")
+
+      (loaded, _), load_time = _timed(load_snapshot, path)
+      reached, bfs_time = _timed(_in_memory_bfs, loaded, user, BFS_DEPTH)
+      _, memory_cc = _timed(_in_memory_components, loaded)
+      _, memory_degree = _timed(_in_memory_degrees, loaded)
+      print(f"{'mode':<14} {'load s':>7} {'bfs s':>7} {'cc s':>7} {'deg s':>7} {'MiB read':>9} {'pages':>7} {'hit %':>6}")
+      print(f"{'in memory':<14} {load_time:>7.2f} {bfs_time:>7.2f} {memory_cc:>7.2f} {memory_degree:>7.2f} "
+            f"{size / 2**20:>9.1f} {'-':>7} {'-':>6}")
+
+      for pages in POOL_PAGES:
+         with OutOfCoreGraph(path, PAGE_SIZE, pages) as disk:
+            found, disk_bfs = _timed(disk.find_all_connections, user, BFS_DEPTH)
+            assert len(found) == reached
+            _, cc_time = _timed(disk.component_labels)
+            _, degree_time = _timed(disk.degree_stats)
+            stats = disk.io_stats
+         hit_rate = stats["hits"] / max(1, stats["hits"] + stats["reads"])
+         label = f"pool {pages * PAGE_SIZE // 1024} KiB"
+         print(f"{label:<14} {'-':>7} {disk_bfs:>7.2f} {cc_time:>7.2f} {degree_time:>7.2f} "
+               f"{stats['bytes_read'] / 2**20:>9.1f} {stats['reads']:>7} {hit_rate:>6.1%}")
+   finally:
+      shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+   main()
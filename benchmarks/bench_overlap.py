@@ -0,0 +1,41 @@
+"""
+Group Overlap Benchmark
+Compares the one-pass overlap matrix with pairwise set intersections.
+
+Run with: python -m benchmarks.bench_overlap
+"""
+
+import time
+from itertools import combinations
+
+from benchmarks.synthetic import random_groups
+from overlap import overlap_matrix, top_k_overlaps
+
+CASES = ((100, 200), (500, 200), (2_000, 100))
+NUM_USERS = 100_000
+
+
+def main():
+   """Run the benchmark and print one row per group count."""
+   users = [f"user{i}" for i in range(NUM_USERS)]
+   print(f"{'groups':>6} {'pairs':>9} {'pairwise s':>10} {'matrix s':>8} {'top-10 s':>8}")
+   for num_groups, avg_size in CASES:
+      groups = random_groups(users, num_groups, avg_size, seed=num_groups)
+
+      start = time.perf_counter()
+      pairwise = {(a, b): len(groups[a] & groups[b]) for a, b in combinations(groups, 2)}
+      pairwise_time = time.perf_counter() - start
+
+      start = time.perf_counter()
+      matrix = overlap_matrix(groups)
+      matrix_time = time.perf_counter() - start
+      assert all(matrix.intersection_size(a, b) == size for (a, b), size in pairwise.items())
+
+      start = time.perf_counter()
+      top_k_overlaps(groups, 10, "jaccard", matrix)
+      top_time = time.perf_counter() - start
+      print(f"{num_groups:>6} {len(pairwise):>9} {pairwise_time:>10.3f} {matrix_time:>8.3f} {top_time:>8.3f}")
+
+
+if __name__ == "__main__":
+   main()
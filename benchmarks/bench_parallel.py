@@ -0,0 +1,94 @@
+"""
+Parallel Executor Benchmark
+Times the serial, thread and process backends on large set operations.
+
+Run once per interpreter build and compare the saved results, e.g.:
+    python3.13 -m benchmarks.bench_parallel --save gil.json
+    python3.13t -m benchmarks.bench_parallel --save nogil.json
+    python -m benchmarks.bench_parallel --compare gil.json nogil.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+
+import parallel
+from benchmarks.synthetic import random_connections
+
+SIZE = 1_000_000
+NUM_USERS = 200_000
+NUM_PAIRS = 200_000
+WORKERS = 4
+
+
+def _operations():
+   rng = random.Random(13)
+   group_a = {f"user{rng.randrange(2 * SIZE)}" for _ in range(SIZE)}
+   group_b = {f"user{rng.randrange(2 * SIZE)}" for _ in range(SIZE)}
+   connections = random_connections(NUM_USERS, 10, seed=13)
+   users = set(connections)
+   names = sorted(users)
+   pairs = [(rng.choice(names), rng.choice(names)) for _ in range(NUM_PAIRS)]
+   return {
+      "intersection": lambda: parallel.parallel_intersection(group_a, group_b),
+      "union": lambda: parallel.parallel_union(group_a, group_b),
+      "density": lambda: parallel.parallel_network_density(users, connections),
+      "batch_mutual": lambda: parallel.batch_mutual_connections(pairs, connections),
+   }
+
+
+def run():
+   """Time every operation on every backend and return the results."""
+   operations = _operations()
+   timings = {}
+   for backend in parallel.BACKENDS:
+      parallel.configure(backend, max_workers=WORKERS, min_parallel_size=1)
+      for name, operation in operations.items():
+         best = float("inf")
+         for _ in range(3):
+            start = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - start)
+         timings[f"{name}/{backend}"] = best
+      parallel.shutdown()
+   parallel.configure()
+   build = "nogil" if not parallel.gil_enabled() else "gil"
+   return {"python": platform.python_version(), "build": build, "timings": timings}
+
+
+def compare(paths):
+   """Print saved results side by side."""
+   results = []
+   for path in paths:
+      with open(path) as handle:
+         results.append(json.load(handle))
+   header = " ".join(f"{result['build'] + ' ' + result['python']:>16}" for result in results)
+   print(f"{'operation/backend':<24} {header}")
+   for key in results[0]["timings"]:
+      row = " ".join(f"{result['timings'].get(key, float('nan')):>16.3f}" for result in results)
+      print(f"{key:<24} {row}")
+
+
+def main():
+   """Parse arguments and run, save or compare benchmark results."""
+   parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+   parser.add_argument("--save", help="write results to this JSON file")
+   parser.add_argument("--compare", nargs="+", help="compare saved JSON results")
+   args = parser.parse_args()
+
+   if args.compare:
+      compare(args.compare)
+      return
+   result = run()
+   if args.save:
+      with open(args.save, "w") as handle:
+         json.dump(result, handle, indent=2)
+   print(f"Python {result['python']} ({result['build']})")
+   for key, seconds in result["timings"].items():
+      print(f"{key:<24} {seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+   main()
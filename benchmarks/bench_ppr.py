@@ -0,0 +1,81 @@
+"""
+Personalized PageRank Benchmark
+Hides one friendship per sampled user and reports how often each
+recommendation engine ranks the hidden friend in its top k, with latency.
+
+The set-based engine is iter_recommendations at depth 2, both unranked (the
+whole friend-of-friend set) and ranked by mutual friend count.
+
+Run with: python -m benchmarks.bench_ppr
+"""
+
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import planted_partition_connections
+from lazy_analysis import iter_recommendations
+from ppr import ppr_recommendations
+from recommend_query import query_recommendations
+
+NUM_USERS = 20_000
+NUM_GROUPS = 200
+NUM_QUERIES = 200
+K = 10
+ENGINES = (
+   ("push eps=1e-3", "push", {"epsilon": 1e-3}),
+   ("push eps=1e-4", "push", {"epsilon": 1e-4}),
+   ("walk n=500", "walk", {"num_walks": 500, "seed": 53}),
+   ("walk n=5000", "walk", {"num_walks": 5_000, "seed": 53}),
+)
+
+
+def _holdout(connections, rng):
+   """Remove one edge from each sampled user; return the users and their hidden friends."""
+   users = [user for user in sorted(connections) if len(connections[user]) >= 4]
+   hidden = {}
+   for user in rng.sample(users, NUM_QUERIES):
+      friend = rng.choice(sorted(connections[user]))
+      if len(connections[friend]) < 2:
+         continue
+      connections[user].discard(friend)
+      connections[friend].discard(user)
+      hidden[user] = friend
+   return hidden
+
+
+def _run(name, recommend, hidden):
+   hits = 0
+   sizes = []
+   latencies = []
+   for user, friend in hidden.items():
+      start = time.perf_counter()
+      results = recommend(user)
+      latencies.append(time.perf_counter() - start)
+      sizes.append(len(results))
+      hits += friend in results
+   print(f"{name:<18} {hits / len(hidden):>6.1%} {statistics.median(sizes):>8.0f} "
+         f"{1000 * statistics.median(latencies):>8.2f} {1000 * max(latencies):>8.2f}")
+
+
+def main():
+   """Run the benchmark and print hit rate and latency per engine."""
+   connections, _ = planted_partition_connections(NUM_USERS, NUM_GROUPS, 10, 3, seed=53)
+   hidden = _holdout(connections, random.Random(53))
+   print(f"{len(hidden)} held-out friendships, top {K}")
+   print(f"{'engine':<18} {'hit':>7} {'results':>8} {'p50 ms':>8} {'max ms':>8}")
+
+   _run("fof set", lambda user: set(iter_recommendations(user, connections)), hidden)
+
+   def by_mutual(user):
+      counts = query_recommendations(user, connections).mutual_counts
+      return {member for member, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:K]}
+
+   _run(f"fof top {K} mutual", by_mutual, hidden)
+   for name, method, options in ENGINES:
+      _run(name, lambda user: {member for member, _ in ppr_recommendations(user, connections, K, method, **options)},
+           hidden)
+
+
+if __name__ == "__main__":
+   main()
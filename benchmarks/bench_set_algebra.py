@@ -0,0 +1,57 @@
+"""
+Set Algebra Benchmark
+Compares chained set operations that materialize every intermediate result
+with the planned probe and bitmap evaluation of the same expressions.
+
+Run with: python -m benchmarks.bench_set_algebra
+"""
+
+import random
+import timeit
+
+from set_algebra import Group, QueryPlanner
+
+NUM_USERS = 1_000_000
+GROUP_SIZES = {"tech": 5_000, "gaming": 400_000, "arts": 300_000, "network_a": 600_000, "network_b": 200_000}
+
+
+def _best(statement, repeat=3):
+   return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main():
+   """Run the benchmark and print the time per expression and strategy."""
+   rng = random.Random(50)
+   users = [f"user{i}" for i in range(1, NUM_USERS + 1)]
+   groups = {name: set(rng.sample(users, size)) for name, size in GROUP_SIZES.items()}
+   tech, gaming, arts, network_a, network_b = (Group(name) for name in GROUP_SIZES)
+   g = groups
+   queries = [
+      ("(gaming & network_a & tech)", gaming & network_a & tech,
+       lambda: (g["gaming"] & g["network_a"]) & g["tech"]),
+      ("(tech & gaming) | (arts - network_b)", (tech & gaming) | (arts - network_b),
+       lambda: (g["tech"] & g["gaming"]) | (g["arts"] - g["network_b"])),
+      ("(network_a | arts) - (gaming | tech)", (network_a | arts) - (gaming | tech),
+       lambda: (g["network_a"] | g["arts"]) - (g["gaming"] | g["tech"])),
+      ("(network_a - gaming) & tech", (network_a - gaming) & tech,
+       lambda: (g["network_a"] - g["gaming"]) & g["tech"]),
+   ]
+
+   planner = QueryPlanner(groups)
+   build = _best(planner.build_bitmaps, repeat=1)
+   print(f"{len(groups)} groups over {NUM_USERS} users, bitmaps built in {build:.2f} s")
+   for name, expr, chained in queries:
+      expected = chained()
+      assert planner.evaluate(expr, "probe") == expected == planner.evaluate(expr, "bitmap")
+      print()
+      print(planner.explain(expr))
+      print(f"  actual rows={len(expected)}")
+      for strategy, run in (("chained sets", chained),
+                            ("planned probe", lambda: planner.evaluate(expr, "probe")),
+                            ("planned bitmap", lambda: planner.evaluate(expr, "bitmap")),
+                            ("planned auto", lambda: planner.evaluate(expr))):
+         print(f"  {strategy:<15} {1e3 * _best(run):>9.2f} ms")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,48 @@
+"""
+Sharded Graph Benchmark
+Reports edge cut, balance and cross-shard traffic per partitioning strategy.
+
+Run with: python -m benchmarks.bench_sharding
+"""
+
+import random
+import time
+
+from benchmarks.synthetic import planted_partition_connections
+from sharding import PARTITIONERS, ShardedGraph, hash_shard, partition, partition_report
+
+NUM_USERS = 20_000
+NUM_SHARDS = 4
+NUM_QUERIES = 200
+
+
+def main():
+   """Run the benchmark and print one row per strategy."""
+   connections, _ = planted_partition_connections(NUM_USERS, NUM_USERS // 200, 8, 1, seed=7)
+   rng = random.Random(7)
+   users = sorted(connections)
+   queries = [(rng.choice(users), rng.choice(users)) for _ in range(NUM_QUERIES)]
+
+   print(f"{'strategy':<8} {'cut':>7} {'cut %':>6} {'balance':>7} {'requests':>8} "
+         f"{'ids sent':>9} {'ids recv':>9} {'remote':>8} {'seconds':>8}")
+   for row in partition_report(connections, NUM_SHARDS, PARTITIONERS):
+      router = None
+      if row["strategy"] != "hash":
+         # Table-based placements need the full assignment in the parent
+         assignment = partition(connections, NUM_SHARDS, row["strategy"])
+         router = lambda user: assignment.get(user, hash_shard(user, NUM_SHARDS))
+      with ShardedGraph(connections, NUM_SHARDS, router) as graph:
+         start = time.perf_counter()
+         for user_a, user_b in queries:
+            graph.is_direct_connection(user_a, user_b)
+            graph.find_mutual_connections(user_a, user_b)
+            graph.find_all_connections(user_a, depth=2)
+         elapsed = time.perf_counter() - start
+         stats = graph.stats
+      print(f"{row['strategy']:<8} {row['edge_cut']:>7} {100 * row['cut_ratio']:>6.1f} {row['balance']:>7.2f} "
+            f"{stats['requests']:>8} {stats['ids_sent']:>9} {stats['ids_received']:>9} "
+            f"{stats['remote_ids']:>8} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,49 @@
+"""
+Sorted Array Kernel Benchmark
+Compares the merge, galloping and adaptive kernels with set & and ^ across
+size skew ratios.
+
+Run with: python -m benchmarks.bench_sorted_kernels
+"""
+
+import random
+import timeit
+from array import array
+
+from sorted_kernels import (intersect_gallop, intersect_merge, intersect_sorted,
+                            symmetric_difference_sorted)
+
+SMALL = 200
+RATIOS = (1, 10, 100, 1_000, 10_000)
+UNIVERSE = 50_000_000
+
+
+def _best(statement, repeat=5):
+   timer = timeit.Timer(statement)
+   loops, _ = timer.autorange()
+   return min(timer.repeat(repeat, loops)) / loops
+
+
+def main():
+   """Run the benchmark and print microseconds per call for every skew ratio."""
+   rng = random.Random(19)
+   print(f"{'ratio':>6} {'set &':>9} {'merge':>9} {'gallop':>9} {'adaptive':>9} {'set ^':>9} {'adapt ^':>9}")
+   for ratio in RATIOS:
+      small = sorted(rng.sample(range(UNIVERSE), SMALL))
+      large = sorted(set(rng.sample(range(UNIVERSE), SMALL * ratio)) | set(small[::2]))
+      small_array, large_array = array("q", small), array("q", large)
+      small_set, large_set = set(small), set(large)
+
+      timings = [
+         _best(lambda: small_set & large_set),
+         _best(lambda: intersect_merge(small_array, large_array)),
+         _best(lambda: intersect_gallop(small_array, large_array)),
+         _best(lambda: intersect_sorted(small_array, large_array)),
+         _best(lambda: small_set ^ large_set),
+         _best(lambda: symmetric_difference_sorted(small_array, large_array)),
+      ]
+      print(f"{ratio:>6} " + " ".join(f"{1e6 * seconds:>9.1f}" for seconds in timings))
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,44 @@
+"""
+Streaming Display Benchmark
+Compares the peak Python heap of join-based formatting with the streaming
+formatter across group sizes.
+
+Run with: python -m benchmarks.bench_streaming
+"""
+
+import os
+import time
+import tracemalloc
+
+from streaming import write_users_for_display
+
+SIZES = (10_000, 100_000, 1_000_000)
+MEMORY_BUDGET = 50_000
+
+
+def _measure(action):
+   """Return (seconds, peak traced bytes) of one call."""
+   tracemalloc.start()
+   start = time.perf_counter()
+   action()
+   elapsed = time.perf_counter() - start
+   _, peak = tracemalloc.get_traced_memory()
+   tracemalloc.stop()
+   return elapsed, peak
+
+
+def main():
+   """Run the benchmark and print one row per group size."""
+   print(f"{'users':>9} {'join MiB':>9} {'join s':>7} {'stream MiB':>10} {'stream s':>8}")
+   for size in SIZES:
+      users = {f"user{i}" for i in range(size)}
+      with open(os.devnull, "w") as out:
+         join_time, join_peak = _measure(lambda: out.write(f"group: {{{', '.join(sorted(users))}}}\n"))
+         stream_time, stream_peak = _measure(
+            lambda: write_users_for_display("group", users, out, memory_budget=MEMORY_BUDGET))
+      print(f"{size:>9} {join_peak / 2**20:>9.1f} {join_time:>7.2f} "
+            f"{stream_peak / 2**20:>10.1f} {stream_time:>8.2f}")
+
+
+if __name__ == "__main__":
+   main()
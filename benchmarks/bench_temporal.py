@@ -0,0 +1,88 @@
+"""
+Temporal Benchmark
+Streams timestamped connections and compares the incremental sliding window
+with rebuilding the window from scratch, and window views with filtered
+copies of the graph.
+
+Run with: python -m benchmarks.bench_temporal
+"""
+
+import random
+import time
+
+from temporal import SlidingWindow, TemporalGraph
+
+NUM_USERS = 20_000
+NUM_EVENTS = 400_000
+EVENTS_PER_STEP = 2_000
+WINDOW = 30 * 86_400
+SPAN = 365 * 86_400
+NUM_LOOKUPS = 2_000
+
+
+def _events(rng):
+   step = SPAN / NUM_EVENTS
+   for index in range(NUM_EVENTS):
+      # Small jitter keeps the stream mostly, but not perfectly, ordered
+      timestamp = index * step + rng.uniform(0, 20 * step)
+      yield f"user{rng.randrange(NUM_USERS)}", f"user{rng.randrange(NUM_USERS)}", timestamp
+
+
+def _rebuild(events, now):
+   window = {}
+   for user_a, user_b, timestamp in events:
+      if now - WINDOW < timestamp <= now:
+         window.setdefault(user_a, set()).add(user_b)
+   return window
+
+
+def main():
+   """Run the benchmark and print the cost of window maintenance and lookups."""
+   rng = random.Random(48)
+   events = list(_events(rng))
+   graph = TemporalGraph()
+   sliding = SlidingWindow(graph, WINDOW, now=0.0)
+
+   incremental = rebuild = 0.0
+   rebuilds = 0
+   for first in range(0, NUM_EVENTS, EVENTS_PER_STEP):
+      for user_a, user_b, timestamp in events[first:first + EVENTS_PER_STEP]:
+         graph.add_edge(user_a, user_b, timestamp)
+      now = events[first + EVENTS_PER_STEP - 1][2]
+      start = time.perf_counter()
+      sliding.advance(now)
+      incremental += time.perf_counter() - start
+      # Rebuilding is slow; sample every tenth step
+      if (first // EVENTS_PER_STEP) % 10 == 0:
+         start = time.perf_counter()
+         expected = _rebuild(events[:first + EVENTS_PER_STEP], now)
+         rebuild += time.perf_counter() - start
+         rebuilds += 1
+         assert all(sliding[user] == expected.get(user, set()) for user in graph)
+   steps = NUM_EVENTS // EVENTS_PER_STEP
+   print(f"{NUM_EVENTS} events over {SPAN // 86_400} days, {WINDOW // 86_400}-day window, "
+         f"advance every {EVENTS_PER_STEP} events")
+   print(f"{'maintenance':<22} {'ms/step':>8}")
+   print(f"{'incremental advance':<22} {1e3 * incremental / steps:>8.3f}")
+   print(f"{'rebuild from log':<22} {1e3 * rebuild / rebuilds:>8.3f}")
+
+   users = [f"user{rng.randrange(NUM_USERS)}" for _ in range(NUM_LOOKUPS)]
+   users = [user for user in users if user in graph]
+   now = max(timestamp for _, _, timestamp in events)
+   start = time.perf_counter()
+   view = graph.last(WINDOW, now)
+   view_rows = [view[user] for user in users]
+   view_time = time.perf_counter() - start
+   start = time.perf_counter()
+   copy = {user: {friend for friend in graph[user]
+                  if now - WINDOW < graph.connection_time(user, friend) <= now} for user in graph}
+   copy_rows = [copy[user] for user in users]
+   copy_time = time.perf_counter() - start
+   assert view_rows == copy_rows
+   print(f"{'window lookups':<22} {'ms':>8}  ({len(users)} users)")
+   print(f"{'window view':<22} {1e3 * view_time:>8.2f}")
+   print(f"{'filtered copy':<22} {1e3 * copy_time:>8.2f}")
+
+
+if __name__ == "__main__":
+   main()
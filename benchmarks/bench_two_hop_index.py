@@ -0,0 +1,72 @@
+"""
+Two-Hop Index Benchmark
+Replays a skewed query workload with interleaved edge updates and compares
+on-the-fly traversal with the materialized 2-hop index, then times bulk
+indexing of many users under a small budget.
+
+Run with: python -m benchmarks.bench_two_hop_index
+"""
+
+import random
+import time
+
+from benchmarks.synthetic import random_connections
+from lazy_analysis import iter_recommendations
+from two_hop_index import TwoHopIndex
+
+NUM_USERS = 50_000
+AVG_DEGREE = 30
+NUM_QUERIES = 20_000
+UPDATE_EVERY = 20
+ZIPF_EXPONENT = 1.2
+BUDGETS = (50_000, 250_000, 1_000_000)
+BULK_USERS = 10_000
+BULK_BUDGET = 200_000
+
+
+def _workload(users, rng):
+   weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, len(users) + 1)]
+   queried = rng.choices(users, weights, k=NUM_QUERIES)
+   return [(user, rng.choice(users)) for user in queried]
+
+
+def _replay(connections, workload, recommend, add_edge, rng):
+   start = time.perf_counter()
+   for step, (user, other) in enumerate(workload):
+      if step % UPDATE_EVERY == 0:
+         add_edge(other, rng.choice(workload)[0])
+      recommend(user)
+   return time.perf_counter() - start
+
+
+def main():
+   """Run the benchmark and print throughput per memory budget."""
+   rng = random.Random(29)
+   users = [f"user{i}" for i in range(1, NUM_USERS + 1)]
+   rng.shuffle(users)
+   workload = _workload(users, rng)
+
+   connections = random_connections(NUM_USERS, AVG_DEGREE, seed=29)
+   baseline = _replay(connections, workload, lambda user: set(iter_recommendations(user, connections)),
+                      lambda a, b: connections[a].add(b), random.Random(1))
+   print(f"{NUM_QUERIES} depth-2 recommendation queries, one edge update every {UPDATE_EVERY}")
+   print(f"{'budget':>9} {'seconds':>8} {'speedup':>8} {'hit rate':>9} {'indexed':>8} {'evicted':>8}")
+   print(f"{'none':>9} {baseline:>8.2f} {1.0:>7.2f}x")
+   for budget in BUDGETS:
+      index = TwoHopIndex(random_connections(NUM_USERS, AVG_DEGREE, seed=29), max_entries=budget)
+      elapsed = _replay(index, workload, index.recommendations, index.add_edge, random.Random(1))
+      stats = index.stats
+      print(f"{budget:>9} {elapsed:>8.2f} {baseline / elapsed:>7.2f}x "
+            f"{stats['hits'] / (stats['hits'] + stats['misses']):>8.1%} {len(index.indexed_users):>8} "
+            f"{stats['evicted']:>8}")
+
+   index = TwoHopIndex(random_connections(NUM_USERS, AVG_DEGREE, seed=29), max_entries=BULK_BUDGET)
+   start = time.perf_counter()
+   indexed = index.index_users(users[:BULK_USERS])
+   elapsed = time.perf_counter() - start
+   print(f"index_users({BULK_USERS} users, budget {BULK_BUDGET}): {elapsed:.2f} s, "
+         f"{indexed} fit, {index.stats['evicted']} evicted")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,61 @@
+"""
+User Registry Benchmark
+Compares memory per user and filter time of the columnar registry with a
+dict-of-dicts.
+
+Run with: python -m benchmarks.bench_user_registry
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from user_registry import UserRegistry
+
+NUM_USERS = 200_000
+REGIONS = ("EU", "NA", "APAC", "LATAM")
+
+
+def _records():
+   rng = random.Random(11)
+   start = date(2015, 1, 1)
+   return {f"user{i}": {"join_date": start + timedelta(days=rng.randrange(3650)),
+                        "region": rng.choice(REGIONS),
+                        "activity_score": rng.random()}
+           for i in range(NUM_USERS)}
+
+
+def _measure(build):
+   tracemalloc.start()
+   value = build()
+   size = tracemalloc.get_traced_memory()[0]
+   tracemalloc.stop()
+   return value, size
+
+
+def main():
+   """Run the benchmark and print memory per user and filter times."""
+   records = _records()
+   names = list(records)
+   group = set(random.Random(12).sample(names, NUM_USERS // 10))
+
+   # Names are shared by both layouts, so only the per-user structures are measured
+   dicts, dict_bytes = _measure(lambda: {name: dict(values) for name, values in records.items()})
+   registry, registry_bytes = _measure(lambda: UserRegistry.from_records(records))
+
+   start = time.perf_counter()
+   expected = {name for name in group if dicts[name]["activity_score"] >= 0.8}
+   dict_time = time.perf_counter() - start
+   start = time.perf_counter()
+   active = registry.filter(group, min_activity=0.8)
+   registry_time = time.perf_counter() - start
+   assert active == expected
+
+   print(f"{'layout':<14} {'bytes/user':>10} {'filter ms':>9}")
+   print(f"{'dict-of-dicts':<14} {dict_bytes / NUM_USERS:>10.0f} {1000 * dict_time:>9.1f}")
+   print(f"{'registry':<14} {registry_bytes / NUM_USERS:>10.0f} {1000 * registry_time:>9.1f}")
+
+
+if __name__ == "__main__":
+   main()
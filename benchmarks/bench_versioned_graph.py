@@ -0,0 +1,67 @@
+"""
+Versioned Graph Benchmark
+Reports the memory each snapshot adds compared with copying connections,
+and the cost of editing the connections of one very large hub user.
+
+Run with: python -m benchmarks.bench_versioned_graph
+"""
+
+import random
+import time
+import tracemalloc
+
+from benchmarks.synthetic import random_connections
+from versioned_graph import VersionedGraph
+
+NUM_USERS = 50_000
+NUM_SNAPSHOTS = 50
+CHANGES = (1, 10, 100)
+HUB_DEGREE = 200_000
+HUB_EDITS = 1_000
+
+
+def main():
+   """Run the benchmark and print one row per edit batch size."""
+   connections = random_connections(NUM_USERS, 10, seed=3)
+   users = sorted(connections)
+
+   tracemalloc.start()
+   before = tracemalloc.get_traced_memory()[0]
+   copy = {user: set(friends) for user, friends in connections.items()}
+   full_copy = tracemalloc.get_traced_memory()[0] - before
+   del copy
+
+   print(f"full connections copy: {full_copy / 1024:.0f} KiB")
+   print(f"{'edges changed':>13} {'KiB per snapshot':>16} {'bytes per edge':>14}")
+   for changes in CHANGES:
+      rng = random.Random(changes)
+      graph = VersionedGraph(connections, timestamp=0)
+      before = tracemalloc.get_traced_memory()[0]
+      for version in range(1, NUM_SNAPSHOTS + 1):
+         for _ in range(changes):
+            graph.add_edge(rng.choice(users), rng.choice(users))
+         graph.commit(version)
+      per_snapshot = (tracemalloc.get_traced_memory()[0] - before) / NUM_SNAPSHOTS
+      print(f"{changes:>13} {per_snapshot / 1024:>16.1f} {per_snapshot / changes:>14.0f}")
+   tracemalloc.stop()
+
+   hub = {"hub": {f"user{i}" for i in range(HUB_DEGREE)}}
+   graph = VersionedGraph(hub, timestamp=0)
+   start = time.perf_counter()
+   for version in range(1, HUB_EDITS + 1):
+      graph.add_edge("hub", f"new{version}")
+      graph.commit(version)
+   elapsed = time.perf_counter() - start
+   # Tracing slows the edits down, so memory is measured on a second batch
+   tracemalloc.start()
+   for version in range(HUB_EDITS + 1, 2 * HUB_EDITS + 1):
+      graph.add_edge("hub", f"new{version}")
+      graph.commit(version)
+   per_snapshot = tracemalloc.get_traced_memory()[0] / HUB_EDITS
+   tracemalloc.stop()
+   print(f"hub with {HUB_DEGREE} friends: {1e6 * elapsed / HUB_EDITS:.1f} us and "
+         f"{per_snapshot:.0f} bytes per single-edge snapshot")
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,82 @@
+"""
+Synthetic Graphs
+Fixed-seed generators for the connections dicts used by the benchmarks.
+"""
+
+import random
+
+
+def random_connections(num_users, avg_degree, seed=0):
+   """
+   Generate a random undirected social graph.
+
+   Args:
+       num_users (int): Number of users
+       avg_degree (int): Average number of connections per user
+       seed (int): Random seed
+
+   Returns:
+       dict: Dictionary of user connections
+   """
+   rng = random.Random(seed)
+   connections = {f"user{i}": set() for i in range(1, num_users + 1)}
+   for _ in range(num_users * avg_degree // 2):
+      a = rng.randint(1, num_users)
+      b = rng.randint(1, num_users)
+      if a != b:
+         connections[f"user{a}"].add(f"user{b}")
+         connections[f"user{b}"].add(f"user{a}")
+   return connections
+
+
+def planted_partition_connections(num_users, num_groups, degree_in, degree_out, seed=0):
+   """
+   Generate an undirected graph with planted communities.
+
+   Args:
+       num_users (int): Number of users
+       num_groups (int): Number of planted communities
+       degree_in (int): Average connections inside a user's community
+       degree_out (int): Average connections to other communities
+       seed (int): Random seed
+
+   Returns:
+       tuple: (connections dict, dict of planted community sets)
+   """
+   rng = random.Random(seed)
+   names = [f"user{i}" for i in range(1, num_users + 1)]
+   groups = [names[g::num_groups] for g in range(num_groups)]
+   connections = {name: set() for name in names}
+
+   def link(a, b):
+      if a != b:
+         connections[a].add(b)
+         connections[b].add(a)
+
+   for members in groups:
+      for _ in range(len(members) * degree_in // 2):
+         link(rng.choice(members), rng.choice(members))
+   for _ in range(num_users * degree_out // 2):
+      link(rng.choice(names), rng.choice(names))
+
+   planted = {f"group_{g}": set(members) for g, members in enumerate(groups)}
+   return connections, planted
+
+
+def random_groups(users, num_groups, avg_size, seed=0):
+   """
+   Generate random group memberships over a set of users.
+
+   Args:
+       users (list): Users to draw members from
+       num_groups (int): Number of groups
+       avg_size (int): Average group size
+       seed (int): Random seed
+
+   Returns:
+       dict: Dictionary of group sets
+   """
+   rng = random.Random(seed)
+   users = list(users)
+   return {f"group_{g}": set(rng.sample(users, min(len(users), max(1, int(rng.expovariate(1 / avg_size))))))
+           for g in range(num_groups)}
@@ -0,0 +1,418 @@
+"""
+Columnar Import and Export
+This module reads and writes connections, group sets and analysis results
+as Parquet tables, streaming row groups so files larger than memory can be
+converted. In-memory Arrow ID columns become a CompactGraph without copying
+the target column; ID tables on disk are decoded into the CSR arrays one
+batch at a time.
+
+Parquet support needs pyarrow, which is imported only when a function here
+is called.
+"""
+
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from graph_core import CompactGraph, UserInterner
+
+DEFAULT_BATCH_SIZE = 65_536
+EDGES_FILE = "edges.parquet"
+USERS_FILE = "users.parquet"
+# Kinds of analysis results, each stored with its own table schema
+USER_SET = "users"
+USER_SCORES = "scores"
+USER_GROUPS = "groups"
+
+
+def _pyarrow():
+   """Import pyarrow and pyarrow.parquet on first use."""
+   try:
+      import pyarrow
+      import pyarrow.compute
+      import pyarrow.parquet
+   except ImportError as e:
+      raise ImportError("Parquet import/export needs pyarrow (pip install pyarrow)") from e
+   return pyarrow, pyarrow.parquet
+
+
+def _write_rows(path, schema, rows, batch_size):
+   """Write an iterable of row tuples as one row group per batch_size rows."""
+   pa, pq = _pyarrow()
+   tmp_path = path + ".tmp"
+   columns = [[] for _ in schema]
+   with pq.ParquetWriter(tmp_path, schema) as writer:
+      def flush():
+         arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+         writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+         for values in columns:
+            values.clear()
+
+      for row in rows:
+         for values, value in zip(columns, row):
+            values.append(value)
+         if len(columns[0]) >= batch_size:
+            flush()
+      if columns[0]:
+         flush()
+   os.replace(tmp_path, path)
+
+
+def iter_batches(path, columns, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Stream the rows of a Parquet file one batch at a time.
+
+   Only one batch of each column is held in memory at once.
+
+   Args:
+       path (str): Parquet file
+       columns (list): Names of the columns to read
+       batch_size (int): Maximum rows per batch
+
+   Returns:
+       generator: Lists of row tuples in file order
+   """
+   _, pq = _pyarrow()
+   parquet_file = pq.ParquetFile(path)
+   missing = set(columns) - set(parquet_file.schema_arrow.names)
+   if missing:
+      raise ValueError(f"Columns {', '.join(sorted(missing))} not found in {path}")
+   for batch in parquet_file.iter_batches(batch_size=batch_size, columns=list(columns)):
+      yield list(zip(*(batch.column(index).to_pylist() for index in range(len(columns)))))
+
+
+def write_edges(connections, path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Export connections as a (user, friend) edge table.
+
+   Users without connections are written with a null friend so they
+   survive a round trip.
+
+   Args:
+       connections (dict): Dictionary of user connections (or a CompactGraph)
+       path (str): Destination Parquet file
+       batch_size (int): Rows per row group
+   """
+   if connections is None:
+      raise ValueError("Connections data cannot be None")
+   pa, _ = _pyarrow()
+   schema = pa.schema([("user", pa.string()), ("friend", pa.string())])
+
+   def rows():
+      for user, friends in connections.items():
+         if not friends:
+            yield user, None
+         for friend in sorted(friends):
+            yield user, friend
+
+   _write_rows(path, schema, rows(), batch_size)
+
+
+def read_edges(path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Import a (user, friend) edge table as a connections dict.
+
+   Args:
+       path (str): Parquet file written by write_edges
+       batch_size (int): Rows decoded at a time
+
+   Returns:
+       dict: Dictionary of user connections
+   """
+   connections = {}
+   for rows in iter_batches(path, ("user", "friend"), batch_size):
+      for user, friend in rows:
+         friends = connections.setdefault(user, set())
+         if friend is not None:
+            friends.add(friend)
+   return connections
+
+
+def write_groups(groups, path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Export named group sets (network_a, tech_group, ...) as a (group, user) table.
+
+   Args:
+       groups (dict): Group name to set of users
+       path (str): Destination Parquet file
+       batch_size (int): Rows per row group
+   """
+   if groups is None:
+      raise ValueError("Groups data cannot be None")
+   pa, _ = _pyarrow()
+   schema = pa.schema([("group", pa.string()), ("user", pa.string())])
+   rows = ((name, user) for name, members in groups.items() for user in sorted(members))
+   _write_rows(path, schema, rows, batch_size)
+
+
+def read_groups(path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Import a (group, user) table as named group sets.
+
+   Args:
+       path (str): Parquet file written by write_groups
+       batch_size (int): Rows decoded at a time
+
+   Returns:
+       dict: Group name to set of users
+   """
+   groups = {}
+   for rows in iter_batches(path, ("group", "user"), batch_size):
+      for name, user in rows:
+         groups.setdefault(name, set()).add(user)
+   return groups
+
+
+def _result_kind(result):
+   if isinstance(result, (set, frozenset)):
+      return USER_SET
+   if isinstance(result, Mapping):
+      if any(isinstance(value, (set, frozenset)) for value in result.values()):
+         return USER_GROUPS
+      return USER_SCORES
+   if isinstance(result, (list, tuple)):
+      return USER_SCORES
+   raise ValueError(f"Unsupported result type: {type(result).__name__}")
+
+
+def write_results(result, path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Export one analysis result, with a table schema chosen by its type.
+
+   - set of users (isolated users, recommendations): a user column
+   - user to score mapping, or a ranked list of (user, score) tuples:
+     user and score columns, in the given order
+   - user to set of groups (identify_bridge_users): a (user, group) table;
+     users without groups are written with a null group
+
+   The kind is stored in the table metadata for read_results.
+
+   Args:
+       result: Set of users, user to score dict, list of (user, score)
+           or user to set of groups dict
+       path (str): Destination Parquet file
+       batch_size (int): Rows per row group
+   """
+   if result is None:
+      raise ValueError("Results data cannot be None")
+   pa, _ = _pyarrow()
+   kind = _result_kind(result)
+   metadata = {"result": kind}
+   if kind == USER_SET:
+      schema = pa.schema([("user", pa.string())], metadata=metadata)
+      rows = ((user,) for user in sorted(result))
+   elif kind == USER_SCORES:
+      schema = pa.schema([("user", pa.string()), ("score", pa.float64())], metadata=metadata)
+      pairs = result.items() if isinstance(result, Mapping) else result
+      rows = ((user, float(score)) for user, score in pairs)
+   else:
+      schema = pa.schema([("user", pa.string()), ("group", pa.string())], metadata=metadata)
+
+      def group_rows():
+         for user in sorted(result):
+            groups = result[user]
+            if not groups:
+               yield user, None
+            for group in sorted(groups):
+               yield user, group
+
+      rows = group_rows()
+   _write_rows(path, schema, rows, batch_size)
+
+
+def read_results(path, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Import an analysis result written by write_results.
+
+   Args:
+       path (str): Parquet file written by write_results
+       batch_size (int): Rows decoded at a time
+
+   Returns:
+       set, dict: Set of users, user to score dict in file order, or user
+           to set of groups
+   """
+   _, pq = _pyarrow()
+   metadata = pq.read_schema(path).metadata or {}
+   kind = metadata.get(b"result", b"").decode()
+   if kind == USER_SET:
+      users = set()
+      for rows in iter_batches(path, ("user",), batch_size):
+         users.update(user for (user,) in rows)
+      return users
+   if kind == USER_SCORES:
+      scores = {}
+      for rows in iter_batches(path, ("user", "score"), batch_size):
+         scores.update(rows)
+      return scores
+   if kind == USER_GROUPS:
+      groups = {}
+      for rows in iter_batches(path, ("user", "group"), batch_size):
+         for user, group in rows:
+            members = groups.setdefault(user, set())
+            if group is not None:
+               members.add(group)
+      return groups
+   raise ValueError(f"Not an analysis result table: {path}")
+
+
+def _int64_view(column):
+   """
+   Get an int64 Arrow array as a read-only memoryview over its buffer.
+
+   Falls back to an array copy for nulls, other types or big-endian hosts.
+   """
+   pa, _ = _pyarrow()
+   data = column.buffers()[1] if len(column) else None
+   if data is None or column.null_count or column.type != pa.int64() or sys.byteorder != "little":
+      return array("q", column.to_pylist())
+   view = memoryview(data)
+   view = view[:len(view) - len(view) % 8].cast("q")[column.offset:column.offset + len(column)]
+   return view.toreadonly()
+
+
+class _CsrBuilder:
+   """
+   Build CSR offsets and targets from batches of edges sorted by user ID.
+
+   When all edges come in one batch the targets stay a view on its Arrow
+   buffer; otherwise the batches are copied into one preallocated array.
+   """
+
+   def __init__(self, num_users, total_edges):
+      self.num_users = num_users
+      self.total_edges = total_edges
+      self.offsets = array("q", [0])
+      self.targets = None
+      self.num_edges = 0
+
+   def add(self, user_ids, friend_ids):
+      """Append one batch of (user_id, friend_id) edges."""
+      if len(user_ids) != len(friend_ids):
+         raise ValueError("Edge columns must have the same length")
+      if not len(user_ids):
+         return
+      pa, _ = _pyarrow()
+      pc = pa.compute
+      if user_ids.null_count or friend_ids.null_count:
+         raise ValueError("Edge IDs must not be null")
+      # Offsets are filled up to the last user of the previous batch
+      previous = len(self.offsets) - 1
+      unsorted = len(user_ids) > 1 and pc.any(pc.less(user_ids[1:], user_ids[:-1])).as_py()
+      if unsorted or user_ids[0].as_py() < previous or user_ids[-1].as_py() >= self.num_users:
+         raise ValueError("Edge user IDs must be sorted and below the number of users")
+      targets_range = pc.min_max(friend_ids).as_py()
+      if targets_range["min"] < 0 or targets_range["max"] >= self.num_users:
+         raise ValueError("Edge friend IDs must be below the number of users")
+
+      sources = _int64_view(user_ids)
+      lo = 0
+      for uid in range(len(self.offsets), sources[-1] + 1):
+         lo = bisect_left(sources, uid, lo)
+         self.offsets.append(self.num_edges + lo)
+      targets = _int64_view(friend_ids)
+      end = self.num_edges + len(targets)
+      if end > self.total_edges:
+         raise ValueError("Edge table holds more edges than expected")
+      if self.targets is None and len(targets) == self.total_edges:
+         self.targets = targets
+      else:
+         if self.targets is None:
+            self.targets = array("q", [0]) * self.total_edges
+         memoryview(self.targets)[self.num_edges:end] = memoryview(targets)
+      self.num_edges = end
+
+   def finish(self, names, undirected):
+      """Close the remaining rows and return the graph."""
+      if len(names) != self.num_users:
+         raise ValueError("Names must list every user ID exactly once")
+      if self.num_edges != self.total_edges:
+         raise ValueError("Edge table holds fewer edges than expected")
+      while len(self.offsets) <= self.num_users:
+         self.offsets.append(self.num_edges)
+      targets = array("q") if self.targets is None else self.targets
+      return CompactGraph(UserInterner(names), self.offsets, targets, undirected)
+
+
+def compact_graph_from_arrow(names, user_ids, friend_ids, undirected=False):
+   """
+   Build a CompactGraph from Arrow ID columns.
+
+   The edges must be sorted by (user_id, friend_id), as written by
+   write_graph. A single-chunk friend_id column becomes the graph's targets
+   array as a memoryview on the Arrow buffer; the chunks of a chunked
+   column are copied into one array, as CSR targets must be contiguous.
+
+   Args:
+       names (list): User names indexed by ID
+       user_ids: int64 Arrow array or chunked array of edge sources
+       friend_ids: int64 Arrow array or chunked array of edge targets
+       undirected (bool): Whether every edge is stored in both directions
+
+   Returns:
+       CompactGraph: Graph whose targets share memory with a single-chunk friend_id
+   """
+   pa, _ = _pyarrow()
+   if len(user_ids) != len(friend_ids):
+      raise ValueError("Edge columns must have the same length")
+   builder = _CsrBuilder(len(names), len(friend_ids))
+   # A table slices both columns at the same chunk boundaries without copying
+   table = pa.table({"user_id": user_ids, "friend_id": friend_ids})
+   for batch in table.to_batches():
+      builder.add(batch.column(0), batch.column(1))
+   return builder.finish(names, undirected)
+
+
+def write_graph(graph, directory, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Export a compact graph as ID tables for zero-copy loading.
+
+   The directory gets users.parquet (name by ID) and edges.parquet
+   (user_id, friend_id sorted by both), with the undirected flag in the
+   edge table's metadata.
+
+   Args:
+       graph: CompactGraph or connections dict
+       directory (str): Destination directory (created if missing)
+       batch_size (int): Rows per row group
+   """
+   if graph is None:
+      raise ValueError("Connections data cannot be None")
+   pa, _ = _pyarrow()
+   if not isinstance(graph, CompactGraph):
+      graph = CompactGraph.from_connections(graph)
+   os.makedirs(directory, exist_ok=True)
+   _write_rows(os.path.join(directory, USERS_FILE), pa.schema([("name", pa.string())]),
+               ((name,) for name in graph.interner), batch_size)
+   schema = pa.schema([("user_id", pa.int64()), ("friend_id", pa.int64())],
+                      metadata={"undirected": str(int(graph.undirected))})
+   rows = ((uid, vid) for uid in range(graph.num_users) for vid in graph.neighbors(uid))
+   _write_rows(os.path.join(directory, EDGES_FILE), schema, rows, batch_size)
+
+
+def read_graph(directory, memory_map=True, batch_size=DEFAULT_BATCH_SIZE):
+   """
+   Load a graph written by write_graph.
+
+   The edge table is decoded one batch at a time straight into the CSR
+   arrays, so the whole table is never held in memory next to the graph.
+
+   Args:
+       directory (str): Directory written by write_graph
+       memory_map (bool): Memory-map the files while decoding
+       batch_size (int): Edges decoded at a time
+
+   Returns:
+       CompactGraph: The graph
+   """
+   _, pq = _pyarrow()
+   names = pq.read_table(os.path.join(directory, USERS_FILE), memory_map=memory_map).column("name").to_pylist()
+   edges = pq.ParquetFile(os.path.join(directory, EDGES_FILE), memory_map=memory_map)
+   metadata = edges.schema_arrow.metadata or {}
+   undirected = metadata.get(b"undirected") == b"1"
+   builder = _CsrBuilder(len(names), edges.metadata.num_rows)
+   for batch in edges.iter_batches(batch_size=batch_size, columns=["user_id", "friend_id"]):
+      builder.add(batch.column(0), batch.column(1))
+   return builder.finish(names, undirected)
@@ -0,0 +1,359 @@
+"""
+Community Detection
+This module discovers communities in the compact graph with label propagation
+and Louvain modularity optimisation, producing input for identify_bridge_users.
+"""
+
+from array import array
+
+from graph_core import as_compact_graph
+
+_WORKER_GRAPH = None
+
+
+def _make_executor(executor, workers, initializer=None, initargs=()):
+   """Create the thread or process pool used for parallel work."""
+   from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+   if executor == "thread":
+      return ThreadPoolExecutor(max_workers=workers)
+   if executor == "process":
+      return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+   raise ValueError(f"Unknown executor {executor!r}, expected 'thread' or 'process'")
+
+
+def _chunk_bounds(n, workers):
+   """Split range(n) into at most `workers` contiguous chunks."""
+   size = max(1, -(-n // max(1, workers)))
+   return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def modularity(graph, labels, resolution=1.0):
+   """
+   Calculate the modularity of a community assignment.
+
+   Args:
+       graph (CompactGraph): Undirected compact graph
+       labels (list): Community label for every user ID
+       resolution (float): Resolution parameter (1.0 = standard modularity)
+
+   Returns:
+       float: Modularity score (-0.5 to 1)
+   """
+   graph = as_compact_graph(graph, undirected=True)
+   arcs = len(graph.targets)
+   if arcs == 0:
+      return 0.0
+
+   internal = {}
+   totals = {}
+   for uid in range(graph.num_users):
+      label = labels[uid]
+      totals[label] = totals.get(label, 0) + graph.degree(uid)
+      inside = sum(1 for vid in graph.neighbors(uid) if labels[vid] == label)
+      if inside:
+         internal[label] = internal.get(label, 0) + inside
+
+   score = 0.0
+   for label, total in totals.items():
+      score += internal.get(label, 0) / arcs - resolution * (total / arcs) ** 2
+   return score
+
+
+def _propagate_range(offsets, targets, labels, start, stop, parity):
+   """Compute new labels for the users in [start, stop) with the given ID parity."""
+   updates = []
+   for uid in range(start + ((parity - start) % 2), stop, 2):
+      lo, hi = offsets[uid], offsets[uid + 1]
+      if lo == hi:
+         continue
+      counts = {}
+      for pos in range(lo, hi):
+         label = labels[targets[pos]]
+         counts[label] = counts.get(label, 0) + 1
+      current = labels[uid]
+      best_count = max(counts.values())
+      if counts.get(current, 0) == best_count:
+         continue
+      best = min(label for label, count in counts.items() if count == best_count)
+      updates.append((uid, best))
+   return updates
+
+
+def _init_worker(offsets, targets):
+   global _WORKER_GRAPH
+   _WORKER_GRAPH = (offsets, targets)
+
+
+def _propagate_in_worker(labels, start, stop, parity):
+   offsets, targets = _WORKER_GRAPH
+   return _propagate_range(offsets, targets, labels, start, stop, parity)
+
+
+def label_propagation(graph, max_iter=30, workers=1, executor="thread"):
+   """
+   Detect communities by semi-synchronous label propagation.
+
+   Every round updates even user IDs and then odd user IDs from a snapshot of
+   the labels, so the result is identical for any number of workers.
+
+   Args:
+       graph (CompactGraph): Compact graph (treated as undirected)
+       max_iter (int): Maximum number of rounds
+       workers (int): Number of parallel workers (1 = serial)
+       executor (str): "thread" or "process"
+
+   Returns:
+       list: Community label for every user ID
+   """
+   if max_iter < 1:
+      raise ValueError("max_iter must be at least 1")
+   graph = as_compact_graph(graph, undirected=True)
+   n = graph.num_users
+   labels = array("q", range(n))
+   chunks = _chunk_bounds(n, workers)
+
+   pool = None
+   if workers > 1:
+      pool = _make_executor(executor, workers, _init_worker, (graph.offsets, graph.targets))
+   try:
+      for _ in range(max_iter):
+         changed = 0
+         for parity in (0, 1):
+            if pool is None:
+               results = [_propagate_range(graph.offsets, graph.targets, labels, start, stop, parity)
+                          for start, stop in chunks]
+            elif executor == "process":
+               results = pool.map(_propagate_in_worker, *zip(*[(labels, start, stop, parity)
+                                                                 for start, stop in chunks]))
+            else:
+               results = pool.map(lambda bounds: _propagate_range(graph.offsets, graph.targets, labels,
+                                                                  bounds[0], bounds[1], parity), chunks)
+            for updates in list(results):
+               for uid, label in updates:
+                  labels[uid] = label
+               changed += len(updates)
+         if changed == 0:
+            break
+   finally:
+      if pool is not None:
+         pool.shutdown()
+   return list(labels)
+
+
+def _louvain_level(offsets, targets, weights, loops, m2, resolution, tol):
+   """Run the local moving phase and return the community of every node."""
+   n = len(loops)
+   strength = [loops[i] + sum(weights[offsets[i]:offsets[i + 1]]) for i in range(n)]
+   community = list(range(n))
+   totals = list(strength)
+
+   improved = True
+   while improved:
+      improved = False
+      for node in range(n):
+         current = community[node]
+         k_i = strength[node]
+         links = {}
+         for pos in range(offsets[node], offsets[node + 1]):
+            neighbor_community = community[targets[pos]]
+            links[neighbor_community] = links.get(neighbor_community, 0) + weights[pos]
+
+         totals[current] -= k_i
+         best = current
+         best_gain = links.get(current, 0) - resolution * totals[current] * k_i / m2
+         for candidate, weight in links.items():
+            gain = weight - resolution * totals[candidate] * k_i / m2
+            if gain > best_gain + tol:
+               best, best_gain = candidate, gain
+         totals[best] += k_i
+         if best != current:
+            community[node] = best
+            improved = True
+   return community
+
+
+def _aggregate(offsets, targets, weights, loops, community):
+   """Collapse every community into a single weighted node."""
+   renumber = {}
+   for label in community:
+      if label not in renumber:
+         renumber[label] = len(renumber)
+   mapping = [renumber[label] for label in community]
+
+   size = len(renumber)
+   new_loops = [0] * size
+   rows = [{} for _ in range(size)]
+   for node, group in enumerate(mapping):
+      new_loops[group] += loops[node]
+      row = rows[group]
+      for pos in range(offsets[node], offsets[node + 1]):
+         other = mapping[targets[pos]]
+         if other == group:
+            new_loops[group] += weights[pos]
+         else:
+            row[other] = row.get(other, 0) + weights[pos]
+
+   new_offsets, new_targets, new_weights = [0], [], []
+   for row in rows:
+      for other in sorted(row):
+         new_targets.append(other)
+         new_weights.append(row[other])
+      new_offsets.append(len(new_targets))
+   return mapping, new_offsets, new_targets, new_weights, new_loops
+
+
+def _louvain_component(offsets, targets, m2, resolution, max_passes, tol):
+   """Run Louvain on one graph and return a label per node."""
+   n = len(offsets) - 1
+   weights = [1] * len(targets)
+   loops = [0] * n
+   labels = list(range(n))
+   for _ in range(max_passes):
+      community = _louvain_level(offsets, targets, weights, loops, m2, resolution, tol)
+      mapping, offsets, targets, weights, loops = _aggregate(offsets, targets, weights, loops, community)
+      labels = [mapping[label] for label in labels]
+      if len(loops) == len(community):
+         break
+   return labels
+
+
+def _components(graph):
+   """Split an undirected graph into connected components of user IDs."""
+   seen = bytearray(graph.num_users)
+   components = []
+   for root in range(graph.num_users):
+      if seen[root]:
+         continue
+      seen[root] = 1
+      members = [root]
+      for uid in members:
+         for vid in graph.neighbors(uid):
+            if not seen[vid]:
+               seen[vid] = 1
+               members.append(vid)
+      components.append(members)
+   return components
+
+
+def _subgraph(graph, members):
+   """Extract the CSR arrays of a component with local node IDs."""
+   local = {uid: index for index, uid in enumerate(members)}
+   offsets, targets = [0], []
+   for uid in members:
+      targets.extend(local[vid] for vid in graph.neighbors(uid))
+      offsets.append(len(targets))
+   return offsets, targets
+
+
+def louvain(graph, resolution=1.0, max_passes=10, workers=1, executor="thread", tol=1e-9):
+   """
+   Detect communities with the Louvain modularity heuristic.
+
+   Connected components never share a community, so with several workers
+   the components are optimised in parallel against the global edge weight.
+
+   Args:
+       graph (CompactGraph): Compact graph (treated as undirected)
+       resolution (float): Resolution parameter (higher = smaller communities)
+       max_passes (int): Maximum number of aggregation passes
+       workers (int): Number of parallel workers (1 = serial)
+       executor (str): "thread" or "process"
+       tol (float): Minimum modularity gain for a move
+
+   Returns:
+       list: Community label for every user ID
+   """
+   if max_passes < 1:
+      raise ValueError("max_passes must be at least 1")
+   graph = as_compact_graph(graph, undirected=True)
+   labels = list(range(graph.num_users))
+   m2 = len(graph.targets)
+   if m2 == 0:
+      return labels
+
+   components = [members for members in _components(graph) if len(members) > 1]
+   jobs = [_subgraph(graph, members) + (m2, resolution, max_passes, tol) for members in components]
+   if workers > 1 and len(jobs) > 1:
+      with _make_executor(executor, workers) as pool:
+         results = list(pool.map(_louvain_component, *zip(*jobs)))
+   else:
+      results = [_louvain_component(*job) for job in jobs]
+
+   for members, local_labels in zip(components, results):
+      representative = {}
+      for uid, label in zip(members, local_labels):
+         labels[uid] = representative.setdefault(label, uid)
+   return labels
+
+
+def labels_to_communities(graph, labels, min_size=1, prefix="community", overlap_ratio=None):
+   """
+   Convert per-user labels into the communities dict used by identify_bridge_users.
+
+   Args:
+       graph (CompactGraph): Compact graph the labels belong to
+       labels (list): Community label for every user ID
+       min_size (int): Drop communities with fewer members
+       prefix (str): Prefix of the generated community names
+       overlap_ratio (float): If set, users also join every neighbouring
+           community holding at least this share of their neighbours
+
+   Returns:
+       dict: Dictionary of community sets
+   """
+   graph = as_compact_graph(graph, undirected=True)
+   members = {}
+   for uid, label in enumerate(labels):
+      members.setdefault(label, set()).add(uid)
+
+   if overlap_ratio is not None:
+      if not 0 < overlap_ratio <= 1:
+         raise ValueError("overlap_ratio must be in (0, 1]")
+      extra = []
+      for uid in range(graph.num_users):
+         degree = graph.degree(uid)
+         if degree == 0:
+            continue
+         counts = {}
+         for vid in graph.neighbors(uid):
+            counts[labels[vid]] = counts.get(labels[vid], 0) + 1
+         for label, count in counts.items():
+            if label != labels[uid] and count / degree >= overlap_ratio:
+               extra.append((label, uid))
+      for label, uid in extra:
+         members[label].add(uid)
+
+   names = graph.interner.names
+   ordered = sorted((group for group in members.values() if len(group) >= min_size),
+                    key=lambda group: (-len(group), min(group)))
+   return {f"{prefix}_{index}": {names[uid] for uid in group} for index, group in enumerate(ordered)}
+
+
+def detect_communities(connections, method="louvain", workers=1, executor="thread",
+                       min_size=1, overlap_ratio=None, **options):
+   """
+   Discover communities from connections.
+
+   Args:
+       connections: Dictionary of user connections or a CompactGraph
+       method (str): "louvain" or "label_propagation"
+       workers (int): Number of parallel workers (1 = serial)
+       executor (str): "thread" or "process"
+       min_size (int): Drop communities with fewer members
+       overlap_ratio (float): Share of neighbours needed to also join a
+           neighbouring community (None = disjoint communities)
+       **options: Extra arguments for the detection method
+
+   Returns:
+       dict: Dictionary of community sets, ready for identify_bridge_users
+   """
+   if connections is None:
+      raise ValueError("Connections data cannot be None")
+   graph = as_compact_graph(connections, undirected=True)
+   if method == "louvain":
+      labels = louvain(graph, workers=workers, executor=executor, **options)
+   elif method == "label_propagation":
+      labels = label_propagation(graph, workers=workers, executor=executor, **options)
+   else:
+      raise ValueError(f"Unknown community detection method {method!r}")
+   return labels_to_communities(graph, labels, min_size=min_size, overlap_ratio=overlap_ratio)
@@ -0,0 +1,257 @@
+"""
+Compressed Adjacency
+This module stores sorted neighbor IDs as gap-encoded varints in fixed-size
+blocks with skip pointers, so edge checks and intersections decode only the
+blocks they need.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+from graph_core import as_compact_graph
+from sorted_kernels import GALLOP_RATIO, symmetric_difference_sorted
+
+DEFAULT_BLOCK_SIZE = 64
+
+
+def encode_varint(value, out):
+   """
+   Append an unsigned integer as a little-endian base-128 varint.
+
+   Args:
+       value (int): Non-negative integer
+       out (bytearray): Buffer to append to
+   """
+   while value >= 0x80:
+      out.append((value & 0x7F) | 0x80)
+      value >>= 7
+   out.append(value)
+
+
+class CompressedGraph(Mapping):
+   """
+   Read-only adjacency with block-compressed neighbor lists.
+
+   Every row is cut into blocks of block_size IDs. The first ID of each block
+   and the byte offset of its gap stream are kept uncompressed as skip
+   pointers. The remaining IDs are stored as varint gaps to their
+   predecessor. Like CompactGraph it is also a mapping from user name to a
+   set of neighbor names.
+   """
+
+   def __init__(self, interner, row_offsets, block_starts, block_first, block_offsets, data,
+                block_size, undirected=False):
+      self.interner = interner
+      self.row_offsets = row_offsets
+      self.block_starts = block_starts
+      self.block_first = block_first
+      self.block_offsets = block_offsets
+      self.data = data
+      self.block_size = block_size
+      self.undirected = undirected
+
+   @classmethod
+   def from_graph(cls, graph, block_size=DEFAULT_BLOCK_SIZE):
+      """
+      Compress a compact graph or a connections dict.
+
+      Args:
+          graph: CompactGraph or dictionary of user connections
+          block_size (int): Number of IDs per block
+
+      Returns:
+          CompressedGraph: The compressed graph
+      """
+      if block_size < 1:
+         raise ValueError("Block size must be at least 1")
+      graph = as_compact_graph(graph)
+      block_starts = array("q", [0])
+      block_first = array("q")
+      block_offsets = array("q")
+      data = bytearray()
+      for uid in range(graph.num_users):
+         row = graph.neighbors(uid)
+         for start in range(0, len(row), block_size):
+            block = row[start:start + block_size]
+            block_first.append(block[0])
+            block_offsets.append(len(data))
+            previous = block[0]
+            for value in block[1:]:
+               encode_varint(value - previous, data)
+               previous = value
+         block_starts.append(len(block_first))
+      return cls(graph.interner, array("q", graph.offsets), block_starts, block_first, block_offsets,
+                 bytes(data), block_size, graph.undirected)
+
+   @property
+   def num_users(self):
+      """int: Number of users in the graph."""
+      return len(self.interner)
+
+   def nbytes(self):
+      """
+      Get the memory used by the adjacency arrays.
+
+      Returns:
+          int: Total size in bytes of offsets, skip pointers and gap data
+      """
+      arrays = (self.row_offsets, self.block_starts, self.block_first, self.block_offsets)
+      return sum(len(values) * values.itemsize for values in arrays) + len(self.data)
+
+   def degree(self, uid):
+      """
+      Get the number of neighbors of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          int: Out-degree of the user
+      """
+      return self.row_offsets[uid + 1] - self.row_offsets[uid]
+
+   def _block_count(self, uid, block):
+      """Number of IDs in one block of a row."""
+      first_block = self.block_starts[uid]
+      remaining = self.degree(uid) - (block - first_block) * self.block_size
+      return min(self.block_size, remaining)
+
+   def _iter_block(self, uid, block):
+      """Decode one block straight from the gap bytes."""
+      data = self.data
+      pos = self.block_offsets[block]
+      value = self.block_first[block]
+      yield value
+      for _ in range(self._block_count(uid, block) - 1):
+         gap = shift = 0
+         while True:
+            byte = data[pos]
+            pos += 1
+            gap |= (byte & 0x7F) << shift
+            if byte < 0x80:
+               break
+            shift += 7
+         value += gap
+         yield value
+
+   def iter_neighbors(self, uid):
+      """
+      Decode the neighbor IDs of a user in ascending order.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          iterator: Sorted neighbor IDs
+      """
+      for block in range(self.block_starts[uid], self.block_starts[uid + 1]):
+         yield from self._iter_block(uid, block)
+
+   def _contains_id(self, uid, vid):
+      """Check one ID by binary search over skip pointers and one block decode."""
+      lo, hi = self.block_starts[uid], self.block_starts[uid + 1]
+      block = bisect_right(self.block_first, vid, lo, hi) - 1
+      if block < lo:
+         return False
+      for value in self._iter_block(uid, block):
+         if value >= vid:
+            return value == vid
+      return False
+
+   def _intersect_ids(self, uid, vid):
+      """Intersect two rows, decoding only blocks whose ranges overlap."""
+      if self.degree(uid) > self.degree(vid):
+         uid, vid = vid, uid
+      if self.degree(vid) >= GALLOP_RATIO * max(1, self.degree(uid)):
+         return [wid for wid in self.iter_neighbors(uid) if self._contains_id(vid, wid)]
+
+      result = []
+      first = self.block_first
+      end_a, end_b = self.block_starts[uid + 1], self.block_starts[vid + 1]
+      block_a, block_b = self.block_starts[uid], self.block_starts[vid]
+      values_a = values_b = None
+      while block_a < end_a and block_b < end_b:
+         # Each block covers [its first ID, the next block's first ID)
+         stop_a = first[block_a + 1] if block_a + 1 < end_a else None
+         stop_b = first[block_b + 1] if block_b + 1 < end_b else None
+         overlap = (stop_b is None or first[block_a] < stop_b) and (stop_a is None or first[block_b] < stop_a)
+         if overlap:
+            if values_a is None:
+               values_a = list(self._iter_block(uid, block_a))
+            if values_b is None:
+               values_b = set(self._iter_block(vid, block_b))
+            result.extend(value for value in values_a if value in values_b)
+         if stop_a is not None and (stop_b is None or stop_a <= stop_b):
+            block_a += 1
+            values_a = None
+            if stop_a == stop_b:
+               block_b += 1
+               values_b = None
+         elif stop_b is not None:
+            block_b += 1
+            values_b = None
+         else:
+            break
+      return result
+
+   def has_edge(self, user_a, user_b):
+      """
+      Check whether an edge exists between two users.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+
+      Returns:
+          bool: True if user_b is a neighbor of user_a
+      """
+      if user_b not in self.interner:
+         return False
+      return self._contains_id(self.interner.id_of(user_a), self.interner.id_of(user_b))
+
+   def mutual_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors shared by two users without decoding whole rows.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of mutual connections
+      """
+      names = self.interner.names
+      ids = self._intersect_ids(self.interner.id_of(user_a), self.interner.id_of(user_b))
+      return {names[wid] for wid in ids}
+
+   def exclusive_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors of exactly one of two users.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of exclusive connections
+      """
+      names = self.interner.names
+      row_a = list(self.iter_neighbors(self.interner.id_of(user_a)))
+      row_b = list(self.iter_neighbors(self.interner.id_of(user_b)))
+      return {names[wid] for wid in symmetric_difference_sorted(row_a, row_b)}
+
+   def __getitem__(self, name):
+      if name not in self.interner:
+         raise KeyError(name)
+      names = self.interner.names
+      return {names[vid] for vid in self.iter_neighbors(self.interner.id_of(name))}
+
+   def __contains__(self, name):
+      return name in self.interner
+
+   def __iter__(self):
+      return iter(self.interner)
+
+   def __len__(self):
+      return len(self.interner)
@@ -0,0 +1,351 @@
+"""
+Batched Graph Mutations
+This module collects edge and group-membership changes in a GraphBatch and
+applies them to the connections, the groups and every registered index in
+one grouped, deduplicated pass.
+"""
+
+from collections import namedtuple
+from operator import itemgetter
+
+# Every field is a list of (user, target) or (group, user) pairs sorted by their first item
+BatchChanges = namedtuple("BatchChanges", ["added_edges", "removed_edges", "added_members", "removed_members"])
+
+
+class ReverseAdjacency:
+   """
+   Incoming connections of every user (who lists the user as a friend).
+   """
+
+   def __init__(self, connections):
+      self.followers = {}
+      for user, friends in connections.items():
+         for friend in friends:
+            self.followers.setdefault(friend, set()).add(user)
+
+   def followers_of(self, user):
+      """
+      Get the users that have a connection to user.
+
+      Args:
+          user (str): User
+
+      Returns:
+          set: Set of users with an edge to user
+      """
+      return set(self.followers.get(user, ()))
+
+   def add_edge(self, user_a, user_b):
+      """Record a connection from user_a to user_b."""
+      self.followers.setdefault(user_b, set()).add(user_a)
+
+   def remove_edge(self, user_a, user_b):
+      """Forget the connection from user_a to user_b."""
+      self.followers.get(user_b, set()).discard(user_a)
+
+   def apply_batch(self, changes):
+      """Apply a committed batch."""
+      followers = self.followers
+      for user_a, user_b in changes.added_edges:
+         sources = followers.get(user_b)
+         if sources is None:
+            followers[user_b] = {user_a}
+         else:
+            sources.add(user_a)
+      for user_a, user_b in changes.removed_edges:
+         followers.get(user_b, set()).discard(user_a)
+
+
+class MembershipIndex:
+   """
+   Groups of every user, the inverse of a groups dict.
+   """
+
+   def __init__(self, groups):
+      self.memberships = {}
+      for group, members in groups.items():
+         for user in members:
+            self.memberships.setdefault(user, set()).add(group)
+
+   def groups_of(self, user):
+      """
+      Get the groups a user belongs to.
+
+      Args:
+          user (str): User
+
+      Returns:
+          set: Set of group names
+      """
+      return set(self.memberships.get(user, ()))
+
+   def add_member(self, group, user):
+      """Record that a user joined a group."""
+      self.memberships.setdefault(user, set()).add(group)
+
+   def remove_member(self, group, user):
+      """Record that a user left a group."""
+      self.memberships.get(user, set()).discard(group)
+
+   def apply_batch(self, changes):
+      """Apply a committed batch."""
+      memberships = self.memberships
+      for group, user in changes.added_members:
+         groups = memberships.get(user)
+         if groups is None:
+            memberships[user] = {group}
+         else:
+            groups.add(group)
+      for group, user in changes.removed_members:
+         memberships.get(user, set()).discard(group)
+
+
+class DensityCounter:
+   """
+   Running count of the connected pairs inside a fixed user set.
+
+   Like calculate_network_density, a pair counts once whether one or both
+   users list the other, so the density is the same without rescanning.
+   The counter reads connections after every change has been applied.
+   """
+
+   def __init__(self, users, connections):
+      self.users = set(users)
+      self.connections = connections
+      self.internal_pairs = 0
+      for user in self.users:
+         for friend in self.users.intersection(connections.get(user, ())):
+            if friend > user or user not in connections.get(friend, ()):
+               self.internal_pairs += 1
+
+   @property
+   def density(self):
+      """float: Connected pairs inside the user set divided by n * (n - 1) / 2."""
+      n = len(self.users)
+      return self.internal_pairs / (n * (n - 1) / 2) if n > 1 else 0.0
+
+   def _inside(self, user_a, user_b):
+      return user_a != user_b and user_a in self.users and user_b in self.users
+
+   def add_edge(self, user_a, user_b):
+      """Count a newly added connection unless the reverse one already linked the pair."""
+      if self._inside(user_a, user_b) and user_a not in self.connections.get(user_b, ()):
+         self.internal_pairs += 1
+
+   def remove_edge(self, user_a, user_b):
+      """Uncount a removed connection unless the reverse one still links the pair."""
+      if self._inside(user_a, user_b) and user_a not in self.connections.get(user_b, ()):
+         self.internal_pairs -= 1
+
+   def apply_batch(self, changes):
+      """Apply a committed batch, checking only edges with both users in the set."""
+      users = self.users
+      changed = {}
+      for pairs, added in ((changes.added_edges, True), (changes.removed_edges, False)):
+         for user_a, user_b in pairs:
+            if user_a in users and user_b in users and user_a != user_b:
+               changed[user_a, user_b] = added
+
+      def connected(user_a, user_b, before):
+         linked = user_b in self.connections.get(user_a, ())
+         if before and (user_a, user_b) in changed:
+            linked = not changed[user_a, user_b]
+         return linked
+
+      for user_a, user_b in changed:
+         if (user_b, user_a) in changed and user_b < user_a:
+            continue  # the pair was counted from its other direction
+         before = connected(user_a, user_b, True) or connected(user_b, user_a, True)
+         after = connected(user_a, user_b, False) or connected(user_b, user_a, False)
+         self.internal_pairs += after - before
+
+
+class GraphBatch:
+   """
+   Transaction that applies many edge and membership changes at once.
+
+   Changes are buffered as a flat list until commit, which sorts them by
+   source user (or group) and handles each source's changes in one pass.
+   For every edge or membership only the last change counts, and changes
+   that would not alter anything (adding an existing edge, removing a
+   missing one) are dropped. Effective changes are worked out against the
+   current data before anything is mutated.
+
+   Adjacency has a single writer. By default the batch updates the
+   connections sets itself. An index with owns_adjacency set (such as
+   TwoHopIndex, whose add_edge/remove_edge also update connections) must
+   wrap the same connections; it then becomes the writer and receives every
+   effective edge change through add_edge/remove_edge. Every other index is
+   an observer and is notified once the data is updated: indexes with an
+   apply_batch method receive the whole BatchChanges, others get
+   add_edge/remove_edge and add_member/remove_member calls for each
+   effective change.
+
+   Used as a context manager the batch commits on success and is discarded
+   if the block raises.
+   """
+
+   def __init__(self, connections, groups=None, indexes=()):
+      if connections is None:
+         raise ValueError("Connections data cannot be None")
+      self.connections = connections
+      self.groups = groups if groups is not None else {}
+      self.indexes = []
+      # (owner, member, insert) tuples in queue order
+      self._edges = []
+      self._members = []
+      for index in indexes:
+         self.register(index)
+
+   def register(self, index):
+      """
+      Register an index to be updated on every commit.
+
+      Args:
+          index: Object with apply_batch, or with add_edge/remove_edge and
+              optionally add_member/remove_member methods
+      """
+      if getattr(index, "owns_adjacency", False):
+         if index.connections is not self.connections and index is not self.connections:
+            raise ValueError("An index that owns adjacency must wrap the batch's connections")
+         if self._writer() is not None:
+            raise ValueError("Only one index can own adjacency")
+      self.indexes.append(index)
+
+   def _writer(self):
+      """Get the object whose add_edge/remove_edge mutate connections, or None."""
+      if getattr(self.connections, "owns_adjacency", False):
+         return self.connections
+      for index in self.indexes:
+         if getattr(index, "owns_adjacency", False):
+            return index
+      return None
+
+   def add_edge(self, user_a, user_b):
+      """Queue a connection from user_a to user_b."""
+      self._edges.append((user_a, user_b, True))
+
+   def remove_edge(self, user_a, user_b):
+      """Queue the removal of the connection from user_a to user_b."""
+      self._edges.append((user_a, user_b, False))
+
+   def add_member(self, group, user):
+      """Queue adding a user to a group."""
+      self._members.append((group, user, True))
+
+   def remove_member(self, group, user):
+      """Queue removing a user from a group."""
+      self._members.append((group, user, False))
+
+   def add_edges(self, pairs):
+      """Queue many (user_a, user_b) connections."""
+      self._edges.extend((user_a, user_b, True) for user_a, user_b in pairs)
+
+   def remove_edges(self, pairs):
+      """Queue the removal of many (user_a, user_b) connections."""
+      self._edges.extend((user_a, user_b, False) for user_a, user_b in pairs)
+
+   def add_members(self, group, users):
+      """Queue adding many users to a group."""
+      self._members.extend((group, user, True) for user in users)
+
+   def remove_members(self, group, users):
+      """Queue removing many users from a group."""
+      self._members.extend((group, user, False) for user in users)
+
+   def __len__(self):
+      return len(self._edges) + len(self._members)
+
+   def discard(self):
+      """Drop all queued changes."""
+      self._edges.clear()
+      self._members.clear()
+
+   @staticmethod
+   def _plan(pending, sets):
+      """Work out the effective (owner, member) additions and removals; sets is only read."""
+      # The sort is stable, so each owner's changes keep their queue order,
+      # and scanning backwards meets the last change to each member first
+      pending.sort(key=itemgetter(0))
+      added, removed = [], []
+      get = sets.get
+      owner = current = seen = None
+      for key, member, insert in reversed(pending):
+         if seen is None or key != owner:
+            owner, current, seen = key, get(key), {}
+         if member in seen:
+            continue
+         seen[member] = insert
+         if insert:
+            if current is None or member not in current:
+               added.append((owner, member))
+         elif current is not None and member in current:
+            removed.append((owner, member))
+      added.reverse()
+      removed.reverse()
+      return added, removed
+
+   @staticmethod
+   def _apply(sets, added, removed):
+      """Apply planned changes; every pair was hashed while planning, so this cannot fail."""
+      for owner, member in removed:
+         sets[owner].discard(member)
+      for owner, member in added:
+         current = sets.get(owner)
+         if current is None:
+            current = sets[owner] = set()
+         current.add(member)
+
+   def commit(self):
+      """
+      Apply the queued changes to the data and all registered indexes.
+
+      Edges and memberships are both planned before anything is changed, so
+      a bad change (an unhashable user, say) raises with the data untouched.
+      The queue is cleared either way.
+
+      Returns:
+          BatchChanges: The changes that took effect, sorted by source user or group
+      """
+      try:
+         added_edges, removed_edges = self._plan(self._edges, self.connections)
+         added_members, removed_members = self._plan(self._members, self.groups)
+      finally:
+         self.discard()
+      changes = BatchChanges(added_edges, removed_edges, added_members, removed_members)
+      writer = self._writer()
+      if writer is None:
+         self._apply(self.connections, added_edges, removed_edges)
+      else:
+         # Planned against the current adjacency, so every removal exists
+         for user_a, user_b in removed_edges:
+            writer.remove_edge(user_a, user_b)
+         for user_a, user_b in added_edges:
+            writer.add_edge(user_a, user_b)
+      self._apply(self.groups, added_members, removed_members)
+
+      for index in self.indexes:
+         if index is writer:
+            continue
+         if hasattr(index, "apply_batch"):
+            index.apply_batch(changes)
+            continue
+         for user_a, user_b in removed_edges:
+            index.remove_edge(user_a, user_b)
+         for user_a, user_b in added_edges:
+            index.add_edge(user_a, user_b)
+         if hasattr(index, "add_member"):
+            for group, user in removed_members:
+               index.remove_member(group, user)
+            for group, user in added_members:
+               index.add_member(group, user)
+      return changes
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, exc_type, exc, traceback):
+      if exc_type is None:
+         self.commit()
+      else:
+         self.discard()
@@ -0,0 +1,448 @@
+"""
+Compact Graph Representation
+This module stores the social network as interned user IDs with CSR adjacency arrays.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from sorted_kernels import intersect_sorted, symmetric_difference_sorted
+
+SNAPSHOT_MAGIC = b"SNGRAPH1"
+SNAPSHOT_HEADER = struct.Struct("<8sQQQQ")
+_NAME_LENGTH = struct.Struct("<H")
+
+
+class UserInterner:
+   """
+   Map user names to dense integer IDs and back.
+   """
+
+   __slots__ = ("_ids", "_names")
+
+   def __init__(self, names=()):
+      self._ids = {}
+      self._names = []
+      for name in names:
+         self.intern(name)
+
+   def intern(self, name):
+      """
+      Return the ID of a user, assigning the next free ID if it is new.
+
+      Args:
+          name (str): User name
+
+      Returns:
+          int: Dense user ID
+      """
+      uid = self._ids.get(name)
+      if uid is None:
+         uid = len(self._names)
+         self._ids[name] = uid
+         self._names.append(name)
+      return uid
+
+   def id_of(self, name):
+      """
+      Look up the ID of a known user.
+
+      Args:
+          name (str): User name
+
+      Returns:
+          int: Dense user ID
+      """
+      uid = self._ids.get(name)
+      if uid is None:
+         raise ValueError(f"User {name} not found in connections")
+      return uid
+
+   def get(self, name, default=None):
+      """
+      Look up the ID of a user without raising for unknown users.
+
+      Args:
+          name (str): User name
+          default: Value returned for unknown users
+
+      Returns:
+          int: Dense user ID, or default
+      """
+      return self._ids.get(name, default)
+
+   def name_of(self, uid):
+      """
+      Look up the name of a user ID.
+
+      Args:
+          uid (int): Dense user ID
+
+      Returns:
+          str: User name
+      """
+      return self._names[uid]
+
+   @property
+   def names(self):
+      """list: User names indexed by ID."""
+      return self._names
+
+   def __len__(self):
+      return len(self._names)
+
+   def __contains__(self, name):
+      return name in self._ids
+
+   def __iter__(self):
+      return iter(self._names)
+
+
+class CompactGraph(Mapping):
+   """
+   Read-only adjacency in compressed sparse row (CSR) form.
+
+   Row ``u`` holds the sorted neighbor IDs ``targets[offsets[u]:offsets[u + 1]]``.
+   The graph is also a read-only mapping from user name to a set of neighbor
+   names, so it can be passed anywhere a ``connections`` dict is expected.
+   """
+
+   def __init__(self, interner, offsets, targets, undirected=False):
+      if len(offsets) != len(interner) + 1:
+         raise ValueError("Offsets must have one entry per user plus one")
+      self.interner = interner
+      self.offsets = offsets
+      self.targets = targets
+      self.undirected = undirected
+
+   @classmethod
+   def from_connections(cls, connections, users=None, undirected=False):
+      """
+      Build a compact graph from a connections dict.
+
+      Args:
+          connections (dict): Dictionary of user connections
+          users (set): Extra users to include even if they have no connections
+          undirected (bool): Store every edge in both directions
+
+      Returns:
+          CompactGraph: The compact graph
+      """
+      if connections is None:
+         raise ValueError("Connections data cannot be None")
+
+      names = set(connections)
+      for friends in connections.values():
+         names.update(friends)
+      if users:
+         names.update(users)
+      interner = UserInterner(sorted(names))
+
+      rows = [[] for _ in range(len(interner))]
+      for user, friends in connections.items():
+         uid = interner.id_of(user)
+         for friend in friends:
+            fid = interner.id_of(friend)
+            if fid == uid:
+               continue
+            rows[uid].append(fid)
+            if undirected:
+               rows[fid].append(uid)
+
+      return cls._from_rows(interner, rows, undirected)
+
+   @classmethod
+   def _from_rows(cls, interner, rows, undirected):
+      offsets = array("q", [0])
+      targets = array("q")
+      for row in rows:
+         targets.extend(sorted(set(row)))
+         offsets.append(len(targets))
+      return cls(interner, offsets, targets, undirected)
+
+   @property
+   def num_users(self):
+      """int: Number of users in the graph."""
+      return len(self.interner)
+
+   @property
+   def num_edges(self):
+      """int: Number of edges (each undirected edge counted once)."""
+      if self.undirected:
+         return len(self.targets) // 2
+      return len(self.targets)
+
+   def neighbors(self, uid):
+      """
+      Get the sorted neighbor IDs of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          array: Sorted neighbor IDs
+      """
+      return self.targets[self.offsets[uid]:self.offsets[uid + 1]]
+
+   def degree(self, uid):
+      """
+      Get the number of neighbors of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          int: Out-degree of the user
+      """
+      return self.offsets[uid + 1] - self.offsets[uid]
+
+   def has_edge(self, user_a, user_b):
+      """
+      Check whether an edge exists between two users.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+
+      Returns:
+          bool: True if user_b is a neighbor of user_a
+      """
+      if user_b not in self.interner:
+         return False
+      uid = self.interner.id_of(user_a)
+      vid = self.interner.id_of(user_b)
+      start, stop = self.offsets[uid], self.offsets[uid + 1]
+      pos = bisect_left(self.targets, vid, start, stop)
+      return pos < stop and self.targets[pos] == vid
+
+   def mutual_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors shared by two users with a sorted-array kernel.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of mutual connections
+      """
+      uid = self.interner.id_of(user_a)
+      vid = self.interner.id_of(user_b)
+      names = self.interner.names
+      return {names[wid] for wid in intersect_sorted(self.neighbors(uid), self.neighbors(vid))}
+
+   def exclusive_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors of exactly one of two users with a sorted-array kernel.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of exclusive connections
+      """
+      uid = self.interner.id_of(user_a)
+      vid = self.interner.id_of(user_b)
+      names = self.interner.names
+      return {names[wid] for wid in symmetric_difference_sorted(self.neighbors(uid), self.neighbors(vid))}
+
+   def to_undirected(self):
+      """
+      Get a symmetric copy of the graph.
+
+      Returns:
+          CompactGraph: Graph with every edge stored in both directions
+      """
+      if self.undirected:
+         return self
+      rows = [list(self.neighbors(uid)) for uid in range(self.num_users)]
+      for uid in range(self.num_users):
+         for vid in self.neighbors(uid):
+            rows[vid].append(uid)
+      return self._from_rows(self.interner, rows, True)
+
+   def relabel(self, permutation):
+      """
+      Renumber the users, keeping every name attached to its own row.
+
+      Args:
+          permutation (list): New ID for every old ID
+
+      Returns:
+          CompactGraph: Graph in which old ID u is stored as permutation[u]
+      """
+      n = self.num_users
+      if len(permutation) != n or sorted(permutation) != list(range(n)):
+         raise ValueError("Permutation must list every user ID exactly once")
+      old_names = self.interner.names
+      names = [None] * n
+      rows = [None] * n
+      for old, new in enumerate(permutation):
+         names[new] = old_names[old]
+         rows[new] = [permutation[vid] for vid in self.neighbors(old)]
+      return self._from_rows(UserInterner(names), rows, self.undirected)
+
+   def to_connections(self):
+      """
+      Convert the graph back into a connections dict.
+
+      Returns:
+          dict: Dictionary of user connections
+      """
+      return {name: self[name] for name in self.interner}
+
+   def __getitem__(self, name):
+      if name not in self.interner:
+         raise KeyError(name)
+      names = self.interner.names
+      return {names[vid] for vid in self.neighbors(self.interner.id_of(name))}
+
+   def __contains__(self, name):
+      return name in self.interner
+
+   def __iter__(self):
+      return iter(self.interner)
+
+   def __len__(self):
+      return len(self.interner)
+
+
+def as_compact_graph(connections, undirected=False):
+   """
+   Get a compact graph for a connections dict or an existing compact graph.
+
+   Args:
+       connections: Dictionary of user connections or a CompactGraph
+       undirected (bool): Require a symmetric graph
+
+   Returns:
+       CompactGraph: The compact graph
+   """
+   if isinstance(connections, CompactGraph):
+      return connections.to_undirected() if undirected else connections
+   return CompactGraph.from_connections(connections, undirected=undirected)
+
+
+def _array_bytes(values):
+   values = array("q", values)
+   if sys.byteorder == "big":
+      values.byteswap()
+   return values.tobytes()
+
+
+def _bytes_array(data):
+   values = array("q")
+   values.frombytes(data)
+   if sys.byteorder == "big":
+      values.byteswap()
+   return values
+
+
+def snapshot_layout(header):
+   """
+   Get the byte offsets of the sections of a snapshot file.
+
+   Args:
+       header (bytes): The first SNAPSHOT_HEADER.size bytes of the file
+
+   Returns:
+       dict: num_users, num_targets, undirected and the start offset of the
+           offsets, targets, permutation and names sections
+   """
+   magic, num_users, num_targets, names_size, flags = SNAPSHOT_HEADER.unpack(header)
+   if magic != SNAPSHOT_MAGIC:
+      raise ValueError("Not a graph snapshot file")
+   offsets_start = SNAPSHOT_HEADER.size
+   targets_start = offsets_start + 8 * (num_users + 1)
+   permutation_start = targets_start + 8 * num_targets
+   names_start = permutation_start + 8 * num_users
+   return {
+      "num_users": num_users,
+      "num_targets": num_targets,
+      "undirected": bool(flags & 1),
+      "offsets": offsets_start,
+      "targets": targets_start,
+      "permutation": permutation_start,
+      "names": names_start,
+      "names_size": names_size,
+   }
+
+
+def save_snapshot(graph, path, permutation=None):
+   """
+   Write a compact graph and its ID permutation to a binary snapshot file.
+
+   The CSR arrays are stored as little-endian 64-bit integers at fixed
+   offsets (see snapshot_layout) so that readers can fetch single rows.
+
+   Args:
+       graph (CompactGraph): Graph to save
+       path (str): Destination file
+       permutation (list): New ID for every original ID (identity if None)
+   """
+   n = graph.num_users
+   if permutation is None:
+      permutation = range(n)
+   elif len(permutation) != n:
+      raise ValueError("Permutation must list every user ID exactly once")
+   names = bytearray()
+   for name in graph.interner:
+      encoded = name.encode("utf-8")
+      names += _NAME_LENGTH.pack(len(encoded)) + encoded
+
+   tmp_path = path + ".tmp"
+   with open(tmp_path, "wb") as f:
+      f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, n, len(graph.targets), len(names), int(graph.undirected)))
+      f.write(_array_bytes(graph.offsets))
+      f.write(_array_bytes(graph.targets))
+      f.write(_array_bytes(permutation))
+      f.write(names)
+      f.flush()
+      os.fsync(f.fileno())
+   os.replace(tmp_path, path)
+
+
+def read_snapshot_names(data, count):
+   """
+   Decode the names section of a snapshot.
+
+   Args:
+       data (bytes): Names section
+       count (int): Number of names
+
+   Returns:
+       list: User names indexed by ID
+   """
+   names = []
+   pos = 0
+   for _ in range(count):
+      (size,) = _NAME_LENGTH.unpack_from(data, pos)
+      pos += _NAME_LENGTH.size
+      names.append(data[pos:pos + size].decode("utf-8"))
+      pos += size
+   return names
+
+
+def load_snapshot(path):
+   """
+   Read a snapshot written by save_snapshot.
+
+   Args:
+       path (str): Snapshot file
+
+   Returns:
+       tuple: (CompactGraph, permutation array)
+   """
+   with open(path, "rb") as f:
+      data = f.read()
+   layout = snapshot_layout(data[:SNAPSHOT_HEADER.size])
+   offsets = _bytes_array(data[layout["offsets"]:layout["targets"]])
+   targets = _bytes_array(data[layout["targets"]:layout["permutation"]])
+   permutation = _bytes_array(data[layout["permutation"]:layout["names"]])
+   names = read_snapshot_names(data[layout["names"]:layout["names"] + layout["names_size"]], layout["num_users"])
+   return CompactGraph(UserInterner(names), offsets, targets, layout["undirected"]), permutation
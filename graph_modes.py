@@ -0,0 +1,381 @@
+"""
+Graph Modes
+This module gives connections an explicit directed or undirected meaning and
+stores undirected graphs with every edge kept only once.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from graph_core import UserInterner
+from sorted_kernels import intersect_sorted, symmetric_difference_sorted
+
+DIRECTED = "directed"
+UNDIRECTED = "undirected"
+GRAPH_MODES = (DIRECTED, UNDIRECTED)
+
+
+class GraphView(Mapping):
+   """
+   Connections mapping with explicit directed or undirected semantics.
+
+   Every user that appears anywhere in the connections (also only as a
+   friend, like user8 in the sample data) becomes a key. In directed mode
+   view[user] holds the outgoing connections; in undirected mode it holds
+   the users linked to user in either direction. Undirected views keep a
+   single symmetric adjacency, directed views keep the outgoing and the
+   incoming edges. Neighbor sets are frozensets and the view is built once,
+   so create a new one after changing connections.
+
+   With a view the analysis functions agree on one meaning per mode:
+   - is_direct_connection: edge a -> b (directed) or a - b (undirected)
+   - is_second_degree_connection: path a -> x -> b, or a - x - b
+   - find_isolated_users: no outgoing and no incoming edges, in both modes
+   - find_mutual_connections, recommend_connections: over view[user]
+   """
+
+   def __init__(self, connections, mode=DIRECTED):
+      if connections is None:
+         raise ValueError("Connections data cannot be None")
+      if mode not in GRAPH_MODES:
+         raise ValueError(f"Unknown graph mode: {mode}")
+      self.mode = mode
+      outgoing = {}
+      incoming = outgoing if mode == UNDIRECTED else {}
+      for user, friends in connections.items():
+         outgoing.setdefault(user, set()).update(friends)
+         incoming.setdefault(user, set())
+         for friend in friends:
+            outgoing.setdefault(friend, set())
+            incoming.setdefault(friend, set()).add(user)
+      self._adjacency = {user: frozenset(friends) for user, friends in outgoing.items()}
+      # An undirected edge is incoming and outgoing at once
+      if mode == UNDIRECTED:
+         self._incoming = self._adjacency
+      else:
+         self._incoming = {user: frozenset(friends) for user, friends in incoming.items()}
+
+   @property
+   def directed(self):
+      """bool: True in directed mode."""
+      return self.mode == DIRECTED
+
+   def out_neighbors(self, user):
+      """
+      Get the users that user links to; all neighbors in undirected mode.
+
+      Args:
+          user (str): User
+
+      Returns:
+          set: Set of outgoing connections
+      """
+      return set(self._lookup(self._adjacency, user))
+
+   def in_neighbors(self, user):
+      """
+      Get the users that link to user; all neighbors in undirected mode.
+
+      Args:
+          user (str): User
+
+      Returns:
+          set: Set of incoming connections
+      """
+      return set(self._lookup(self._incoming, user))
+
+   def _lookup(self, adjacency, user):
+      friends = adjacency.get(user)
+      if friends is None:
+         raise ValueError(f"User {user} not found in connections")
+      return friends
+
+   def has_edge(self, user_a, user_b):
+      """
+      Check whether user_b is a connection of user_a in this mode.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if directly connected
+      """
+      return user_b in self._lookup(self._adjacency, user_a)
+
+   def is_second_degree(self, user_a, user_b):
+      """
+      Check if two users are linked through a mutual friend in this mode.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if second-degree connected, False otherwise
+      """
+      friends = self._lookup(self._adjacency, user_a)
+      if user_a == user_b or user_b in friends:
+         return False
+      return not self._lookup(self._incoming, user_b).isdisjoint(friends)
+
+   def isolated_users(self, users):
+      """
+      Find users without any incoming or outgoing connection.
+
+      Args:
+          users (set): Set of users to check
+
+      Returns:
+          set: Set of isolated users
+      """
+      return {user for user in users if not self._adjacency.get(user) and not self._incoming.get(user)}
+
+   def __getitem__(self, user):
+      return self._adjacency[user]
+
+   def __iter__(self):
+      return iter(self._adjacency)
+
+   def __len__(self):
+      return len(self._adjacency)
+
+   def __contains__(self, user):
+      return user in self._adjacency
+
+
+class UpperTriangularGraph(Mapping):
+   """
+   Undirected CSR adjacency that stores every edge once.
+
+   Row u holds only the neighbors v > u, which halves the targets array
+   compared with a symmetric CSR. Edge checks need only the row of the
+   smaller ID, and isolated_users needs one pass over the targets. The
+   neighbors below u live in a reverse index that is built on the first
+   neighborhood query and costs as much memory as the upper triangle.
+   """
+
+   def __init__(self, interner, offsets, targets):
+      if len(offsets) != len(interner) + 1:
+         raise ValueError("Offsets must have one entry per user plus one")
+      self.interner = interner
+      self.offsets = offsets
+      self.targets = targets
+      self._lower = None
+
+   @classmethod
+   def from_connections(cls, connections, users=None):
+      """
+      Build an upper-triangular graph, treating every connection as undirected.
+
+      Args:
+          connections (dict): Dictionary of user connections
+          users (set): Extra users to include even if they have no connections
+
+      Returns:
+          UpperTriangularGraph: The graph
+      """
+      if connections is None:
+         raise ValueError("Connections data cannot be None")
+      names = set(connections)
+      for friends in connections.values():
+         names.update(friends)
+      if users:
+         names.update(users)
+      interner = UserInterner(sorted(names))
+
+      rows = [set() for _ in range(len(interner))]
+      for user, friends in connections.items():
+         uid = interner.id_of(user)
+         for friend in friends:
+            fid = interner.id_of(friend)
+            if fid > uid:
+               rows[uid].add(fid)
+            elif fid < uid:
+               rows[fid].add(uid)
+
+      offsets = array("q", [0])
+      targets = array("q")
+      for row in rows:
+         targets.extend(sorted(row))
+         offsets.append(len(targets))
+      return cls(interner, offsets, targets)
+
+   @property
+   def num_users(self):
+      """int: Number of users in the graph."""
+      return len(self.interner)
+
+   @property
+   def num_edges(self):
+      """int: Number of undirected edges."""
+      return len(self.targets)
+
+   def nbytes(self):
+      """
+      Get the memory used by the adjacency arrays.
+
+      Returns:
+          int: Size in bytes of the upper triangle plus the reverse index if built
+      """
+      arrays = [self.offsets, self.targets]
+      if self._lower is not None:
+         arrays.extend(self._lower)
+      return sum(len(values) * values.itemsize for values in arrays)
+
+   def build_reverse_index(self):
+      """
+      Store the neighbors below each user next to the upper triangle.
+
+      The first neighborhood query calls this; call it up front to pay the
+      build cost at load time instead.
+
+      Returns:
+          tuple: Offsets and targets arrays of the transposed rows
+      """
+      if self._lower is None:
+         rows = [[] for _ in range(self.num_users)]
+         for uid in range(self.num_users):
+            for vid in self.targets[self.offsets[uid]:self.offsets[uid + 1]]:
+               rows[vid].append(uid)
+         offsets = array("q", [0])
+         targets = array("q")
+         for row in rows:
+            targets.extend(row)
+            offsets.append(len(targets))
+         self._lower = (offsets, targets)
+      return self._lower
+
+   def _lower_neighbors(self, uid):
+      """Get the sorted neighbor IDs below uid, building the reverse index on first use."""
+      lower_offsets, lower_targets = self.build_reverse_index()
+      return lower_targets[lower_offsets[uid]:lower_offsets[uid + 1]]
+
+   def neighbors(self, uid):
+      """
+      Get all sorted neighbor IDs of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          array: Sorted neighbor IDs below and above uid
+      """
+      return self._lower_neighbors(uid) + self.targets[self.offsets[uid]:self.offsets[uid + 1]]
+
+   def degree(self, uid):
+      """
+      Get the number of neighbors of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          int: Degree of the user
+      """
+      return len(self._lower_neighbors(uid)) + (self.offsets[uid + 1] - self.offsets[uid])
+
+   def has_edge(self, user_a, user_b):
+      """
+      Check whether two users are connected, from either direction.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if the users are connected
+      """
+      if user_b not in self.interner:
+         return False
+      uid, vid = sorted((self.interner.id_of(user_a), self.interner.id_of(user_b)))
+      start, stop = self.offsets[uid], self.offsets[uid + 1]
+      pos = bisect_left(self.targets, vid, start, stop)
+      return pos < stop and self.targets[pos] == vid
+
+   def mutual_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors shared by two users.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of mutual connections
+      """
+      names = self.interner.names
+      ids = intersect_sorted(self.neighbors(self.interner.id_of(user_a)), self.neighbors(self.interner.id_of(user_b)))
+      return {names[wid] for wid in ids}
+
+   def exclusive_neighbors(self, user_a, user_b):
+      """
+      Find the neighbors of exactly one of two users.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of exclusive connections
+      """
+      names = self.interner.names
+      ids = symmetric_difference_sorted(self.neighbors(self.interner.id_of(user_a)),
+                                        self.neighbors(self.interner.id_of(user_b)))
+      return {names[wid] for wid in ids}
+
+   def is_second_degree(self, user_a, user_b):
+      """
+      Check if two users share a neighbor without being connected.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if second-degree connected, False otherwise
+      """
+      if user_a == user_b or self.has_edge(user_a, user_b):
+         return False
+      return bool(intersect_sorted(self.neighbors(self.interner.id_of(user_a)),
+                                   self.neighbors(self.interner.id_of(user_b))))
+
+   def isolated_users(self, users):
+      """
+      Find users without any neighbor.
+
+      Args:
+          users (set): Set of users to check
+
+      Returns:
+          set: Set of isolated users, including users not in the graph
+      """
+      offsets = self.offsets
+      candidates = {}
+      for user in users:
+         uid = self.interner.get(user)
+         if uid is None or offsets[uid] == offsets[uid + 1]:
+            candidates[user] = uid
+      if not candidates:
+         return set()
+      # One pass over the targets marks every user with a smaller neighbor
+      linked = bytearray(self.num_users)
+      for vid in self.targets:
+         linked[vid] = 1
+      return {user for user, uid in candidates.items() if uid is None or not linked[uid]}
+
+   def __getitem__(self, name):
+      if name not in self.interner:
+         raise KeyError(name)
+      names = self.interner.names
+      return {names[vid] for vid in self.neighbors(self.interner.id_of(name))}
+
+   def __contains__(self, name):
+      return name in self.interner
+
+   def __iter__(self):
+      return iter(self.interner)
+
+   def __len__(self):
+      return len(self.interner)
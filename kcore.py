@@ -0,0 +1,233 @@
+"""
+K-Core Decomposition
+This module ranks users into engagement tiers by core number and keeps the
+core numbers up to date as connections are added or removed.
+"""
+
+from array import array
+
+from graph_core import as_compact_graph
+
+
+def core_numbers(graph):
+   """
+   Compute the core number of every user with the bucket-based algorithm.
+
+   Runs in O(users + edges) by keeping users sorted by remaining degree in
+   degree buckets (Batagelj and Zaversnik).
+
+   Args:
+       graph: Dictionary of user connections or a CompactGraph
+
+   Returns:
+       list: Core number for every user ID of the undirected compact graph
+   """
+   graph = as_compact_graph(graph, undirected=True)
+   n = graph.num_users
+   degree = array("q", (graph.degree(uid) for uid in range(n)))
+   max_degree = max(degree, default=0)
+
+   bucket_start = [0] * (max_degree + 1)
+   for d in degree:
+      bucket_start[d] += 1
+   start = 0
+   for d in range(max_degree + 1):
+      count = bucket_start[d]
+      bucket_start[d] = start
+      start += count
+
+   position = [0] * n
+   order = [0] * n
+   for uid in range(n):
+      position[uid] = bucket_start[degree[uid]]
+      order[position[uid]] = uid
+      bucket_start[degree[uid]] += 1
+   for d in range(max_degree, 0, -1):
+      bucket_start[d] = bucket_start[d - 1]
+   bucket_start[0] = 0
+
+   for i in range(n):
+      uid = order[i]
+      for vid in graph.neighbors(uid):
+         if degree[vid] > degree[uid]:
+            d = degree[vid]
+            pos_v = position[vid]
+            pos_w = bucket_start[d]
+            wid = order[pos_w]
+            if vid != wid:
+               position[vid], order[pos_v] = pos_w, wid
+               position[wid], order[pos_w] = pos_v, vid
+            bucket_start[d] += 1
+            degree[vid] -= 1
+   return list(degree)
+
+
+def k_core(graph, k, cores=None):
+   """
+   Extract the users of the k-core.
+
+   Args:
+       graph: Dictionary of user connections or a CompactGraph
+       k (int): Minimum core number
+       cores (list): Precomputed core numbers of the undirected graph
+
+   Returns:
+       set: Set of users whose core number is at least k
+   """
+   if k < 0:
+      raise ValueError("k must be non-negative")
+   graph = as_compact_graph(graph, undirected=True)
+   if cores is None:
+      cores = core_numbers(graph)
+   names = graph.interner.names
+   return {names[uid] for uid, core in enumerate(cores) if core >= k}
+
+
+class CoreIndex:
+   """
+   Core numbers of an undirected graph maintained under edge updates.
+
+   Inserting or deleting an edge changes core numbers by at most one, and
+   only for users with core number min(core(a), core(b)) that are reachable
+   from the endpoints through such users, so updates only visit that subcore.
+   """
+
+   def __init__(self, connections, users=None):
+      graph = as_compact_graph(connections, undirected=True)
+      names = graph.interner.names
+      self._adjacency = {name: set() for name in names}
+      for uid, name in enumerate(names):
+         self._adjacency[name].update(names[vid] for vid in graph.neighbors(uid))
+      self._core = dict(zip(names, core_numbers(graph)))
+      for user in users or ():
+         self._adjacency.setdefault(user, set())
+         self._core.setdefault(user, 0)
+
+   def core_number(self, user):
+      """
+      Get the core number of a user.
+
+      Args:
+          user (str): User
+
+      Returns:
+          int: Core number (0 for isolated users)
+      """
+      if user not in self._core:
+         raise ValueError(f"User {user} not found in connections")
+      return self._core[user]
+
+   def k_core(self, k):
+      """
+      Extract the users of the k-core.
+
+      Args:
+          k (int): Minimum core number
+
+      Returns:
+          set: Set of users whose core number is at least k
+      """
+      if k < 0:
+         raise ValueError("k must be non-negative")
+      return {user for user, core in self._core.items() if core >= k}
+
+   def tiers(self):
+      """
+      Group users by core number.
+
+      Returns:
+          dict: Dictionary with core numbers as keys and sets of users as values
+      """
+      tiers = {}
+      for user, core in self._core.items():
+         tiers.setdefault(core, set()).add(user)
+      return tiers
+
+   def filter_candidates(self, candidates, min_core):
+      """
+      Keep only candidates whose core number is at least min_core.
+
+      Args:
+          candidates (set): Candidate users, e.g. from recommend_connections
+          min_core (int): Minimum core number
+
+      Returns:
+          set: Set of qualifying candidates
+      """
+      return {user for user in candidates if self._core.get(user, 0) >= min_core}
+
+   def add_edge(self, user_a, user_b):
+      """
+      Insert an undirected edge and update the affected core numbers.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+      """
+      if user_a == user_b:
+         raise ValueError("Cannot connect a user to themselves")
+      for user in (user_a, user_b):
+         if user not in self._adjacency:
+            self._adjacency[user] = set()
+            self._core[user] = 0
+      if user_b in self._adjacency[user_a]:
+         return
+      self._adjacency[user_a].add(user_b)
+      self._adjacency[user_b].add(user_a)
+
+      k = min(self._core[user_a], self._core[user_b])
+      subcore, support = self._subcore(user_a, user_b, k)
+      evicted = self._peel(subcore, support, lambda count: count <= k)
+      for user in subcore:
+         if user not in evicted:
+            self._core[user] = k + 1
+
+   def remove_edge(self, user_a, user_b):
+      """
+      Delete an undirected edge and update the affected core numbers.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+      """
+      if user_b not in self._adjacency.get(user_a, ()):
+         raise ValueError(f"Users {user_a} and {user_b} are not connected")
+      self._adjacency[user_a].discard(user_b)
+      self._adjacency[user_b].discard(user_a)
+
+      k = min(self._core[user_a], self._core[user_b])
+      subcore, support = self._subcore(user_a, user_b, k)
+      evicted = self._peel(subcore, support, lambda count: count < k)
+      for user in evicted:
+         self._core[user] = k - 1
+
+   def _subcore(self, user_a, user_b, k):
+      """Collect users with core k reachable from the endpoints and their support."""
+      core = self._core
+      subcore = {user for user in (user_a, user_b) if core[user] == k}
+      stack = list(subcore)
+      while stack:
+         user = stack.pop()
+         for friend in self._adjacency[user]:
+            if core[friend] == k and friend not in subcore:
+               subcore.add(friend)
+               stack.append(friend)
+      support = {user: sum(1 for friend in self._adjacency[user] if core[friend] >= k)
+                 for user in subcore}
+      return subcore, support
+
+   def _peel(self, subcore, support, should_evict):
+      """Repeatedly evict subcore users whose support is too low."""
+      evicted = set()
+      stack = [user for user in subcore if should_evict(support[user])]
+      while stack:
+         user = stack.pop()
+         if user in evicted:
+            continue
+         evicted.add(user)
+         for friend in self._adjacency[user]:
+            if friend in subcore and friend not in evicted:
+               support[friend] -= 1
+               if should_evict(support[friend]):
+                  stack.append(friend)
+      return evicted
@@ -0,0 +1,167 @@
+"""
+Lazy Analysis Functions
+Iterator-returning variants of the set-returning analysis functions that yield
+results one at a time and support limit/offset paging.
+"""
+
+from itertools import islice
+
+
+def _paginate(results, limit, offset):
+   """Apply offset and limit to an iterator of results."""
+   if offset < 0:
+      raise ValueError("Offset must be non-negative")
+   if limit is not None and limit < 0:
+      raise ValueError("Limit must be non-negative")
+   stop = None if limit is None else offset + limit
+   return islice(results, offset, stop)
+
+
+def _iter_levels(user, connections, depth):
+   """
+   Yield (level, user) pairs for every user reachable within depth.
+
+   A visited set deduplicates every level, so each candidate costs one set
+   lookup however many friends lead to it. The set holds every user yielded
+   so far and cannot be trimmed to the last levels, because a directed graph
+   may link back to any earlier level. The last level keeps no frontier.
+   """
+   direct = connections[user]
+   for friend in direct:
+      if friend != user:
+         yield 1, friend
+   if depth < 2:
+      return
+
+   visited = {user}
+   visited.update(direct)
+   frontier = list(direct)
+   for level in range(2, depth + 1):
+      last = level == depth
+      next_frontier = []
+      for member in frontier:
+         for candidate in connections.get(member, ()):
+            if candidate not in visited:
+               visited.add(candidate)
+               if not last:
+                  next_frontier.append(candidate)
+               yield level, candidate
+      frontier = next_frontier
+
+
+def iter_all_connections(user, connections, depth=1, limit=None, offset=0):
+   """
+   Lazily yield all connections up to a certain depth.
+
+   Args:
+       user (str): The user to find connections for
+       connections (dict): Dictionary of user connections
+       depth (int): Connection depth (1 = direct, 2 = friend of friend)
+       limit (int): Maximum number of results (None = no limit)
+       offset (int): Number of results to skip
+
+   Returns:
+       iterator: Users yielded nearest first, same elements as find_all_connections
+
+   Memory grows with the users reached so far, since depth 2 and deeper
+   keep a visited set; a limit stops the traversal early.
+   """
+   # Input validation
+   if user not in connections:
+      raise ValueError(f"User {user} not found in connections")
+   if depth < 1:
+      raise ValueError("Depth must be at least 1")
+
+   results = (member for _, member in _iter_levels(user, connections, depth))
+   return _paginate(results, limit, offset)
+
+
+def iter_recommendations(user, connections, depth=2, limit=None, offset=0):
+   """
+   Lazily yield recommended connections based on friends of friends.
+
+   Args:
+       user (str): User to make recommendations for
+       connections (dict): Dictionary of user connections
+       depth (int): Connection depth for recommendations
+       limit (int): Maximum number of results (None = no limit)
+       offset (int): Number of results to skip
+
+   Returns:
+       iterator: Users yielded nearest first, same elements as recommend_connections
+
+   Memory grows with the users reached so far, since depth 2 and deeper
+   keep a visited set; a limit stops the traversal early.
+   """
+   # Input validation
+   if user not in connections:
+      raise ValueError(f"User {user} not found in connections")
+   if depth < 1:
+      raise ValueError("Depth must be at least 1")
+
+   results = (member for level, member in _iter_levels(user, connections, depth) if level > 1)
+   return _paginate(results, limit, offset)
+
+
+def iter_users_in_any_group(group_a, group_b, limit=None, offset=0):
+   """
+   Lazily yield users belonging to either group.
+
+   Args:
+       group_a (set): First group
+       group_b (set): Second group
+       limit (int): Maximum number of results (None = no limit)
+       offset (int): Number of results to skip
+
+   Returns:
+       iterator: Users of group_a, then users only in group_b
+   """
+   # Input validation
+   if group_a is None or group_b is None:
+      raise ValueError("Group data cannot be None")
+
+   def generate():
+      yield from group_a
+      for member in group_b:
+         if member not in group_a:
+            yield member
+
+   return _paginate(generate(), limit, offset)
+
+
+def iter_bridge_users(communities, limit=None, offset=0):
+   """
+   Lazily yield users that connect multiple communities.
+
+   A user is yielded from the first community that contains them. Earlier
+   communities are probed instead of keeping a set of the users seen, so
+   no state grows with the number of users.
+
+   Args:
+       communities (dict): Dictionary of community sets
+       limit (int): Maximum number of results (None = no limit)
+       offset (int): Number of results to skip
+
+   Returns:
+       iterator: (user, set of community names) pairs, same items as identify_bridge_users
+   """
+   # Input validation
+   if communities is None:
+      raise ValueError("Communities data cannot be None")
+
+   def generate():
+      items = list(communities.items())
+      for index, (_, members) in enumerate(items):
+         earlier = [group for _, group in items[:index]]
+         later = items[index + 1:]
+         for member in members:
+            for group in earlier:
+               if member in group:
+                  break
+            else:
+               names = [name for name, group in later if member in group]
+               if names:
+                  names.append(items[index][0])
+                  yield member, set(names)
+
+   return _paginate(generate(), limit, offset)
@@ -0,0 +1,91 @@
+"""
+Multi-Source BFS
+This module expands many seed users at once with bit-parallel frontiers, so
+shared parts of the graph are traversed once per batch instead of per seed.
+"""
+
+from graph_core import as_compact_graph
+
+
+def _iter_bits(word):
+   """Yield the positions of the set bits of an integer."""
+   while word:
+      low = word & -word
+      yield low.bit_length() - 1
+      word ^= low
+
+
+def _expand_batch(graph, seed_ids, depth):
+   """Run one bit-parallel BFS and return the seen bitmask of every user."""
+   seen = [0] * graph.num_users
+   visit = {}
+   for bit, uid in enumerate(seed_ids):
+      seen[uid] |= 1 << bit
+      visit[uid] = visit.get(uid, 0) | (1 << bit)
+
+   offsets, targets = graph.offsets, graph.targets
+   for _ in range(depth):
+      next_visit = {}
+      for uid, bits in visit.items():
+         for vid in targets[offsets[uid]:offsets[uid + 1]]:
+            new = bits & ~seen[vid]
+            if new:
+               seen[vid] |= new
+               next_visit[vid] = next_visit.get(vid, 0) | new
+      if not next_visit:
+         break
+      visit = next_visit
+   return seen
+
+
+def batch_find_all_connections(seeds, connections, depth=1, counts_only=False, word_bits=64):
+   """
+   Find all connections up to a certain depth for many users in one traversal.
+
+   Seeds are processed in batches of word_bits. Every user keeps one bitmask
+   of the seeds that reached it, and a whole bitmask moves along each edge
+   in a single operation.
+
+   Args:
+       seeds (iterable): Users to find connections for
+       connections: Dictionary of user connections or a CompactGraph
+       depth (int): Connection depth (1 = direct, 2 = friend of friend)
+       counts_only (bool): Return the number of reached users instead of sets
+       word_bits (int): Number of seeds sharing one bitmask
+
+   Returns:
+       dict: Dictionary with seeds as keys and their find_all_connections
+           set (or its size) as values
+   """
+   # Input validation
+   if depth < 1:
+      raise ValueError("Depth must be at least 1")
+   if word_bits < 1:
+      raise ValueError("word_bits must be at least 1")
+   seeds = list(dict.fromkeys(seeds))
+   for seed in seeds:
+      if seed not in connections:
+         raise ValueError(f"User {seed} not found in connections")
+
+   graph = as_compact_graph(connections)
+   names = graph.interner.names
+   results = {}
+   for start in range(0, len(seeds), word_bits):
+      batch = seeds[start:start + word_bits]
+      seed_ids = [graph.interner.id_of(seed) for seed in batch]
+      seen = _expand_batch(graph, seed_ids, depth)
+
+      if counts_only:
+         counts = [-1] * len(batch)
+         for bits in seen:
+            for bit in _iter_bits(bits):
+               counts[bit] += 1
+         results.update(zip(batch, counts))
+      else:
+         reached = [set() for _ in batch]
+         for uid, bits in enumerate(seen):
+            for bit in _iter_bits(bits):
+               if seed_ids[bit] != uid:
+                  reached[bit].add(names[uid])
+         results.update(zip(batch, reached))
+   return results
@@ -0,0 +1,295 @@
+"""
+Out-of-Core Graph
+This module runs traversals, connected components and degree statistics on a
+graph snapshot file that is paged through a bounded buffer pool instead of
+being loaded into memory.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+
+from graph_core import SNAPSHOT_HEADER, UserInterner, read_snapshot_names, snapshot_layout
+
+DEFAULT_PAGE_SIZE = 64 * 1024
+DEFAULT_MAX_PAGES = 256
+_OFFSET_PAIR = struct.Struct("<2q")
+
+
+class BufferPool:
+   """
+   Fixed number of file pages cached in memory with LRU replacement.
+   """
+
+   def __init__(self, path, page_size=DEFAULT_PAGE_SIZE, max_pages=DEFAULT_MAX_PAGES):
+      if page_size < 8 or page_size % 8:
+         raise ValueError("Page size must be a positive multiple of 8")
+      if max_pages < 1:
+         raise ValueError("Buffer pool needs at least one page")
+      self.page_size = page_size
+      self.max_pages = max_pages
+      self.stats = {"hits": 0, "reads": 0, "bytes_read": 0}
+      self._file = open(path, "rb")
+      self._pages = OrderedDict()
+
+   def _page(self, number):
+      page = self._pages.get(number)
+      if page is not None:
+         self._pages.move_to_end(number)
+         self.stats["hits"] += 1
+         return page
+      if hasattr(os, "pread"):
+         page = os.pread(self._file.fileno(), self.page_size, number * self.page_size)
+      else:
+         self._file.seek(number * self.page_size)
+         page = self._file.read(self.page_size)
+      self.stats["reads"] += 1
+      self.stats["bytes_read"] += len(page)
+      self._pages[number] = page
+      if len(self._pages) > self.max_pages:
+         self._pages.popitem(last=False)
+      return page
+
+   def read(self, offset, size):
+      """
+      Read a byte range through the cache.
+
+      Args:
+          offset (int): File offset
+          size (int): Number of bytes
+
+      Returns:
+          bytes: The requested bytes
+      """
+      first, start = divmod(offset, self.page_size)
+      if start + size <= self.page_size:
+         data = self._page(first)[start:start + size]
+         if len(data) < size:
+            raise ValueError(f"File ends before byte {offset + size}")
+         return data
+      parts = []
+      number = first
+      remaining = size
+      while remaining > 0:
+         chunk = self._page(number)[start:start + remaining]
+         # A page past the end of the file reads as nothing
+         if not chunk:
+            raise ValueError(f"File ends before byte {offset + size}")
+         parts.append(chunk)
+         remaining -= len(chunk)
+         number += 1
+         start = 0
+      return b"".join(parts)
+
+   def close(self):
+      """Close the file and drop all cached pages."""
+      self._pages.clear()
+      self._file.close()
+
+
+class OutOfCoreGraph:
+   """
+   Read-only graph backed by a snapshot file written by save_snapshot.
+
+   The offsets and targets arrays are read page by page through a
+   BufferPool. Traversals sort every frontier by user ID, so rows are
+   fetched in file order and neighboring rows share pages. The user names
+   are not paged: they are decoded into an in-memory UserInterner when the
+   graph is opened, because the snapshot stores them as one length-prefixed
+   list without an index to look names up on disk.
+   """
+
+   def __init__(self, path, page_size=DEFAULT_PAGE_SIZE, max_pages=DEFAULT_MAX_PAGES):
+      self.pool = BufferPool(path, page_size, max_pages)
+      layout = snapshot_layout(self.pool.read(0, SNAPSHOT_HEADER.size))
+      self.num_users = layout["num_users"]
+      self.num_targets = layout["num_targets"]
+      self.undirected = layout["undirected"]
+      self._offsets_start = layout["offsets"]
+      self._targets_start = layout["targets"]
+      names = self.pool.read(layout["names"], layout["names_size"])
+      self.interner = UserInterner(read_snapshot_names(names, self.num_users))
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, exc_type, exc, traceback):
+      self.close()
+
+   def close(self):
+      """Close the snapshot file."""
+      self.pool.close()
+
+   @property
+   def io_stats(self):
+      """dict: Buffer pool hits, page reads and bytes read so far."""
+      return dict(self.pool.stats)
+
+   def _row_bounds(self, uid):
+      return _OFFSET_PAIR.unpack(self.pool.read(self._offsets_start + 8 * uid, _OFFSET_PAIR.size))
+
+   def _read_array(self, offset, count):
+      values = array("q")
+      values.frombytes(self.pool.read(offset, 8 * count))
+      if sys.byteorder == "big":
+         values.byteswap()
+      return values
+
+   def _read_ids(self, start, stop):
+      return self._read_array(self._targets_start + 8 * start, stop - start)
+
+   def neighbors(self, uid):
+      """
+      Read the sorted neighbor IDs of a user.
+
+      Args:
+          uid (int): User ID
+
+      Returns:
+          array: Sorted neighbor IDs
+      """
+      start, stop = self._row_bounds(uid)
+      return self._read_ids(start, stop)
+
+   def _scan_array(self, offset, count):
+      """Yield an on-disk int64 array in consecutive pieces that fit the pool."""
+      # Half the pool per piece lets the offsets and targets scans share it
+      pool = self.pool
+      piece = max(1, pool.page_size * pool.max_pages // 16)
+      for first in range(0, count, piece):
+         yield self._read_array(offset + 8 * first, min(piece, count - first))
+
+   def _scan_offsets(self):
+      """Yield the (start, stop) row bounds of every user in ID order."""
+      start = None
+      for piece in self._scan_array(self._offsets_start, self.num_users + 1):
+         for stop in piece:
+            if start is not None:
+               yield start, stop
+            start = stop
+
+   def _scan_rows(self):
+      """Yield (uid, neighbor IDs) for every user, reading both arrays sequentially."""
+      pieces = self._scan_array(self._targets_start, self.num_targets)
+      piece, pos = array("q"), 0
+      for uid, (start, stop) in enumerate(self._scan_offsets()):
+         degree = stop - start
+         row = piece[pos:pos + degree]
+         pos += len(row)
+         # Rows longer than the rest of the piece continue in the next ones
+         while len(row) < degree:
+            piece = next(pieces)
+            pos = min(len(piece), degree - len(row))
+            row.extend(piece[:pos])
+         yield uid, row
+
+   def __contains__(self, user):
+      return user in self.interner
+
+   def find_all_connections(self, user, depth=1):
+      """
+      Find all connections up to a certain depth.
+
+      Args:
+          user (str): The user to find connections for
+          depth (int): Connection depth (1 = direct, 2 = friend of friend)
+
+      Returns:
+          set: Set of all connections up to specified depth
+      """
+      if depth < 1:
+         raise ValueError("Depth must be at least 1")
+      source = self.interner.id_of(user)
+      visited = bytearray(self.num_users)
+      visited[source] = 1
+      frontier = [source]
+      reached = []
+      for _ in range(depth):
+         next_frontier = []
+         # ID order turns scattered row reads into a forward scan of the file
+         for uid in sorted(frontier):
+            for vid in self.neighbors(uid):
+               if not visited[vid]:
+                  visited[vid] = 1
+                  next_frontier.append(vid)
+         if not next_frontier:
+            break
+         reached.extend(next_frontier)
+         frontier = next_frontier
+      names = self.interner.names
+      return {names[vid] for vid in reached}
+
+   def component_labels(self):
+      """
+      Label connected components with union-find over one sequential scan.
+
+      Edges are treated as undirected.
+
+      Returns:
+          array: Smallest user ID of its component for every user ID
+      """
+      parent = array("q", range(self.num_users))
+
+      def find(uid):
+         root = uid
+         while parent[root] != root:
+            root = parent[root]
+         while parent[uid] != root:
+            parent[uid], uid = root, parent[uid]
+         return root
+
+      for uid, row in self._scan_rows():
+         for vid in row:
+            root_u, root_v = find(uid), find(vid)
+            if root_u != root_v:
+               if root_u < root_v:
+                  parent[root_v] = root_u
+               else:
+                  parent[root_u] = root_v
+      for uid in range(self.num_users):
+         parent[uid] = parent[parent[uid]]
+      return parent
+
+   def connected_components(self):
+      """
+      Find the connected components.
+
+      Returns:
+          list: Sets of user names, largest component first
+      """
+      components = {}
+      names = self.interner.names
+      for uid, root in enumerate(self.component_labels()):
+         components.setdefault(root, set()).add(names[uid])
+      return sorted(components.values(), key=len, reverse=True)
+
+   def degree_stats(self):
+      """
+      Compute out-degree statistics from one sequential scan of the offsets.
+
+      Returns:
+          dict: users, edges, min, max, mean and median degree
+      """
+      histogram = {}
+      for start, stop in self._scan_offsets():
+         degree = stop - start
+         histogram[degree] = histogram.get(degree, 0) + 1
+
+      if not histogram:
+         return {"users": 0, "edges": 0, "min": 0, "max": 0, "mean": 0.0, "median": 0}
+      median = None
+      seen = 0
+      for degree in sorted(histogram):
+         seen += histogram[degree]
+         if median is None and 2 * seen >= self.num_users:
+            median = degree
+      return {
+         "users": self.num_users,
+         "edges": self.num_targets,
+         "min": min(histogram),
+         "max": max(histogram),
+         "mean": self.num_targets / self.num_users,
+         "median": median,
+      }
@@ -0,0 +1,175 @@
+"""
+Group Overlap Matrix
+This module computes intersection, union and Jaccard sizes for every pair of
+groups in one sweep over an inverted membership index.
+"""
+
+import heapq
+from itertools import combinations
+
+OVERLAP_MEASURES = ("intersection", "union", "jaccard")
+
+
+class OverlapMatrix:
+   """
+   Pairwise overlap sizes of a collection of groups.
+
+   Only pairs that share at least one member are stored; every other pair
+   has an intersection of zero.
+   """
+
+   def __init__(self, names, sizes, intersections):
+      self.names = names
+      self.sizes = sizes
+      self.intersections = intersections
+      self._index = {name: i for i, name in enumerate(names)}
+
+   def _pair(self, group_a, group_b):
+      i, j = self._index[group_a], self._index[group_b]
+      return (i, j) if i < j else (j, i)
+
+   def intersection_size(self, group_a, group_b):
+      """
+      Get the number of users in both groups.
+
+      Args:
+          group_a (str): First group name
+          group_b (str): Second group name
+
+      Returns:
+          int: Intersection size
+      """
+      if group_a == group_b:
+         return self.sizes[self._index[group_a]]
+      return self.intersections.get(self._pair(group_a, group_b), 0)
+
+   def union_size(self, group_a, group_b):
+      """
+      Get the number of users in either group.
+
+      Args:
+          group_a (str): First group name
+          group_b (str): Second group name
+
+      Returns:
+          int: Union size
+      """
+      sizes = self.sizes[self._index[group_a]] + self.sizes[self._index[group_b]]
+      return sizes - self.intersection_size(group_a, group_b)
+
+   def jaccard(self, group_a, group_b):
+      """
+      Get the Jaccard similarity of two groups.
+
+      Args:
+          group_a (str): First group name
+          group_b (str): Second group name
+
+      Returns:
+          float: Intersection size divided by union size (0-1)
+      """
+      union = self.union_size(group_a, group_b)
+      return self.intersection_size(group_a, group_b) / union if union else 0.0
+
+   def value(self, group_a, group_b, measure="intersection"):
+      """
+      Get one overlap measure for a pair of groups.
+
+      Args:
+          group_a (str): First group name
+          group_b (str): Second group name
+          measure (str): "intersection", "union" or "jaccard"
+
+      Returns:
+          int or float: The requested measure
+      """
+      if measure == "intersection":
+         return self.intersection_size(group_a, group_b)
+      if measure == "union":
+         return self.union_size(group_a, group_b)
+      if measure == "jaccard":
+         return self.jaccard(group_a, group_b)
+      raise ValueError(f"Unknown overlap measure {measure!r}")
+
+   def dense(self, measure="intersection"):
+      """
+      Build the full group-by-group matrix of one measure.
+
+      Args:
+          measure (str): "intersection", "union" or "jaccard"
+
+      Returns:
+          list: Row-major list of lists ordered like self.names
+      """
+      return [[self.value(a, b, measure) for b in self.names] for a in self.names]
+
+   def overlapping_pairs(self):
+      """
+      Iterate over the pairs of groups that share members.
+
+      Returns:
+          iterator: (group_a, group_b, intersection, union, jaccard) tuples
+      """
+      for (i, j), shared in self.intersections.items():
+         union = self.sizes[i] + self.sizes[j] - shared
+         yield self.names[i], self.names[j], shared, union, shared / union
+
+
+def overlap_matrix(groups):
+   """
+   Compute the overlap of every pair of groups in one pass.
+
+   Each user contributes one count to every pair of groups it belongs to, so
+   the work is proportional to the sum of squared memberships per user
+   instead of the number of group pairs.
+
+   Args:
+       groups (dict): Dictionary of group sets
+
+   Returns:
+       OverlapMatrix: Pairwise overlap sizes
+   """
+   # Input validation
+   if groups is None:
+      raise ValueError("Group data cannot be None")
+
+   names = list(groups)
+   sizes = []
+   memberships = {}
+   for index, name in enumerate(names):
+      members = groups[name]
+      if members is None:
+         raise ValueError("Group data cannot be None")
+      sizes.append(len(members))
+      for user in members:
+         memberships.setdefault(user, []).append(index)
+
+   intersections = {}
+   for indexes in memberships.values():
+      for pair in combinations(indexes, 2):
+         intersections[pair] = intersections.get(pair, 0) + 1
+   return OverlapMatrix(names, sizes, intersections)
+
+
+def top_k_overlaps(groups, k, measure="intersection", matrix=None):
+   """
+   Find the k most overlapping pairs of groups.
+
+   Args:
+       groups (dict): Dictionary of group sets
+       k (int): Number of pairs to return
+       measure (str): "intersection" or "jaccard"
+       matrix (OverlapMatrix): Precomputed matrix for the same groups
+
+   Returns:
+       list: (group_a, group_b, value) tuples, most overlapping first
+   """
+   if k < 0:
+      raise ValueError("k must be non-negative")
+   if measure not in ("intersection", "jaccard"):
+      raise ValueError(f"Unknown overlap measure {measure!r}")
+   if matrix is None:
+      matrix = overlap_matrix(groups)
+   position = 2 if measure == "intersection" else 4
+   best = heapq.nlargest(k, matrix.overlapping_pairs(), key=lambda row: row[position])
+   return [(row[0], row[1], row[position]) for row in best]
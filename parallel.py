@@ -0,0 +1,239 @@
+"""
+Parallel Set Operations
+This module provides a configurable executor backend that splits large set
+operations into chunks, runs them on a thread or process pool and merges the
+partial results. Small inputs always run serially. The pools are imported
+only when a parallel backend is first used.
+
+The thread backend shares one pool between calls. The process backend
+starts a pool per call whose workers receive the large shared operands once
+through the pool initializer, so each task only carries its own chunk.
+"""
+
+import os
+import sys
+# _thread is built in; threading itself is too slow to import at startup
+from _thread import allocate_lock
+
+BACKENDS = ("serial", "thread", "process")
+
+_config = {"backend": "serial", "max_workers": None, "min_parallel_size": 100_000}
+_pool = None
+_pool_lock = allocate_lock()
+_WORKER_SHARED = ()
+
+
+def configure(backend="serial", max_workers=None, min_parallel_size=100_000):
+   """
+   Select the executor backend used for large set operations.
+
+   Args:
+       backend (str): "serial", "thread" or "process"
+       max_workers (int): Pool size (None = one per CPU)
+       min_parallel_size (int): Smallest total input size run in parallel
+   """
+   if backend not in BACKENDS:
+      raise ValueError(f"Unknown executor backend {backend!r}")
+   if min_parallel_size < 1:
+      raise ValueError("min_parallel_size must be at least 1")
+   shutdown()
+   _config.update(backend=backend, max_workers=max_workers, min_parallel_size=min_parallel_size)
+
+
+def get_config():
+   """
+   Get the current executor configuration.
+
+   Returns:
+       dict: Copy of the backend, max_workers and min_parallel_size settings
+   """
+   return dict(_config)
+
+
+def shutdown():
+   """Shut down the shared thread pool, if one was started."""
+   global _pool
+   with _pool_lock:
+      pool, _pool = _pool, None
+   if pool is not None:
+      pool.shutdown()
+
+
+def gil_enabled():
+   """
+   Check whether the interpreter runs with the GIL.
+
+   Returns:
+       bool: False only on a free-threaded build with the GIL disabled
+   """
+   check = getattr(sys, "_is_gil_enabled", None)
+   return True if check is None else check()
+
+
+def should_parallelize(*sizes):
+   """
+   Decide whether inputs of the given sizes go to the parallel backend.
+
+   Args:
+       *sizes (int): Sizes of the operation's inputs
+
+   Returns:
+       bool: True if a parallel backend is configured and the inputs are large
+   """
+   return _config["backend"] != "serial" and sum(sizes) >= _config["min_parallel_size"]
+
+
+def _get_pool():
+   """Get the shared thread pool, starting it on first use."""
+   global _pool
+   with _pool_lock:
+      if _pool is None:
+         from concurrent.futures import ThreadPoolExecutor
+         _pool = ThreadPoolExecutor(max_workers=_config["max_workers"])
+      return _pool
+
+
+def _init_worker(*shared):
+   global _WORKER_SHARED
+   _WORKER_SHARED = shared
+
+
+def _call_in_worker(function, chunk):
+   return function(chunk, *_WORKER_SHARED)
+
+
+def _chunks(items, count):
+   """Split a sized iterable into `count` lists of nearly equal length."""
+   items = list(items)
+   size = max(1, -(-len(items) // count))
+   return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _run(function, chunks, *shared):
+   """Run function(chunk, *shared) for every chunk on the configured backend."""
+   if _config["backend"] == "serial" or len(chunks) < 2:
+      return [function(chunk, *shared) for chunk in chunks]
+   if _config["backend"] == "thread":
+      return list(_get_pool().map(lambda chunk: function(chunk, *shared), chunks))
+   from concurrent.futures import ProcessPoolExecutor
+   with ProcessPoolExecutor(max_workers=min(_worker_count(), len(chunks)),
+                            initializer=_init_worker, initargs=shared) as pool:
+      return list(pool.map(_call_in_worker, [function] * len(chunks), chunks))
+
+
+def _worker_count():
+   return _config["max_workers"] or os.cpu_count() or 1
+
+
+def _intersect_chunk(chunk, other):
+   return set(chunk).intersection(other)
+
+
+def _difference_chunk(chunk, other):
+   return set(chunk).difference(other)
+
+
+def _count_internal_pairs(chunk, users, connections):
+   """Count each connected pair once: from its smaller user, or from its only source.
+
+   Self-connections never pass either test.
+   """
+   count = 0
+   for user in chunk:
+      for friend in users.intersection(connections.get(user, ())):
+         if friend > user or user not in connections.get(friend, ()):
+            count += 1
+   return count
+
+
+def _mutual_chunk(pairs, connections):
+   return [connections[user_a] & connections[user_b] for user_a, user_b in pairs]
+
+
+def parallel_intersection(group_a, group_b):
+   """
+   Find users belonging to both groups using the configured backend.
+
+   Args:
+       group_a (set): First group
+       group_b (set): Second group
+
+   Returns:
+       set: Set of users in both groups
+   """
+   smaller, larger = (group_a, group_b) if len(group_a) <= len(group_b) else (group_b, group_a)
+   if not should_parallelize(len(smaller), len(larger)):
+      return smaller & larger
+   result = set()
+   for part in _run(_intersect_chunk, _chunks(smaller, _worker_count()), larger):
+      result.update(part)
+   return result
+
+
+def parallel_union(group_a, group_b):
+   """
+   Find users belonging to either group using the configured backend.
+
+   Args:
+       group_a (set): First group
+       group_b (set): Second group
+
+   Returns:
+       set: Set of users in either group
+   """
+   larger, smaller = (group_a, group_b) if len(group_a) >= len(group_b) else (group_b, group_a)
+   if not should_parallelize(len(smaller), len(larger)):
+      return larger | smaller
+   result = set(larger)
+   for part in _run(_difference_chunk, _chunks(smaller, _worker_count()), larger):
+      result.update(part)
+   return result
+
+
+def parallel_network_density(users, connections):
+   """
+   Calculate network density using the configured backend.
+
+   Like calculate_network_density, every pair of users connected in either
+   direction counts once out of n * (n - 1) / 2 possible pairs.
+
+   Args:
+       users (set): Set of users
+       connections (dict): Dictionary of user connections
+
+   Returns:
+       float: Network density (0-1)
+   """
+   n = len(users)
+   if n < 2:
+      return 0.0
+   users = set(users)
+   if should_parallelize(n):
+      actual = sum(_run(_count_internal_pairs, _chunks(users, _worker_count()), users, connections))
+   else:
+      actual = _count_internal_pairs(users, users, connections)
+   return actual / (n * (n - 1) / 2)
+
+
+def batch_mutual_connections(pairs, connections):
+   """
+   Find the mutual connections of many user pairs.
+
+   Args:
+       pairs (list): (user_a, user_b) tuples
+       connections (dict): Dictionary of user connections
+
+   Returns:
+       list: Set of mutual connections for every pair, in input order
+   """
+   pairs = list(pairs)
+   for user_a, user_b in pairs:
+      for user in (user_a, user_b):
+         if user not in connections:
+            raise ValueError(f"User {user} not found in connections")
+   if not should_parallelize(len(pairs)):
+      return _mutual_chunk(pairs, connections)
+   results = []
+   for part in _run(_mutual_chunk, _chunks(pairs, _worker_count()), connections):
+      results.extend(part)
+   return results
@@ -0,0 +1,189 @@
+"""
+Personalized PageRank Recommendations
+This module ranks recommendation candidates by personalized PageRank, either
+with Monte Carlo random walks with restart or with forward push, so every
+query does a bounded amount of work.
+"""
+
+import random
+from collections import deque
+
+DEFAULT_ALPHA = 0.15
+DEFAULT_EPSILON = 1e-4
+DEFAULT_NUM_WALKS = 2_000
+MAX_WALK_LENGTH = 50
+
+
+def _neighbor_list(user, connections, cache):
+   """Get an indexable neighbor tuple, converting each set only once."""
+   neighbors = cache.get(user)
+   if neighbors is None:
+      neighbors = tuple(connections.get(user, ()))
+      cache[user] = neighbors
+   return neighbors
+
+
+def random_walk_scores(user, connections, num_walks=DEFAULT_NUM_WALKS, alpha=DEFAULT_ALPHA,
+                       max_length=MAX_WALK_LENGTH, seed=None, cache=None):
+   """
+   Estimate personalized PageRank with random walks with restart.
+
+   Every walk starts at the user and stops with probability alpha after each
+   step, at a user without connections, or after max_length steps. The score
+   of a user is the share of walks that stopped there. Work is bounded by
+   num_walks * max_length steps.
+
+   Args:
+       user (str): Source user
+       connections (dict): Dictionary of user connections
+       num_walks (int): Number of walks (more = more accurate, slower)
+       alpha (float): Restart probability per step
+       max_length (int): Maximum steps per walk
+       seed: Random seed for repeatable scores
+       cache (dict): Shared neighbor tuple cache for batched queries
+
+   Returns:
+       dict: Estimated PageRank score per reached user
+   """
+   if user not in connections:
+      raise ValueError(f"User {user} not found in connections")
+   if num_walks < 1:
+      raise ValueError("Number of walks must be at least 1")
+   if not 0 < alpha < 1:
+      raise ValueError("Alpha must be between 0 and 1")
+
+   cache = {} if cache is None else cache
+   rng = random.Random(seed)
+   counts = {}
+   for _ in range(num_walks):
+      current = user
+      for _ in range(max_length):
+         if rng.random() < alpha:
+            break
+         neighbors = _neighbor_list(current, connections, cache)
+         if not neighbors:
+            break
+         current = neighbors[rng.randrange(len(neighbors))]
+      counts[current] = counts.get(current, 0) + 1
+   return {member: count / num_walks for member, count in counts.items()}
+
+
+def forward_push_scores(user, connections, alpha=DEFAULT_ALPHA, epsilon=DEFAULT_EPSILON, max_pushes=None):
+   """
+   Approximate personalized PageRank with the forward push algorithm.
+
+   Residual mass starts at the user and is pushed to neighbors while some
+   user holds at least epsilon times its degree. The total work is
+   O(1 / (alpha * epsilon)) and can be capped further with max_pushes.
+
+   Args:
+       user (str): Source user
+       connections (dict): Dictionary of user connections
+       alpha (float): Restart probability per step
+       epsilon (float): Residual threshold (smaller = more accurate, slower)
+       max_pushes (int): Maximum number of push operations (None = no cap)
+
+   Returns:
+       dict: Approximate PageRank score per reached user
+   """
+   if user not in connections:
+      raise ValueError(f"User {user} not found in connections")
+   if not 0 < alpha < 1:
+      raise ValueError("Alpha must be between 0 and 1")
+   if epsilon <= 0:
+      raise ValueError("Epsilon must be positive")
+
+   scores = {}
+   residual = {user: 1.0}
+   queue = deque([user])
+   queued = {user}
+   pushes = 0
+   while queue and (max_pushes is None or pushes < max_pushes):
+      current = queue.popleft()
+      queued.discard(current)
+      mass = residual.pop(current, 0.0)
+      neighbors = connections.get(current, ())
+      if not neighbors:
+         # Walks stop at users without connections
+         scores[current] = scores.get(current, 0.0) + mass
+         continue
+      pushes += 1
+      scores[current] = scores.get(current, 0.0) + alpha * mass
+      share = (1 - alpha) * mass / len(neighbors)
+      for neighbor in neighbors:
+         value = residual.get(neighbor, 0.0) + share
+         residual[neighbor] = value
+         degree = len(connections.get(neighbor, ())) or 1
+         if neighbor not in queued and value >= epsilon * degree:
+            queued.add(neighbor)
+            queue.append(neighbor)
+   return scores
+
+
+SCORERS = {
+   "walk": random_walk_scores,
+   "push": forward_push_scores,
+}
+
+
+def ppr_recommendations(user, connections, k=10, method="push", seed=None, **options):
+   """
+   Recommend the k non-friends with the highest personalized PageRank.
+
+   Args:
+       user (str): User to make recommendations for
+       connections (dict): Dictionary of user connections
+       k (int): Number of recommendations
+       method (str): "push" (forward push) or "walk" (random walks)
+       seed: Random seed for the walks; forward push is deterministic and ignores it
+       **options: Accuracy options for the scorer (epsilon, num_walks, ...)
+
+   Returns:
+       list: (user, score) tuples, best first
+   """
+   if method not in SCORERS:
+      raise ValueError(f"Unknown PageRank method: {method}")
+   if k < 0:
+      raise ValueError("k must be non-negative")
+   if method == "walk":
+      options["seed"] = seed
+   scores = SCORERS[method](user, connections, **options)
+   direct = connections[user]
+   candidates = [(member, score) for member, score in scores.items() if member != user and member not in direct]
+   candidates.sort(key=lambda item: (-item[1], item[0]))
+   return candidates[:k]
+
+
+def batch_ppr_recommendations(users, connections, k=10, method="push", seed=None, **options):
+   """
+   Recommend connections for many users at once.
+
+   Random walks in a batch share one neighbor tuple cache, so each
+   connection set is converted once per batch instead of once per query.
+
+   Args:
+       users (list): Users to make recommendations for
+       connections (dict): Dictionary of user connections
+       k (int): Number of recommendations per user
+       method (str): "push" or "walk"
+       seed: Base random seed; each user's walks are seeded from it
+       **options: Accuracy options for the scorer
+
+   Returns:
+       dict: List of (user, score) tuples per user
+   """
+   users = list(users)
+   for user in users:
+      if user not in connections:
+         raise ValueError(f"User {user} not found in connections")
+   if method not in SCORERS:
+      raise ValueError(f"Unknown PageRank method: {method}")
+
+   results = {}
+   cache = {}
+   for user in users:
+      if method == "walk":
+         options["cache"] = cache
+      user_seed = None if seed is None else f"{seed}:{user}"
+      results[user] = ppr_recommendations(user, connections, k, method, user_seed, **options)
+   return results
@@ -0,0 +1,90 @@
+"""
+Constrained Recommendation Queries
+This module answers recommend_connections-style queries with candidate
+predicates pushed down into the friend-of-friend traversal.
+"""
+
+from collections import namedtuple
+
+RecommendationResult = namedtuple("RecommendationResult", ["users", "mutual_counts", "stats"])
+
+
+def query_recommendations(user, connections, depth=2, within=None, exclude=None,
+                          min_mutual=0, predicate=None):
+   """
+   Recommend new connections that satisfy candidate constraints.
+
+   Constraints are checked the first time a user is reached, so rejected
+   users are never counted or collected. Users in exclude are also never
+   traversed. A min_mutual above zero caps the traversal at depth 2, because
+   users further away share no friends with the user.
+
+   Args:
+       user (str): User to make recommendations for
+       connections (dict): Dictionary of user connections
+       depth (int): Connection depth for recommendations
+       within (set): Candidates must belong to this set (e.g. a group)
+       exclude (set): Users that must never be recommended or traversed
+       min_mutual (int): Minimum number of mutual friends
+       predicate (callable): Extra candidate check taking a user name
+
+   Returns:
+       RecommendationResult: (users set, mutual friend count per user, stats dict)
+   """
+   # Input validation
+   if user not in connections:
+      raise ValueError(f"User {user} not found in connections")
+   if depth < 1:
+      raise ValueError("Depth must be at least 1")
+   if min_mutual < 0:
+      raise ValueError("Minimum mutual friends must be non-negative")
+
+   exclude = exclude or set()
+   max_depth = min(depth, 2) if min_mutual > 0 else depth
+   stats = {
+      "max_depth": max_depth,
+      "expanded": 0,
+      "evaluated": 0,
+      "pruned_excluded": 0,
+      "pruned_within": 0,
+      "pruned_predicate": 0,
+      "pruned_min_mutual": 0,
+   }
+
+   direct = connections[user]
+   visited = {user}
+   visited.update(direct)
+   mutual = {}
+   frontier = [friend for friend in direct if friend not in exclude]
+
+   for level in range(2, max_depth + 1):
+      last_level = level == max_depth
+      next_frontier = []
+      for member in frontier:
+         stats["expanded"] += 1
+         for candidate in connections.get(member, ()):
+            if candidate in visited:
+               if level == 2 and candidate in mutual:
+                  mutual[candidate] += 1
+               continue
+            visited.add(candidate)
+            if candidate in exclude:
+               stats["pruned_excluded"] += 1
+               continue
+            if not last_level:
+               next_frontier.append(candidate)
+
+            stats["evaluated"] += 1
+            if within is not None and candidate not in within:
+               stats["pruned_within"] += 1
+            elif predicate is not None and not predicate(candidate):
+               stats["pruned_predicate"] += 1
+            else:
+               mutual[candidate] = 1 if level == 2 else 0
+      frontier = next_frontier
+
+   if min_mutual > 0:
+      qualified = {candidate: count for candidate, count in mutual.items() if count >= min_mutual}
+      stats["pruned_min_mutual"] = len(mutual) - len(qualified)
+      mutual = qualified
+   return RecommendationResult(set(mutual), mutual, stats)
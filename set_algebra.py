@@ -0,0 +1,329 @@
+"""
+Group Set Algebra
+This module builds set-algebra expressions over named groups, plans them
+(smallest-first intersections, differences pushed down into filters) and
+evaluates the plan by filtering the smallest inputs or over bitmaps.
+"""
+
+from collections import namedtuple
+
+SCAN = "scan"
+INTERSECT = "intersect"
+UNION = "union"
+EVALUATION_METHODS = ("auto", "probe", "bitmap")
+# Decoding a bitmap costs one Python step per result user, so auto only picks
+# bitmaps for results estimated below this fraction of the universe
+BITMAP_MAX_FRACTION = 0.01
+
+PlanNode = namedtuple("PlanNode", ["op", "group", "children", "excludes", "estimate"])
+
+
+class Expr:
+   """
+   Set-algebra expression over named groups.
+
+   Combine expressions with & (intersection), | (union) and - (difference):
+   (Group("tech") & Group("gaming")) | (Group("arts") - Group("network_b")).
+   """
+
+   def __and__(self, other):
+      return Intersect(self, other)
+
+   def __or__(self, other):
+      return Union(self, other)
+
+   def __sub__(self, other):
+      return Difference(self, other)
+
+
+class Group(Expr):
+   """A named group set."""
+
+   def __init__(self, name):
+      self.name = name
+
+   def __repr__(self):
+      return self.name
+
+
+class Intersect(Expr):
+   """Users in every operand."""
+
+   def __init__(self, *operands):
+      if len(operands) < 2:
+         raise ValueError("Intersection needs at least two operands")
+      self.operands = operands
+
+   def __repr__(self):
+      return "(" + " & ".join(map(repr, self.operands)) + ")"
+
+
+class Union(Expr):
+   """Users in any operand."""
+
+   def __init__(self, *operands):
+      if len(operands) < 2:
+         raise ValueError("Union needs at least two operands")
+      self.operands = operands
+
+   def __repr__(self):
+      return "(" + " | ".join(map(repr, self.operands)) + ")"
+
+
+class Difference(Expr):
+   """Users in left but not in right."""
+
+   def __init__(self, left, right):
+      self.left = left
+      self.right = right
+
+   def __repr__(self):
+      return f"({self.left!r} - {self.right!r})"
+
+
+class QueryPlanner:
+   """
+   Plans and evaluates group expressions against one set of groups.
+
+   Plans are trees of three operators:
+   - scan: read one group set
+   - intersect: users of the first child that are in every other child and
+     in none of the excludes; differences become excludes, so A - B is an
+     intersect with one child and one exclude
+   - union: users of any child
+
+   Cardinalities are estimated from the group sizes assuming independent
+   membership over the universe of all users in the groups. The universe
+   and bitmaps are computed once, so create a new planner after changing
+   the groups.
+   """
+
+   def __init__(self, groups):
+      if groups is None:
+         raise ValueError("Group data cannot be None")
+      self.groups = groups
+      self._universe = None
+      self._bitmaps = None
+      self._positions = None
+
+   @property
+   def universe_size(self):
+      """int: Number of distinct users over all groups."""
+      if self._universe is None:
+         self._universe = len(set().union(*self.groups.values()))
+      return self._universe
+
+   def _fraction(self, node):
+      return node.estimate / self.universe_size if self.universe_size else 0.0
+
+   def _scan(self, name):
+      if name not in self.groups:
+         raise ValueError(f"Group {name} not found")
+      return PlanNode(SCAN, name, (), (), len(self.groups[name]))
+
+   def _intersect(self, children, excludes):
+      # Smallest input drives the scan; the largest excludes reject the most users
+      children = tuple(sorted(children, key=lambda node: node.estimate))
+      excludes = tuple(sorted(excludes, key=lambda node: -node.estimate))
+      estimate = self.universe_size
+      for child in children:
+         estimate *= self._fraction(child)
+      for exclude in excludes:
+         estimate *= 1 - self._fraction(exclude)
+      return PlanNode(INTERSECT, None, children, excludes, min(round(estimate), children[0].estimate))
+
+   def _union(self, children):
+      children = tuple(sorted(children, key=lambda node: -node.estimate))
+      missing = 1.0
+      for child in children:
+         missing *= 1 - self._fraction(child)
+      estimate = round(self.universe_size * (1 - missing))
+      estimate = min(max(estimate, children[0].estimate), sum(child.estimate for child in children))
+      return PlanNode(UNION, None, children, (), estimate)
+
+   def plan(self, expr):
+      """
+      Build the evaluation plan for an expression.
+
+      Args:
+          expr (Expr): Expression to plan
+
+      Returns:
+          PlanNode: Root of the plan
+      """
+      if isinstance(expr, Group):
+         return self._scan(expr.name)
+      if isinstance(expr, Intersect):
+         children, excludes = [], []
+         for operand in expr.operands:
+            node = self.plan(operand)
+            if node.op == INTERSECT:
+               children.extend(node.children)
+               excludes.extend(node.excludes)
+            else:
+               children.append(node)
+         return self._intersect(children, excludes)
+      if isinstance(expr, Union):
+         children = []
+         for operand in expr.operands:
+            node = self.plan(operand)
+            children.extend(node.children if node.op == UNION else (node,))
+         return self._union(children)
+      if isinstance(expr, Difference):
+         left = self.plan(expr.left)
+         right = self.plan(expr.right)
+         # A - (B | C) = A - B - C
+         excludes = right.children if right.op == UNION else (right,)
+         return self._push_down(left, excludes)
+      raise ValueError(f"Unknown expression: {expr!r}")
+
+   def _push_down(self, node, excludes):
+      """Apply excludes as filters as close to the scans as possible."""
+      if node.op == UNION:
+         # (A | B) - C = (A - C) | (B - C)
+         return self._union([self._push_down(child, excludes) for child in node.children])
+      if node.op == INTERSECT:
+         return self._intersect(node.children, node.excludes + tuple(excludes))
+      return self._intersect([node], excludes)
+
+   def explain(self, expr):
+      """
+      Describe the plan chosen for an expression.
+
+      Args:
+          expr (Expr): Expression to plan
+
+      Returns:
+          str: The evaluation method auto would pick, then one line per
+              plan operator with its estimated cardinality
+      """
+      node = self.plan(expr)
+      lines = [f"Query: {expr!r}  (universe {self.universe_size} users, {self._auto_method(node)})"]
+
+      def describe(node, role, indent):
+         pad = "  " * indent
+         if node.op == SCAN:
+            lines.append(f"{pad}{role}Scan {node.group}  rows={node.estimate}")
+            return
+         lines.append(f"{pad}{role}{node.op.capitalize()}  est={node.estimate}")
+         for position, child in enumerate(node.children):
+            role = "" if node.op == UNION else ("Drive " if position == 0 else "Probe ")
+            describe(child, role, indent + 1)
+         for exclude in node.excludes:
+            describe(exclude, "AntiProbe ", indent + 1)
+
+      describe(node, "", 0)
+      return "\n".join(lines)
+
+   def evaluate(self, expr, method="auto"):
+      """
+      Evaluate an expression following its plan.
+
+      Args:
+          expr (Expr): Expression to evaluate
+          method (str): "probe" starts every intersect from its smallest
+              input and filters it by the other inputs, "bitmap" combines
+              per-group bitmaps, "auto" uses bitmaps once they are built
+              and the estimated result is small
+
+      Returns:
+          set: Users matching the expression
+      """
+      if method not in EVALUATION_METHODS:
+         raise ValueError(f"Unknown evaluation method: {method}")
+      node = self.plan(expr)
+      if method == "auto":
+         method = self._auto_method(node)
+      if method == "bitmap":
+         return self._decode(self._bits(node))
+      users = self._probe(node)
+      return set(users) if node.op == SCAN else users
+
+   def _auto_method(self, node):
+      small = node.estimate <= BITMAP_MAX_FRACTION * self.universe_size
+      return "bitmap" if self._bitmaps is not None and small else "probe"
+
+   def _probe(self, node):
+      """Evaluate a plan node; the result of a scan is the group set itself."""
+      if node.op == SCAN:
+         return self.groups[node.group]
+      if node.op == UNION:
+         users = set()
+         for child in node.children:
+            users |= self._probe(child)
+         return users
+      # The working set starts at the smallest input and only ever shrinks
+      users = self._probe(node.children[0])
+      for child in node.children[1:]:
+         if child.op == SCAN:
+            users = users & self.groups[child.group]
+         else:
+            users = {user for user in users if self._contains(child, user)}
+      for exclude in node.excludes:
+         if exclude.op == SCAN:
+            users = users - self.groups[exclude.group]
+         else:
+            users = {user for user in users if not self._contains(exclude, user)}
+      return users
+
+   def _contains(self, node, user):
+      if node.op == SCAN:
+         return user in self.groups[node.group]
+      if node.op == UNION:
+         return any(self._contains(child, user) for child in node.children)
+      return (all(self._contains(child, user) for child in node.children)
+              and not any(self._contains(exclude, user) for exclude in node.excludes))
+
+   def build_bitmaps(self):
+      """
+      Encode every group as an integer bitmap over the universe of users.
+
+      Returns:
+          dict: Group name to bitmap
+      """
+      if self._bitmaps is None:
+         positions = {}
+         for members in self.groups.values():
+            for user in members:
+               positions.setdefault(user, len(positions))
+         self._universe = len(positions)
+         self._positions = list(positions)
+         self._bitmaps = {}
+         for name, members in self.groups.items():
+            bits = bytearray((len(positions) + 7) // 8)
+            for user in members:
+               position = positions[user]
+               bits[position >> 3] |= 1 << (position & 7)
+            self._bitmaps[name] = int.from_bytes(bits, "little")
+      return self._bitmaps
+
+   def _bits(self, node):
+      bitmaps = self.build_bitmaps()
+      if node.op == SCAN:
+         return bitmaps[node.group]
+      if node.op == UNION:
+         bits = 0
+         for child in node.children:
+            bits |= self._bits(child)
+         return bits
+      bits = self._bits(node.children[0])
+      for child in node.children[1:]:
+         if not bits:
+            return 0
+         bits &= self._bits(child)
+      for exclude in node.excludes:
+         if not bits:
+            return 0
+         bits &= ~self._bits(exclude)
+      return bits
+
+   def _decode(self, bits):
+      # bin() finds the set bits in C; only the matches are visited in Python
+      digits = bin(bits)
+      last = len(digits) - 1
+      users = set()
+      pos = digits.find("1", 2)
+      while pos != -1:
+         users.add(self._positions[last - pos])
+         pos = digits.find("1", pos + 1)
+      return users
@@ -0,0 +1,398 @@
+"""
+Sharded Graph
+This module partitions users across local shard processes and routes
+connection queries between them with batched frontier exchange.
+"""
+
+import zlib
+from collections import deque
+
+PARTITIONERS = ("hash", "ldg")
+LOAD_BATCH = 4096
+
+
+def _all_users(connections):
+   """Collect every user that appears as a key or as a neighbor."""
+   users = set(connections)
+   for friends in connections.values():
+      users.update(friends)
+   return users
+
+
+def hash_shard(user, num_shards):
+   """
+   Get the shard of a user under hash partitioning.
+
+   Args:
+       user (str): User
+       num_shards (int): Number of shards
+
+   Returns:
+       int: Shard number
+   """
+   return zlib.crc32(user.encode("utf-8")) % num_shards
+
+
+def hash_partition(connections, num_shards):
+   """
+   Assign users to shards by a stable hash of their name.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       num_shards (int): Number of shards
+
+   Returns:
+       dict: Dictionary with users as keys and shard numbers as values
+   """
+   return {user: hash_shard(user, num_shards) for user in _all_users(connections)}
+
+
+def ldg_partition(connections, num_shards, slack=1.1):
+   """
+   Assign users to shards with linear deterministic greedy streaming.
+
+   Users arrive in BFS order and join the shard holding most of their
+   already placed neighbours, weighted by the shard's remaining capacity.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       num_shards (int): Number of shards
+       slack (float): Allowed shard size relative to a perfect balance
+
+   Returns:
+       dict: Dictionary with users as keys and shard numbers as values
+   """
+   users = _all_users(connections)
+   neighbors = {user: set() for user in users}
+   for user, friends in connections.items():
+      for friend in friends:
+         neighbors[user].add(friend)
+         neighbors[friend].add(user)
+
+   capacity = max(1.0, slack * len(users) / num_shards)
+   sizes = [0] * num_shards
+   assignment = {}
+   for root in sorted(users):
+      if root in assignment:
+         continue
+      queue = deque([root])
+      queued = {root}
+      while queue:
+         user = queue.popleft()
+         placed = [0] * num_shards
+         for friend in neighbors[user]:
+            shard = assignment.get(friend)
+            if shard is not None:
+               placed[shard] += 1
+         best = max(range(num_shards),
+                    key=lambda s: (placed[s] * (1 - sizes[s] / capacity), -sizes[s]))
+         assignment[user] = best
+         sizes[best] += 1
+         for friend in sorted(neighbors[user]):
+            if friend not in assignment and friend not in queued:
+               queued.add(friend)
+               queue.append(friend)
+   return assignment
+
+
+def edge_cut(connections, assignment):
+   """
+   Count the edges whose endpoints live on different shards.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       assignment (dict): Dictionary of user to shard number
+
+   Returns:
+       tuple: (cut edges, total edges)
+   """
+   cut = total = 0
+   for user, friends in connections.items():
+      for friend in friends:
+         total += 1
+         if assignment[user] != assignment[friend]:
+            cut += 1
+   return cut, total
+
+
+def partition(connections, num_shards, strategy="hash"):
+   """
+   Assign users to shards with the named strategy.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       num_shards (int): Number of shards
+       strategy (str): "hash" or "ldg"
+
+   Returns:
+       dict: Dictionary with users as keys and shard numbers as values
+   """
+   if connections is None:
+      raise ValueError("Connections data cannot be None")
+   if num_shards < 1:
+      raise ValueError("Number of shards must be at least 1")
+   if strategy == "hash":
+      return hash_partition(connections, num_shards)
+   if strategy == "ldg":
+      return ldg_partition(connections, num_shards)
+   raise ValueError(f"Unknown partitioning strategy {strategy!r}")
+
+
+def _serve_shard(conn):
+   """
+   Load and answer requests for the users owned by one shard until told to stop.
+
+   Lookups of a user the shard does not hold answer None, so the caller
+   learns about unknown users from the reply itself.
+   """
+   adjacency = {}
+   while True:
+      op, payload = conn.recv()
+      if op == "stop":
+         conn.close()
+         return
+      if op == "load":
+         for user, friends in payload:
+            adjacency.setdefault(user, set()).update(friends)
+      elif op == "loaded":
+         conn.send(len(adjacency))
+      elif op == "edge":
+         user_a, user_b = payload
+         friends = adjacency.get(user_a)
+         conn.send(None if friends is None else user_b in friends)
+      elif op == "neighbors":
+         friends = adjacency.get(payload)
+         conn.send(None if friends is None else list(friends))
+      elif op == "intersect":
+         user, others = payload
+         friends = adjacency.get(user)
+         conn.send(None if friends is None else list(friends.intersection(others)))
+      elif op == "expand":
+         found = set()
+         for user in payload:
+            found.update(adjacency.get(user, ()))
+         conn.send(list(found))
+      else:
+         conn.send(ValueError(f"Unknown shard operation {op!r}"))
+
+
+class ShardedGraph:
+   """
+   Connections split across local shard processes.
+
+   Rows are routed to their shard while they are read, so the parent never
+   holds the connections or a user-to-shard table: it keeps only the
+   routing function (hash_shard by default). Queries go to the owning
+   shards, which also report whether the user exists, and multi-hop
+   traversals send one batch per shard per level. ``stats`` counts the
+   requests and user IDs crossing shards.
+
+   Args:
+       rows: Dictionary of user connections, or an iterable of
+           (user, set of friends) pairs; repeated users are merged
+       num_shards (int): Number of shards
+       router (callable): Shard number for a user name (default hash_shard)
+       start_method (str): multiprocessing start method (None = platform default)
+       load_batch (int): Rows sent to a shard per message while loading
+   """
+
+   def __init__(self, rows, num_shards=4, router=None, start_method=None, load_batch=LOAD_BATCH):
+      if rows is None:
+         raise ValueError("Connections data cannot be None")
+      if num_shards < 1:
+         raise ValueError("Number of shards must be at least 1")
+      self.num_shards = num_shards
+      self._router = router
+      self.stats = {"requests": 0, "ids_sent": 0, "ids_received": 0, "remote_ids": 0}
+
+      import multiprocessing
+      context = multiprocessing.get_context(start_method)
+      self._pipes = []
+      self._processes = []
+      for _ in range(num_shards):
+         parent, child = context.Pipe()
+         process = context.Process(target=_serve_shard, args=(child,), daemon=True)
+         process.start()
+         child.close()
+         self._pipes.append(parent)
+         self._processes.append(process)
+      try:
+         self.shard_sizes = self._load(rows.items() if hasattr(rows, "items") else rows, load_batch)
+      except BaseException:
+         self.close()
+         raise
+
+   def _load(self, rows, load_batch):
+      """Send rows to their shards in batches and wait until every shard has them."""
+      batches = [[] for _ in range(self.num_shards)]
+      for user, friends in rows:
+         shard = self.owner(user)
+         batch = batches[shard]
+         batch.append((user, list(friends)))
+         if len(batch) >= load_batch:
+            self._pipes[shard].send(("load", batch))
+            batches[shard] = []
+      for shard, batch in enumerate(batches):
+         if batch:
+            self._pipes[shard].send(("load", batch))
+         self._pipes[shard].send(("loaded", None))
+      return [self._pipes[shard].recv() for shard in range(self.num_shards)]
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc_info):
+      self.close()
+
+   def close(self):
+      """Stop all shard processes."""
+      for pipe, process in zip(self._pipes, self._processes):
+         if process.is_alive():
+            pipe.send(("stop", None))
+            process.join()
+         pipe.close()
+      self._pipes = []
+      self._processes = []
+
+   def owner(self, user):
+      """
+      Get the shard that owns a user.
+
+      Args:
+          user (str): User
+
+      Returns:
+          int: Shard number the user is routed to
+      """
+      if self._router is None:
+         return hash_shard(user, self.num_shards)
+      return self._router(user)
+
+   def _request(self, shard, op, payload, ids_sent=0):
+      self.stats["requests"] += 1
+      self.stats["ids_sent"] += ids_sent
+      self._pipes[shard].send((op, payload))
+      return self._receive(shard)
+
+   def _receive(self, shard):
+      result = self._pipes[shard].recv()
+      if isinstance(result, Exception):
+         raise result
+      if isinstance(result, list):
+         self.stats["ids_received"] += len(result)
+      return result
+
+   def _require(self, user, result):
+      if result is None:
+         raise ValueError(f"User {user} not found in connections")
+      return result
+
+   def reset_stats(self):
+      """Reset the traffic counters."""
+      for key in self.stats:
+         self.stats[key] = 0
+
+   def is_direct_connection(self, user_a, user_b):
+      """
+      Check if two users are directly connected.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if directly connected, False otherwise
+      """
+      return self._require(user_a, self._request(self.owner(user_a), "edge", (user_a, user_b), 2))
+
+   def find_mutual_connections(self, user_a, user_b):
+      """
+      Find mutual connections between two users.
+
+      The neighbour list of user_b is shipped to the owner of user_a, which
+      intersects it locally.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          set: Set of mutual connections
+      """
+      shard_a, shard_b = self.owner(user_a), self.owner(user_b)
+      friends_b = self._require(user_b, self._request(shard_b, "neighbors", user_b, 1))
+      if shard_a != shard_b:
+         self.stats["remote_ids"] += len(friends_b)
+      return set(self._require(user_a, self._request(shard_a, "intersect", (user_a, friends_b),
+                                                       len(friends_b) + 1)))
+
+   def find_all_connections(self, user, depth=1):
+      """
+      Find all connections up to a certain depth.
+
+      Every level groups the frontier by owning shard and sends one batch to
+      each shard in parallel.
+
+      Args:
+          user (str): The user to find connections for
+          depth (int): Connection depth (1 = direct, 2 = friend of friend)
+
+      Returns:
+          set: Set of all connections up to specified depth
+      """
+      if depth < 1:
+         raise ValueError("Depth must be at least 1")
+      direct = self._require(user, self._request(self.owner(user), "neighbors", user, 1))
+
+      visited = {user}
+      frontier = [member for member in direct if member not in visited]
+      visited.update(frontier)
+      found = set(frontier)
+      for _ in range(depth - 1):
+         if not frontier:
+            break
+         batches = {}
+         for member in frontier:
+            batches.setdefault(self.owner(member), []).append(member)
+         for shard, batch in batches.items():
+            self.stats["requests"] += 1
+            self.stats["ids_sent"] += len(batch)
+            self._pipes[shard].send(("expand", batch))
+         frontier = []
+         for shard in batches:
+            for member in self._receive(shard):
+               if self.owner(member) != shard:
+                  self.stats["remote_ids"] += 1
+               if member not in visited:
+                  visited.add(member)
+                  frontier.append(member)
+         found.update(frontier)
+      return found
+
+
+def partition_report(connections, num_shards, strategies=PARTITIONERS):
+   """
+   Compare partitioning strategies by edge cut and balance.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       num_shards (int): Number of shards
+       strategies (tuple): Strategy names to compare
+
+   Returns:
+       list: One dict per strategy with edge_cut, cut_ratio and balance
+   """
+   report = []
+   for strategy in strategies:
+      assignment = partition(connections, num_shards, strategy)
+      cut, total = edge_cut(connections, assignment)
+      sizes = [0] * num_shards
+      for shard in assignment.values():
+         sizes[shard] += 1
+      report.append({
+         "strategy": strategy,
+         "edge_cut": cut,
+         "cut_ratio": cut / total if total else 0.0,
+         "balance": max(sizes) * num_shards / len(assignment) if assignment else 1.0,
+      })
+   return report
@@ -3,6 +3,9 @@ Social Network Graph Analysis
 This program demonstrates set operations through social network analysis.
 """
 
+from parallel import parallel_intersection, parallel_network_density, parallel_union, should_parallelize
+from streaming import STREAMED_DATA_TYPES, stream_display_data
+
 def initialize_data():
    """
    Initialize the network data with predefined sets using sets.
@@ -56,6 +59,10 @@ def find_mutual_connections(user_a, user_b, connections):
    if user_b not in connections:
        raise ValueError(f"User {user_b} not found in connections")
    
+   # Array-backed graphs answer with sorted-array kernels
+   if hasattr(connections, "mutual_neighbors"):
+       return connections.mutual_neighbors(user_a, user_b)
+   
    # TODO: Implement set intersection to find mutual connections
    # Hint: Use the intersection operator (&) or .intersection() method
    
@@ -79,6 +86,10 @@ def find_exclusive_connections(user_a, user_b, connections):
    if user_b not in connections:
        raise ValueError(f"User {user_b} not found in connections")
    
+   # Array-backed graphs answer with sorted-array kernels
+   if hasattr(connections, "exclusive_neighbors"):
+       return connections.exclusive_neighbors(user_a, user_b)
+   
    # TODO: Implement symmetric difference to find exclusive connections
    # Hint: Use the symmetric difference operator (^) or .symmetric_difference() method
    
@@ -102,6 +113,10 @@ def find_all_connections(user, connections, depth=1):
    if depth < 1:
        raise ValueError("Depth must be at least 1")
    
+   # Disk-backed graphs page their adjacency in ID order instead
+   if hasattr(connections, "find_all_connections"):
+       return connections.find_all_connections(user, depth)
+   
    # TODO: Implement logic to find all connections up to a certain depth
    # Hint: For depth=1, return direct connections
    # Hint: For depth>1, add friends of friends (excluding original user and direct friends)
@@ -123,6 +138,10 @@ def find_common_group_members(group_a, group_b):
    if group_a is None or group_b is None:
        raise ValueError("Group data cannot be None")
    
+   # Large groups go to the configured parallel executor
+   if should_parallelize(len(group_a), len(group_b)):
+       return parallel_intersection(group_a, group_b)
+   
    # TODO: Implement set intersection to find common members
    # Hint: Use the intersection operator (&) or .intersection() method
    
@@ -143,6 +162,10 @@ def find_users_in_any_group(group_a, group_b):
    if group_a is None or group_b is None:
        raise ValueError("Group data cannot be None")
    
+   # Large groups go to the configured parallel executor
+   if should_parallelize(len(group_a), len(group_b)):
+       return parallel_union(group_a, group_b)
+   
    # TODO: Implement set union to find members in either group
    # Hint: Use the union operator (|) or .union() method
    
@@ -164,6 +187,10 @@ def is_direct_connection(user_a, user_b, connections):
    if user_a not in connections:
        raise ValueError(f"User {user_a} not found in connections")
    
+   # Compressed graphs probe skip pointers instead of building a set
+   if hasattr(connections, "has_edge"):
+       return connections.has_edge(user_a, user_b)
+   
    # TODO: Implement check if user_b is in user_a's connections
    # Hint: Use the 'in' operator to check membership
    
@@ -187,6 +214,10 @@ def is_second_degree_connection(user_a, user_b, connections):
    if user_b not in connections:
        raise ValueError(f"User {user_b} not found in connections")
    
+   # Hot users are answered from the materialized 2-hop index
+   if hasattr(connections, "is_second_degree"):
+       return connections.is_second_degree(user_a, user_b)
+   
    # TODO: Implement logic to check for second-degree connections
    # Hint: If directly connected, return False
    # Hint: Check if any of user_a's friends are also connected to user_b
@@ -227,6 +258,10 @@ def calculate_network_density(users, connections):
    if not users:
        raise ValueError("User set cannot be empty")
    
+   # Large user sets go to the configured parallel executor
+   if should_parallelize(len(users)):
+       return parallel_network_density(users, connections)
+   
    # TODO: Implement network density calculation
    # Hint: Density = actual connections / possible connections
    # Hint: Possible connections = n * (n-1) where n is number of users
@@ -248,6 +283,10 @@ def find_isolated_users(users, connections):
    if users is None:
        raise ValueError("Users set cannot be None")
    
+   # Graph views track incoming edges, so isolation means the same in both modes
+   if hasattr(connections, "isolated_users"):
+       return connections.isolated_users(users)
+   
    # TODO: Implement logic to find isolated users
    # Hint: Find users with no outgoing connections AND no incoming connections
    
@@ -269,6 +308,10 @@ def recommend_connections(user, connections, depth=2):
    if user not in connections:
        raise ValueError(f"User {user} not found in connections")
    
+   # Hot users are answered from the materialized 2-hop index
+   if hasattr(connections, "recommendations"):
+       return connections.recommendations(user, depth)
+   
    # TODO: Implement connection recommendations
    # Hint: Get all connections up to specified depth
    # Hint: Remove direct connections and the user themselves
@@ -317,6 +360,16 @@ def display_data(data, data_type):
        data: Data to display (set, dict, etc.)
        data_type (str): Type of data being displayed
    """
+   # Input validation
+   if data is None:
+       print("No data to display.")
+       return
+   
+   # Large user collections are streamed in sorted chunks
+   if data_type in STREAMED_DATA_TYPES:
+       stream_display_data(data, data_type)
+       return
+   
    # TODO: Implement display logic for different data types:
    # "networks", "connections", "mutual_connections", "bridge_users", "recommendations"
    
@@ -0,0 +1,179 @@
+"""
+Sorted Array Kernels
+This module intersects and symmetric-differences sorted integer arrays,
+choosing a linear merge or galloping search by the ratio of their sizes.
+"""
+
+from bisect import bisect_left
+
+GALLOP_RATIO = 8
+
+
+def gallop(values, target, lo, hi):
+   """
+   Find the first position in values[lo:hi] holding a value >= target.
+
+   Probes lo + 1, lo + 2, lo + 4, ... before a binary search, so the cost is
+   logarithmic in the distance moved rather than in the array length.
+
+   Args:
+       values (array): Sorted values
+       target (int): Value to search for
+       lo (int): Start of the search range
+       hi (int): End of the search range
+
+   Returns:
+       int: Insertion position of target
+   """
+   bound = 1
+   while lo + bound < hi and values[lo + bound] < target:
+      bound <<= 1
+   return bisect_left(values, target, lo + (bound >> 1), min(lo + bound + 1, hi))
+
+
+def intersect_merge(a, b):
+   """
+   Intersect two sorted arrays with a linear merge.
+
+   Args:
+       a (array): First sorted array
+       b (array): Second sorted array
+
+   Returns:
+       list: Sorted common values
+   """
+   result = []
+   i = j = 0
+   len_a, len_b = len(a), len(b)
+   while i < len_a and j < len_b:
+      x, y = a[i], b[j]
+      if x == y:
+         result.append(x)
+         i += 1
+         j += 1
+      elif x < y:
+         i += 1
+      else:
+         j += 1
+   return result
+
+
+def intersect_gallop(small, large):
+   """
+   Intersect a short sorted array with a much longer one by galloping.
+
+   Args:
+       small (array): Shorter sorted array
+       large (array): Longer sorted array
+
+   Returns:
+       list: Sorted common values
+   """
+   result = []
+   pos = 0
+   end = len(large)
+   for value in small:
+      pos = gallop(large, value, pos, end)
+      if pos == end:
+         break
+      if large[pos] == value:
+         result.append(value)
+         pos += 1
+   return result
+
+
+def intersect_sorted(a, b, ratio=GALLOP_RATIO):
+   """
+   Intersect two sorted arrays with the kernel suited to their sizes.
+
+   Args:
+       a (array): First sorted array
+       b (array): Second sorted array
+       ratio (int): Size ratio from which galloping is used
+
+   Returns:
+       list: Sorted common values
+   """
+   small, large = (a, b) if len(a) <= len(b) else (b, a)
+   if not small:
+      return []
+   if len(large) >= ratio * len(small):
+      return intersect_gallop(small, large)
+   return intersect_merge(small, large)
+
+
+def symmetric_difference_merge(a, b):
+   """
+   Find the values in exactly one of two sorted arrays with a linear merge.
+
+   Args:
+       a (array): First sorted array
+       b (array): Second sorted array
+
+   Returns:
+       list: Sorted values present in only one array
+   """
+   result = []
+   i = j = 0
+   len_a, len_b = len(a), len(b)
+   while i < len_a and j < len_b:
+      x, y = a[i], b[j]
+      if x == y:
+         i += 1
+         j += 1
+      elif x < y:
+         result.append(x)
+         i += 1
+      else:
+         result.append(y)
+         j += 1
+   result.extend(a[i:])
+   result.extend(b[j:])
+   return result
+
+
+def symmetric_difference_gallop(small, large):
+   """
+   Find the values in exactly one of two sorted arrays of skewed sizes.
+
+   Each value of the short array is located by galloping and the runs of
+   the long array between matches are copied as whole slices.
+
+   Args:
+       small (array): Shorter sorted array
+       large (array): Longer sorted array
+
+   Returns:
+       list: Sorted values present in only one array
+   """
+   result = []
+   pos = 0
+   end = len(large)
+   for value in small:
+      found = gallop(large, value, pos, end)
+      result.extend(large[pos:found])
+      if found < end and large[found] == value:
+         pos = found + 1
+      else:
+         result.append(value)
+         pos = found
+   result.extend(large[pos:])
+   return result
+
+
+def symmetric_difference_sorted(a, b, ratio=GALLOP_RATIO):
+   """
+   Find the values in exactly one of two sorted arrays with the suited kernel.
+
+   Args:
+       a (array): First sorted array
+       b (array): Second sorted array
+       ratio (int): Size ratio from which galloping is used
+
+   Returns:
+       list: Sorted values present in only one array
+   """
+   small, large = (a, b) if len(a) <= len(b) else (b, a)
+   if len(large) >= ratio * max(1, len(small)):
+      return symmetric_difference_gallop(small, large)
+   return symmetric_difference_merge(small, large)
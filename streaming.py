@@ -0,0 +1,167 @@
+"""
+Streaming Display Output
+This module writes sorted user sets to file-like objects in chunks, spilling
+to an external merge sort when a set is larger than the memory budget.
+"""
+
+import sys
+from itertools import islice
+
+STREAMED_DATA_TYPES = {
+   "networks": "Networks",
+   "connections": "Connections",
+   "bridge_users": "Bridge Users",
+}
+# Text between a key and its set: format_users_for_display uses ": " and the
+# specification shows connections as "user → connections"
+KEY_SEPARATORS = {
+   "networks": ": ",
+   "connections": " → ",
+   "bridge_users": ": ",
+}
+_ESCAPES = {"\\": "\\\\", "\n": "\\n", "\r": "\\r"}
+_UNESCAPES = {"\\": "\\", "n": "\n", "r": "\r"}
+
+
+def _write_run(names, tmp_dir):
+   """Write one sorted run to a temporary file, one escaped name per line."""
+   import tempfile
+   # newline="" keeps "\r" inside names from being read back as a line break
+   run = tempfile.TemporaryFile("w+", encoding="utf-8", newline="", dir=tmp_dir)
+   for name in names:
+      if "\\" in name or "\n" in name or "\r" in name:
+         name = "".join(_ESCAPES.get(char, char) for char in name)
+      run.write(name)
+      run.write("\n")
+   run.seek(0)
+   return run
+
+
+def _read_run(run):
+   """Yield the names of a run file with the terminator and escapes removed."""
+   import re
+   escaped = re.compile(r"\\(.)")
+   for line in run:
+      name = line[:-1]
+      if "\\" in name:
+         name = escaped.sub(lambda match: _UNESCAPES[match.group(1)], name)
+      yield name
+
+
+def iter_sorted(users, memory_budget=100_000, tmp_dir=None):
+   """
+   Yield users in sorted order without holding more than memory_budget of them.
+
+   Sets within the budget are sorted in memory. Larger sets are cut into
+   sorted runs on disk that are merged back lazily.
+
+   Args:
+       users (iterable): User names
+       memory_budget (int): Maximum number of names sorted in memory at once
+       tmp_dir (str): Directory for the temporary run files
+
+   Returns:
+       iterator: User names in sorted order
+   """
+   if memory_budget < 1:
+      raise ValueError("Memory budget must be at least 1")
+   return _merge_sorted_runs(iter(users), memory_budget, tmp_dir)
+
+
+def _merge_sorted_runs(iterator, memory_budget, tmp_dir):
+   """Sort in memory or spill sorted runs to disk and merge them."""
+   first = sorted(islice(iterator, memory_budget))
+   if len(first) < memory_budget:
+      yield from first
+      return
+
+   import heapq
+   from contextlib import ExitStack
+
+   with ExitStack() as stack:
+      runs = [stack.enter_context(_write_run(first, tmp_dir))]
+      del first
+      while True:
+         chunk = sorted(islice(iterator, memory_budget))
+         if not chunk:
+            break
+         runs.append(stack.enter_context(_write_run(chunk, tmp_dir)))
+      # Compare the decoded names, not the stored lines with their terminator
+      yield from heapq.merge(*(_read_run(run) for run in runs))
+
+
+def write_sorted_names(names, out, chunk_size=1000, separator=", "):
+   """
+   Write already sorted names to a file-like object in chunks.
+
+   Args:
+       names (iterable): Names in output order
+       out: File-like object with a write method
+       chunk_size (int): Number of names joined per write
+       separator (str): Separator between names
+   """
+   if chunk_size < 1:
+      raise ValueError("Chunk size must be at least 1")
+   iterator = iter(names)
+   chunk = list(islice(iterator, chunk_size))
+   while chunk:
+      out.write(separator.join(chunk))
+      chunk = list(islice(iterator, chunk_size))
+      if chunk:
+         out.write(separator)
+
+
+def write_users_for_display(group_name, users, out, chunk_size=1000, memory_budget=100_000, tmp_dir=None,
+                            separator=": "):
+   """
+   Stream a user set for display as "group_name: {user1, user2, ...}".
+
+   The line is the same as format_users_for_display(group_name, users)
+   followed by a newline.
+
+   Args:
+       group_name (str): Name of the user group
+       users (set): Set of users
+       out: File-like object with a write method
+       chunk_size (int): Number of users joined per write
+       memory_budget (int): Maximum number of users sorted in memory at once
+       tmp_dir (str): Directory for the temporary run files
+       separator (str): Text between the group name and the set
+   """
+   # Input validation
+   if users is None:
+      raise ValueError("User set cannot be None")
+
+   out.write(f"{group_name}{separator}{{")
+   write_sorted_names(iter_sorted(users, memory_budget, tmp_dir), out, chunk_size)
+   out.write("}\n")
+
+
+def stream_display_data(data, data_type, out=None, chunk_size=1000, memory_budget=100_000, tmp_dir=None):
+   """
+   Stream "networks", "connections" or "bridge_users" data for display.
+
+   Networks keep their given order; connections and bridge users are listed
+   by sorted user name. Networks and bridge users are written as
+   "name: {a, b}" and connections as "user → {a, b}".
+
+   Args:
+       data (dict): Dictionary of name to set of names
+       data_type (str): One of the keys of STREAMED_DATA_TYPES
+       out: File-like object with a write method (default: sys.stdout)
+       chunk_size (int): Number of names joined per write
+       memory_budget (int): Maximum number of names sorted in memory at once
+       tmp_dir (str): Directory for the temporary run files
+   """
+   if data_type not in STREAMED_DATA_TYPES:
+      raise ValueError(f"Data type {data_type} cannot be streamed")
+   if data is None:
+      raise ValueError("Data cannot be None")
+   if out is None:
+      out = sys.stdout
+
+   out.write(f"\n{STREAMED_DATA_TYPES[data_type]}:\n")
+   keys = data if data_type == "networks" else iter_sorted(data, memory_budget, tmp_dir)
+   for key in keys:
+      write_users_for_display(key, data[key], out, chunk_size, memory_budget, tmp_dir,
+                              KEY_SEPARATORS[data_type])
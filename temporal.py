@@ -0,0 +1,335 @@
+"""
+Temporal Connections
+This module stores timestamped connections in time-sorted rows, evaluates
+time-window views without copying the graph, maintains sliding windows
+incrementally and scores mutual friends with exponential time decay.
+"""
+
+import heapq
+import time
+import weakref
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+
+def decay_weight(age, half_life):
+   """
+   Weight of a connection that is age seconds old.
+
+   Args:
+       age (float): Age of the connection
+       half_life (float): Age at which the weight drops to 0.5
+
+   Returns:
+       float: Weight in (0, 1]
+   """
+   return 0.5 ** (max(0.0, age) / half_life)
+
+
+class TemporalGraph(Mapping):
+   """
+   Connections with the time each one was made.
+
+   Every user's outgoing connection events are kept sorted by timestamp in
+   parallel arrays, so a time window of a row is one binary search away.
+   The latest timestamp of every connection is kept for decay scoring. As
+   a mapping it gives the all-time connections of a user. New events are
+   handed to the live sliding windows of the graph; nothing else is logged.
+   """
+
+   def __init__(self):
+      self._times = {}
+      self._targets = {}
+      self._latest = {}
+      # Keyed by id: windows compare by content, so they are not hashable
+      self._windows = weakref.WeakValueDictionary()
+
+   def add_edge(self, user_a, user_b, timestamp=None):
+      """
+      Record a connection from user_a to user_b.
+
+      Events may arrive slightly out of order; they are inserted at their
+      place in the user's row.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+          timestamp (float): Time of the connection (now if None)
+      """
+      if timestamp is None:
+         timestamp = time.time()
+      times = self._times.get(user_a)
+      if times is None:
+         times = self._times[user_a] = array("d")
+         self._targets[user_a] = []
+         self._latest[user_a] = {}
+      self._latest.setdefault(user_b, {})
+      self._times.setdefault(user_b, array("d"))
+      self._targets.setdefault(user_b, [])
+
+      targets = self._targets[user_a]
+      if not times or timestamp >= times[-1]:
+         times.append(timestamp)
+         targets.append(user_b)
+      else:
+         pos = bisect_right(times, timestamp)
+         times.insert(pos, timestamp)
+         targets.insert(pos, user_b)
+      latest = self._latest[user_a]
+      if latest.get(user_b, float("-inf")) < timestamp:
+         latest[user_b] = timestamp
+      for window in self._windows.values():
+         window._arrivals.append((timestamp, user_a, user_b))
+
+   def connection_time(self, user_a, user_b):
+      """
+      Get the latest time user_a connected to user_b.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+
+      Returns:
+          float: Timestamp, or None if they are not connected
+      """
+      return self._latest.get(user_a, {}).get(user_b)
+
+   def row_in_window(self, user, start, end):
+      """
+      Get a user's connections made in start < t <= end.
+
+      Args:
+          user (str): User
+          start (float): Exclusive window start (None = no lower bound)
+          end (float): Inclusive window end (None = no upper bound)
+
+      Returns:
+          set: Set of connections in the window
+      """
+      times = self._times.get(user)
+      if times is None:
+         raise ValueError(f"User {user} not found in connections")
+      lo = 0 if start is None else bisect_right(times, start)
+      hi = len(times) if end is None else bisect_right(times, end)
+      return set(self._targets[user][lo:hi])
+
+   def window(self, start=None, end=None):
+      """
+      Get a read-only view of the connections made in start < t <= end.
+
+      Args:
+          start (float): Exclusive window start (None = no lower bound)
+          end (float): Inclusive window end (None = no upper bound)
+
+      Returns:
+          WindowView: Connections mapping restricted to the window
+      """
+      if start is not None and end is not None and end < start:
+         raise ValueError("Window end must not be before its start")
+      return WindowView(self, start, end)
+
+   def last(self, duration, now=None):
+      """
+      Get a view of the connections made in the last duration seconds.
+
+      Args:
+          duration (float): Window length
+          now (float): End of the window (current time if None)
+
+      Returns:
+          WindowView: Connections mapping restricted to the window
+      """
+      if duration < 0:
+         raise ValueError("Duration must be non-negative")
+      if now is None:
+         now = time.time()
+      return self.window(now - duration, now)
+
+   def decayed_mutual_score(self, user_a, user_b, now, half_life):
+      """
+      Score the mutual friends of two users, favouring recent connections.
+
+      Each mutual friend contributes the product of the decay weights of
+      its connections from user_a and from user_b.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+          now (float): Time the ages are measured from
+          half_life (float): Age at which a connection counts half
+
+      Returns:
+          float: Sum of the weights over all mutual friends
+      """
+      if half_life <= 0:
+         raise ValueError("Half-life must be positive")
+      for user in (user_a, user_b):
+         if user not in self._latest:
+            raise ValueError(f"User {user} not found in connections")
+      latest_a, latest_b = self._latest[user_a], self._latest[user_b]
+      if len(latest_a) > len(latest_b):
+         latest_a, latest_b = latest_b, latest_a
+      return sum(decay_weight(now - time_a, half_life) * decay_weight(now - latest_b[friend], half_life)
+                 for friend, time_a in latest_a.items() if friend in latest_b)
+
+   def decayed_recommendations(self, user, now, half_life, k=10):
+      """
+      Recommend friends of friends ranked by decay-weighted paths.
+
+      Args:
+          user (str): User to make recommendations for
+          now (float): Time the ages are measured from
+          half_life (float): Age at which a connection counts half
+          k (int): Number of recommendations
+
+      Returns:
+          list: (user, score) tuples, best first
+      """
+      if user not in self._latest:
+         raise ValueError(f"User {user} not found in connections")
+      if half_life <= 0:
+         raise ValueError("Half-life must be positive")
+      direct = self._latest[user]
+      scores = {}
+      for friend, time_a in direct.items():
+         weight_a = decay_weight(now - time_a, half_life)
+         for candidate, time_b in self._latest.get(friend, {}).items():
+            if candidate != user and candidate not in direct:
+               scores[candidate] = scores.get(candidate, 0.0) + weight_a * decay_weight(now - time_b, half_life)
+      return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+   def __getitem__(self, user):
+      return set(self._latest[user])
+
+   def __iter__(self):
+      return iter(self._latest)
+
+   def __len__(self):
+      return len(self._latest)
+
+   def __contains__(self, user):
+      return user in self._latest
+
+
+class WindowView(Mapping):
+   """
+   Connections made inside a time window, read straight from the rows of a
+   TemporalGraph. Nothing is copied until a user's connections are looked
+   up, and then only that user's window slice.
+   """
+
+   def __init__(self, graph, start, end):
+      self.graph = graph
+      self.start = start
+      self.end = end
+
+   def __getitem__(self, user):
+      if user not in self.graph:
+         raise KeyError(user)
+      return self.graph.row_in_window(user, self.start, self.end)
+
+   def __iter__(self):
+      return iter(self.graph)
+
+   def __len__(self):
+      return len(self.graph)
+
+   def __contains__(self, user):
+      return user in self.graph
+
+
+class SlidingWindow(Mapping):
+   """
+   Connections made in the last width seconds, updated incrementally.
+
+   The window subscribes to the graph: events already in the graph that
+   are not yet expired are picked up from the rows at construction, and
+   later events are handed over by add_edge. advance(now) only processes
+   the events that entered or left the window since the previous call,
+   using heaps of arrival and expiry times, and drops expired events, so
+   the window holds only the events of the last width seconds and those
+   not yet due. A connection made several times inside the window stays
+   until its last event expires.
+   """
+
+   def __init__(self, graph, width, now=None):
+      if width <= 0:
+         raise ValueError("Window width must be positive")
+      self.graph = graph
+      self.width = width
+      self.now = None
+      self._arrivals = []
+      self._pending = []
+      self._expiry = []
+      self._counts = {}
+      self._connections = {}
+      if now is None:
+         now = time.time()
+      for user_a, times in graph._times.items():
+         targets = graph._targets[user_a]
+         for pos in range(bisect_right(times, now - width), len(times)):
+            self._arrivals.append((times[pos], user_a, targets[pos]))
+      graph._windows[id(self)] = self
+      self.advance(now)
+
+   def advance(self, now):
+      """
+      Move the window end to now.
+
+      Args:
+          now (float): New window end; must not go backwards
+
+      Returns:
+          tuple: (number of events added, number of events expired)
+      """
+      if self.now is not None and now < self.now:
+         raise ValueError("Sliding window cannot move backwards")
+      self.now = now
+      start = now - self.width
+      for event in self._arrivals:
+         heapq.heappush(self._pending, event)
+      self._arrivals.clear()
+
+      added = expired = 0
+      while self._pending and self._pending[0][0] <= now:
+         event = heapq.heappop(self._pending)
+         timestamp, user_a, user_b = event
+         if timestamp <= start:
+            continue
+         key = (user_a, user_b)
+         count = self._counts.get(key, 0)
+         if not count:
+            self._connections.setdefault(user_a, set()).add(user_b)
+         self._counts[key] = count + 1
+         heapq.heappush(self._expiry, event)
+         added += 1
+
+      while self._expiry and self._expiry[0][0] <= start:
+         _, user_a, user_b = heapq.heappop(self._expiry)
+         key = (user_a, user_b)
+         count = self._counts[key] - 1
+         if count:
+            self._counts[key] = count
+         else:
+            del self._counts[key]
+            friends = self._connections[user_a]
+            friends.discard(user_b)
+            if not friends:
+               del self._connections[user_a]
+         expired += 1
+      return added, expired
+
+   def __getitem__(self, user):
+      if user not in self.graph:
+         raise KeyError(user)
+      return frozenset(self._connections.get(user, ()))
+
+   def __iter__(self):
+      return iter(self.graph)
+
+   def __len__(self):
+      return len(self.graph)
+
+   def __contains__(self, user):
+      return user in self.graph
@@ -0,0 +1,95 @@
+"""
+Plain-dict reference implementations of the skeleton.py analysis functions,
+written from the assignment specification. The module tests compare the
+optimized back ends against these.
+"""
+
+def sample_connections():
+    """Return the connections dict from the assignment specification."""
+    return {
+        "user1": {"user2", "user3", "user5"},
+        "user2": {"user1", "user4", "user6"},
+        "user3": {"user1", "user5", "user7"},
+        "user4": {"user2", "user6"},
+        "user5": {"user1", "user3", "user7", "user8"},
+        "user6": {"user2", "user4"},
+        "user7": {"user3", "user5"},
+        "user8": {"user5", "user9", "user10"},
+        "user9": {"user8"},
+        "user10": {"user8"},
+    }
+
+def sample_groups():
+    """Return the named groups from the assignment specification."""
+    return {
+        "network_a": {"user1", "user2", "user3", "user4", "user5", "user6", "user7"},
+        "network_b": {"user5", "user6", "user7", "user8", "user9", "user10"},
+        "tech_group": {"user1", "user3", "user5", "user8", "user10"},
+        "gaming_group": {"user2", "user4", "user6", "user8", "user9"},
+        "arts_group": {"user3", "user5", "user7", "user10"},
+    }
+
+def mutual_connections(user_a, user_b, connections):
+    return connections[user_a] & connections[user_b]
+
+def exclusive_connections(user_a, user_b, connections):
+    return connections[user_a] ^ connections[user_b]
+
+def all_connections(user, connections, depth=1):
+    all_found = set(connections[user])
+    frontier = set(connections[user])
+    for _ in range(depth - 1):
+        new_frontier = set()
+        for member in frontier:
+            if member in connections:
+                new_frontier |= connections[member]
+        new_frontier -= all_found | {user}
+        all_found |= new_frontier
+        frontier = new_frontier
+    all_found.discard(user)
+    return all_found
+
+def common_group_members(group_a, group_b):
+    return group_a & group_b
+
+def users_in_any_group(group_a, group_b):
+    return group_a | group_b
+
+def is_direct_connection(user_a, user_b, connections):
+    return user_b in connections[user_a]
+
+def is_second_degree_connection(user_a, user_b, connections):
+    if user_a == user_b or user_b in connections[user_a]:
+        return False
+    return any(user_b in connections.get(friend, ()) for friend in connections[user_a])
+
+def bridge_users(communities):
+    user_communities = {}
+    for name, members in communities.items():
+        for member in members:
+            user_communities.setdefault(member, set()).add(name)
+    return {user: comms for user, comms in user_communities.items() if len(comms) > 1}
+
+def network_density(users, connections):
+    n = len(users)
+    if n < 2:
+        return 0.0
+    counted_pairs = set()
+    for user in users:
+        for connection in connections.get(user, ()):
+            if connection in users and connection != user:
+                counted_pairs.add(tuple(sorted([user, connection])))
+    return len(counted_pairs) / (n * (n - 1) / 2)
+
+def isolated_users(users, connections):
+    incoming = set()
+    for friends in connections.values():
+        incoming |= friends
+    return {user for user in users if not connections.get(user) and user not in incoming}
+
+def recommendations(user, connections, depth=2):
+    return all_connections(user, connections, depth) - connections[user] - {user}
+
+def format_users_for_display(group_name, users):
+    formatted_users = ", ".join(sorted(users))
+    return f"{group_name}: {{{formatted_users}}}"
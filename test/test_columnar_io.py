@@ -0,0 +1,103 @@
+import unittest
+import os
+import shutil
+import tempfile
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph
+from test import reference
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+if pa is not None:
+    from columnar_io import (compact_graph_from_arrow, read_edges, read_graph, read_groups, read_results,
+                             write_edges, write_graph, write_groups, write_results)
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestColumnarIO(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory and a random graph with an isolated user"""
+        self.directory = tempfile.mkdtemp(prefix="columnar-test-")
+        self.connections = random_connections(300, 5, seed=49)
+        self.connections["loner"] = set()
+        self.graph = CompactGraph.from_connections(self.connections)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_edges_and_groups_round_trip(self):
+        """Test that connections and groups survive export and import in small row groups"""
+        write_edges(self.connections, self.path("edges.parquet"), batch_size=64)
+        self.assertEqual(read_edges(self.path("edges.parquet"), batch_size=50), self.connections)
+        groups = reference.sample_groups()
+        write_groups(groups, self.path("groups.parquet"), batch_size=4)
+        self.assertEqual(read_groups(self.path("groups.parquet")), groups)
+
+    def test_user_set_result_round_trip(self):
+        """Test a set of users, like find_isolated_users or recommend_connections"""
+        result = reference.recommendations("user1", reference.sample_connections())
+        write_results(result, self.path("users.parquet"), batch_size=2)
+        self.assertEqual(read_results(self.path("users.parquet")), result)
+        write_results(set(), self.path("empty.parquet"))
+        self.assertEqual(read_results(self.path("empty.parquet")), set())
+
+    def test_score_result_round_trip(self):
+        """Test a user to score mapping and a ranked list, keeping the order"""
+        scores = {"user7": 0.9, "user2": 0.5, "user9": 0.25}
+        write_results(scores, self.path("scores.parquet"), batch_size=2)
+        read = read_results(self.path("scores.parquet"))
+        self.assertEqual(read, scores)
+        self.assertEqual(list(read), list(scores))
+        write_results([("user3", 2), ("user1", 1)], self.path("ranked.parquet"))
+        self.assertEqual(list(read_results(self.path("ranked.parquet")).items()), [("user3", 2.0), ("user1", 1.0)])
+
+    def test_group_result_round_trip(self):
+        """Test the user to set of groups mapping returned by identify_bridge_users"""
+        bridges = reference.bridge_users(reference.sample_groups())
+        bridges["user0"] = set()
+        write_results(bridges, self.path("bridges.parquet"), batch_size=3)
+        self.assertEqual(read_results(self.path("bridges.parquet")), bridges)
+        with self.assertRaises(ValueError):
+            write_results("user1", self.path("bad.parquet"))
+        write_groups(reference.sample_groups(), self.path("groups.parquet"))
+        with self.assertRaises(ValueError):
+            read_results(self.path("groups.parquet"))
+
+    def test_graph_round_trip_over_row_groups(self):
+        """Test that a graph split over many row groups loads into the same CSR arrays"""
+        write_graph(self.graph, self.path("graph"), batch_size=100)
+        for batch_size in (37, 10 ** 6):
+            graph = read_graph(self.path("graph"), batch_size=batch_size)
+            self.assertEqual(list(graph.offsets), list(self.graph.offsets))
+            self.assertEqual(list(graph.targets), list(self.graph.targets))
+            self.assertEqual(dict(graph), self.connections)
+
+    def test_arrow_columns(self):
+        """Test zero-copy single chunks, chunked columns and ID validation"""
+        names = list(self.graph.interner)
+        sources = [uid for uid in range(self.graph.num_users) for _ in self.graph.neighbors(uid)]
+        targets = list(self.graph.targets)
+        friend_ids = pa.array(targets, pa.int64())
+        graph = compact_graph_from_arrow(names, pa.array(sources, pa.int64()), friend_ids)
+        self.assertIsInstance(graph.targets, memoryview)
+        self.assertEqual(dict(graph), self.connections)
+
+        chunked = compact_graph_from_arrow(names, pa.chunked_array([sources[:500], sources[500:]], pa.int64()),
+                                           pa.chunked_array([targets[:123], targets[123:]], pa.int64()))
+        self.assertEqual(list(chunked.offsets), list(self.graph.offsets))
+        self.assertEqual(list(chunked.targets), targets)
+
+        unsorted = sources[:]
+        unsorted[10], unsorted[-10] = unsorted[-10], unsorted[10]
+        for bad_sources, bad_targets in ((unsorted, targets), (sources, targets[:-1] + [len(names)]),
+                                         (sources[:-1] + [None], targets), (sources[:-1], targets)):
+            with self.assertRaises(ValueError):
+                compact_graph_from_arrow(names, pa.array(bad_sources, pa.int64()), pa.array(bad_targets, pa.int64()))
+
+if __name__ == '__main__':
+    unittest.main()
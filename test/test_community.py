@@ -0,0 +1,53 @@
+import unittest
+from benchmarks.synthetic import planted_partition_connections
+from community import detect_communities, label_propagation, louvain, modularity
+from graph_core import CompactGraph
+from test import reference
+
+class TestCommunityDetection(unittest.TestCase):
+    def setUp(self):
+        """Build a graph with four planted communities"""
+        self.connections, self.planted = planted_partition_connections(400, 4, 12, 1, seed=3)
+        self.graph = CompactGraph.from_connections(self.connections, undirected=True)
+
+    def test_louvain_finds_planted_partition(self):
+        """Test that Louvain reaches the modularity of the planted partition"""
+        labels = louvain(self.graph)
+        planted_labels = [0] * self.graph.num_users
+        for index, members in enumerate(self.planted.values()):
+            for member in members:
+                planted_labels[self.graph.interner.id_of(member)] = index
+        self.assertGreaterEqual(modularity(self.graph, labels), modularity(self.graph, planted_labels) - 0.02)
+
+    def test_label_propagation_independent_of_workers(self):
+        """Test that label propagation gives the same labels for any worker count"""
+        serial = label_propagation(self.graph)
+        self.assertEqual(label_propagation(self.graph, workers=3, executor="thread"), serial)
+
+    def test_communities_cover_every_user(self):
+        """Test that disjoint communities partition the users"""
+        communities = detect_communities(self.connections)
+        members = [user for group in communities.values() for user in group]
+        self.assertEqual(len(members), len(set(members)))
+        self.assertEqual(set(members), set(self.connections))
+        self.assertEqual(reference.bridge_users(communities), {})
+
+    def test_overlap_creates_bridge_users(self):
+        """Test that overlapping communities feed identify_bridge_users"""
+        communities = detect_communities(self.connections, overlap_ratio=0.2)
+        bridges = reference.bridge_users(communities)
+        self.assertTrue(bridges)
+        for user, names in bridges.items():
+            self.assertTrue(all(user in communities[name] for name in names))
+
+    def test_invalid_arguments(self):
+        """Test that bad input raises ValueError"""
+        with self.assertRaises(ValueError):
+            detect_communities(None)
+        with self.assertRaises(ValueError):
+            detect_communities(self.connections, method="unknown")
+        with self.assertRaises(ValueError):
+            louvain(self.graph, max_passes=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from benchmarks.synthetic import random_connections
+from compressed_graph import CompressedGraph
+from graph_core import CompactGraph
+from test import reference
+
+class TestCompressedGraph(unittest.TestCase):
+    def setUp(self):
+        """Build a random graph with one hub whose row spans many blocks"""
+        self.connections = random_connections(400, 6, seed=40)
+        self.connections["hub"] = {f"user{i}" for i in range(1, 400, 3)}
+        self.connections["loner"] = set()
+
+    def test_rows_round_trip(self):
+        """Test that every decoded row equals the original set for several block sizes"""
+        for block_size in (1, 4, 64):
+            graph = CompressedGraph.from_graph(self.connections, block_size)
+            compact = CompactGraph.from_connections(self.connections)
+            self.assertEqual(dict(graph), {user: set(friends) for user, friends in compact.items()})
+            for uid in range(graph.num_users):
+                self.assertEqual(list(graph.iter_neighbors(uid)), list(compact.neighbors(uid)))
+                self.assertEqual(graph.degree(uid), compact.degree(uid))
+
+    def test_intersection_matches_sets(self):
+        """Test skip-pointer intersection and membership against plain sets"""
+        for block_size in (2, 16):
+            graph = CompressedGraph.from_graph(self.connections, block_size)
+            names = ["hub", "loner"] + [f"user{i}" for i in range(1, 60)]
+            for user_a in names:
+                for user_b in names[:12]:
+                    self.assertEqual(graph.mutual_neighbors(user_a, user_b),
+                                     reference.mutual_connections(user_a, user_b, self.connections))
+                    self.assertEqual(graph.exclusive_neighbors(user_a, user_b),
+                                     reference.exclusive_connections(user_a, user_b, self.connections))
+                    self.assertEqual(graph.has_edge(user_a, user_b),
+                                     reference.is_direct_connection(user_a, user_b, self.connections))
+            self.assertFalse(graph.has_edge("hub", "nobody"))
+
+    def test_smaller_than_csr(self):
+        """Test that gap coding uses fewer bytes than the 8-byte CSR targets"""
+        compact = CompactGraph.from_connections(self.connections)
+        graph = CompressedGraph.from_graph(compact, 64)
+        self.assertLess(graph.nbytes(), 8 * (len(compact.offsets) + len(compact.targets)))
+        with self.assertRaises(ValueError):
+            CompressedGraph.from_graph(compact, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import random
+from benchmarks.synthetic import random_connections
+from graph_batch import DensityCounter, GraphBatch, MembershipIndex, ReverseAdjacency
+from two_hop_index import TwoHopIndex
+from test import reference
+
+class TestGraphBatch(unittest.TestCase):
+    def setUp(self):
+        """Build asymmetric connections, groups and a random change stream"""
+        rng = random.Random(44)
+        self.connections = random_connections(120, 4, seed=44)
+        for _ in range(80):
+            self.connections[f"user{rng.randint(1, 120)}"].add(f"user{rng.randint(1, 120)}")
+        self.groups = {f"group{g}": set(rng.sample(sorted(self.connections), 30)) for g in range(4)}
+        users = sorted(self.connections)
+        self.operations = []
+        for _ in range(600):
+            roll = rng.random()
+            if roll < 0.4:
+                self.operations.append(("add_edge", rng.choice(users[:40]), rng.choice(users[:40])))
+            elif roll < 0.7:
+                self.operations.append(("remove_edge", rng.choice(users[:40]), rng.choice(users[:40])))
+            elif roll < 0.85:
+                self.operations.append(("add_member", rng.choice(sorted(self.groups)), rng.choice(users)))
+            else:
+                self.operations.append(("remove_member", rng.choice(sorted(self.groups)), rng.choice(users)))
+
+    def expected_state(self):
+        connections = {user: set(friends) for user, friends in self.connections.items()}
+        groups = {name: set(members) for name, members in self.groups.items()}
+        for op, owner, member in self.operations:
+            if op == "add_edge":
+                connections.setdefault(owner, set()).add(member)
+            elif op == "remove_edge":
+                connections.get(owner, set()).discard(member)
+            elif op == "add_member":
+                groups.setdefault(owner, set()).add(member)
+            else:
+                groups.get(owner, set()).discard(member)
+        return connections, groups
+
+    def queue(self, batch):
+        for op, owner, member in self.operations:
+            getattr(batch, op)(owner, member)
+
+    def test_commit_matches_sequential_changes(self):
+        """Test data and observer indexes against applying each change in order"""
+        density_users = set(sorted(self.connections)[:40])
+        reverse = ReverseAdjacency(self.connections)
+        memberships = MembershipIndex(self.groups)
+        density = DensityCounter(density_users, self.connections)
+        expected_connections, expected_groups = self.expected_state()
+        with GraphBatch(self.connections, self.groups, [reverse, memberships, density]) as batch:
+            self.queue(batch)
+        self.assertEqual(self.connections, expected_connections)
+        self.assertEqual(self.groups, expected_groups)
+        for user in self.connections:
+            self.assertEqual(reverse.followers_of(user),
+                             {name for name, friends in expected_connections.items() if user in friends})
+            self.assertEqual(memberships.groups_of(user),
+                             {name for name, members in expected_groups.items() if user in members})
+        self.assertAlmostEqual(density.density, reference.network_density(density_users, expected_connections))
+
+    def test_density_counts_pairs_once(self):
+        """Test pair semantics when both directions change in one batch"""
+        connections = {"a": set(), "b": set(), "c": {"a"}}
+        density = DensityCounter({"a", "b", "c"}, connections)
+        batch = GraphBatch(connections, indexes=[density])
+        batch.add_edges([("a", "b"), ("b", "a"), ("a", "c")])
+        batch.commit()
+        self.assertAlmostEqual(density.density, reference.network_density({"a", "b", "c"}, connections))
+        batch.remove_edges([("a", "b"), ("c", "a")])
+        batch.commit()
+        self.assertAlmostEqual(density.density, reference.network_density({"a", "b", "c"}, connections))
+
+    def test_two_hop_index_owns_adjacency(self):
+        """Test that edges are routed through a registered TwoHopIndex"""
+        connections = {"a": {"b"}, "b": {"c"}, "c": set(), "d": set()}
+        index = TwoHopIndex(connections, users=["a"])
+        batch = GraphBatch(connections, indexes=[index])
+        batch.add_edge("b", "d")
+        batch.commit()
+        self.assertEqual(connections["b"], {"c", "d"})
+        self.assertEqual(index.recommendations("a"), {"c", "d"})
+        batch.remove_edge("b", "c")
+        batch.remove_edge("b", "x")
+        batch.commit()
+        self.assertEqual(connections["b"], {"d"})
+        self.assertEqual(index.recommendations("a"), {"d"})
+        self.assertEqual(index._paths["a"], index._build("a"))
+
+    def test_two_hop_index_as_connections(self):
+        """Test random batches on a TwoHopIndex passed as the connections"""
+        expected_connections, _ = self.expected_state()
+        index = TwoHopIndex(self.connections, max_entries=300, users=sorted(self.connections)[:20])
+        with GraphBatch(index) as batch:
+            self.queue(batch)
+        self.assertEqual(self.connections, expected_connections)
+        for user in index.indexed_users:
+            self.assertEqual(index._paths[user], index._build(user))
+            self.assertEqual(index.recommendations(user), reference.recommendations(user, expected_connections))
+
+    def test_invalid_registration(self):
+        """Test that a second adjacency owner or one over other data is rejected"""
+        batch = GraphBatch(self.connections, indexes=[TwoHopIndex(self.connections)])
+        with self.assertRaises(ValueError):
+            batch.register(TwoHopIndex(self.connections))
+        with self.assertRaises(ValueError):
+            GraphBatch(self.connections, indexes=[TwoHopIndex(dict(self.connections))])
+        with self.assertRaises(ValueError):
+            GraphBatch(None)
+
+    def test_discard_on_error(self):
+        """Test that a failing block leaves the data untouched"""
+        before = {user: set(friends) for user, friends in self.connections.items()}
+        with self.assertRaises(RuntimeError):
+            with GraphBatch(self.connections) as batch:
+                self.queue(batch)
+                self.assertGreater(len(batch), 0)
+                raise RuntimeError("abort")
+        self.assertEqual(self.connections, before)
+
+    def test_failed_commit_changes_nothing(self):
+        """Test that a batch failing halfway leaves the data and the queue clean"""
+        before = {user: set(friends) for user, friends in self.connections.items()}
+        groups_before = {name: set(members) for name, members in self.groups.items()}
+        batch = GraphBatch(self.connections, self.groups, indexes=[ReverseAdjacency(self.connections)])
+        batch.add_edge("user1", ["unhashable"])
+        batch.add_edge("zzz", "user2")
+        with self.assertRaises(TypeError):
+            batch.commit()
+        self.assertEqual(self.connections, before)
+        self.assertEqual(len(batch), 0)
+
+        batch.add_edge("user1", "user2")
+        batch.add_member("group0", {"unhashable"})
+        with self.assertRaises(TypeError):
+            batch.commit()
+        self.assertEqual(self.connections, before)
+        self.assertEqual(self.groups, groups_before)
+
+        batch.add_edge("zzz", "user2")
+        changes = batch.commit()
+        self.assertEqual(changes.added_edges, [("zzz", "user2")])
+        self.assertEqual(self.connections["zzz"], {"user2"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+import skeleton
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph, UserInterner, as_compact_graph, load_snapshot, save_snapshot
+from test import reference
+
+class TestCompactGraph(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph and a random directed graph"""
+        self.connections = reference.sample_connections()
+        self.graph = CompactGraph.from_connections(self.connections)
+        self.random = random_connections(300, 6, seed=7)
+        # Drop some reverse edges so the graph is not symmetric
+        for index, user in enumerate(sorted(self.random)):
+            if index % 3 == 0 and self.random[user]:
+                self.random[user].discard(min(self.random[user]))
+
+    def test_round_trip(self):
+        """Test that the CSR graph maps every user to the same connections"""
+        self.assertEqual(self.graph.to_connections(), self.connections)
+        graph = CompactGraph.from_connections(self.random)
+        self.assertEqual({user: graph[user] for user in self.random}, self.random)
+
+    def test_skeleton_dispatch_matches_reference(self):
+        """Test that skeleton.py answers from the CSR graph like the plain dict"""
+        graph = CompactGraph.from_connections(self.random)
+        users = sorted(self.random)[:40]
+        for user_a in users:
+            for user_b in users:
+                self.assertEqual(skeleton.find_mutual_connections(user_a, user_b, graph),
+                                 reference.mutual_connections(user_a, user_b, self.random))
+                self.assertEqual(skeleton.find_exclusive_connections(user_a, user_b, graph),
+                                 reference.exclusive_connections(user_a, user_b, self.random))
+                self.assertEqual(skeleton.is_direct_connection(user_a, user_b, graph),
+                                 reference.is_direct_connection(user_a, user_b, self.random))
+
+    def test_undirected(self):
+        """Test that the undirected graph stores every edge in both directions"""
+        graph = as_compact_graph(self.random, undirected=True)
+        for user, friends in self.random.items():
+            for friend in friends:
+                self.assertTrue(graph.has_edge(user, friend))
+                self.assertTrue(graph.has_edge(friend, user))
+
+    def test_relabel(self):
+        """Test that relabelling keeps every name attached to its own row"""
+        permutation = list(reversed(range(self.graph.num_users)))
+        self.assertEqual(self.graph.relabel(permutation).to_connections(), self.connections)
+        with self.assertRaises(ValueError):
+            self.graph.relabel([0] * self.graph.num_users)
+
+    def test_snapshot_round_trip(self):
+        """Test that a saved snapshot loads back into the same graph"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.snap")
+            save_snapshot(self.graph, path)
+            graph, permutation = load_snapshot(path)
+        self.assertEqual(graph.to_connections(), self.connections)
+        self.assertEqual(list(permutation), list(range(self.graph.num_users)))
+
+    def test_interner(self):
+        """Test that unknown users raise the usual error"""
+        interner = UserInterner(["user1", "user2"])
+        self.assertEqual(interner.id_of("user2"), 1)
+        with self.assertRaises(ValueError):
+            interner.id_of("user9")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import random
+from benchmarks.synthetic import random_connections
+from graph_modes import GraphView, UpperTriangularGraph, DIRECTED, UNDIRECTED
+from test import reference
+
+def closed(connections):
+    """Give every friend its own (possibly empty) entry"""
+    plain = {user: set(friends) for user, friends in connections.items()}
+    for friends in connections.values():
+        for friend in friends:
+            plain.setdefault(friend, set())
+    return plain
+
+def symmetric(connections):
+    """Store every connection in both directions"""
+    plain = closed(connections)
+    for user, friends in connections.items():
+        for friend in friends:
+            plain[friend].add(user)
+    return plain
+
+class TestGraphModes(unittest.TestCase):
+    def setUp(self):
+        """Build a random asymmetric graph with a few isolated users"""
+        self.connections = random_connections(120, 3, seed=45)
+        for user in ("user1", "user2", "user3"):
+            self.connections[user] = set()
+            for friends in self.connections.values():
+                friends.discard(user)
+        self.connections["user4"].discard("user4")
+        self.connections["user4"].add("loner")
+        self.users = set(closed(self.connections)) | {"unknown"}
+        rng = random.Random(45)
+        names = sorted(closed(self.connections))
+        self.pairs = [(rng.choice(names), rng.choice(names)) for _ in range(500)]
+
+    def check_against(self, graph, plain):
+        for user in plain:
+            self.assertEqual(set(graph[user]), plain[user])
+        for user_a, user_b in self.pairs:
+            self.assertEqual(graph.has_edge(user_a, user_b), reference.is_direct_connection(user_a, user_b, plain))
+            self.assertEqual(graph.is_second_degree(user_a, user_b),
+                             reference.is_second_degree_connection(user_a, user_b, plain))
+        self.assertEqual(graph.isolated_users(self.users), reference.isolated_users(self.users, plain))
+
+    def test_directed_view_matches_reference(self):
+        """Test that a directed view answers like the plain dict with every friend as a key"""
+        view = GraphView(self.connections, DIRECTED)
+        plain = closed(self.connections)
+        self.assertEqual(set(view), set(plain))
+        self.check_against(view, plain)
+        self.assertEqual(view.in_neighbors("loner"), {"user4"})
+        self.assertEqual(view.out_neighbors("loner"), set())
+
+    def test_undirected_view_matches_symmetric_reference(self):
+        """Test that an undirected view answers like the symmetrized plain dict"""
+        view = GraphView(self.connections, UNDIRECTED)
+        plain = symmetric(self.connections)
+        self.check_against(view, plain)
+        self.assertIs(view._incoming, view._adjacency)
+        self.assertEqual(view.in_neighbors("loner"), view.out_neighbors("loner"))
+
+    def test_view_neighbor_sets_are_read_only(self):
+        """Test that the view does not hand out its internal sets"""
+        view = GraphView(self.connections, UNDIRECTED)
+        self.assertIsInstance(view["user4"], frozenset)
+        view.out_neighbors("user4").add("unknown")
+        self.assertNotIn("unknown", view["user4"])
+
+    def test_upper_triangle_matches_symmetric_reference(self):
+        """Test the edge-once layout against the symmetrized plain dict"""
+        graph = UpperTriangularGraph.from_connections(self.connections)
+        plain = symmetric(self.connections)
+        self.check_against(graph, plain)
+        self.assertEqual(graph.num_edges, sum(map(len, plain.values())) // 2)
+        for user_a, user_b in self.pairs:
+            self.assertEqual(graph.mutual_neighbors(user_a, user_b),
+                             reference.mutual_connections(user_a, user_b, plain))
+            self.assertEqual(graph.exclusive_neighbors(user_a, user_b),
+                             reference.exclusive_connections(user_a, user_b, plain))
+        for uid in range(graph.num_users):
+            self.assertEqual(graph.degree(uid), len(plain[graph.interner.name_of(uid)]))
+
+    def test_reverse_index_built_on_first_neighborhood_query(self):
+        """Test that edge checks and isolated users leave the reverse index unbuilt"""
+        graph = UpperTriangularGraph.from_connections(self.connections)
+        upper_bytes = graph.nbytes()
+        graph.has_edge("user4", "loner")
+        graph.isolated_users(self.users)
+        self.assertIsNone(graph._lower)
+        self.assertEqual(graph["loner"], {"user4"})
+        self.assertIsNotNone(graph._lower)
+        self.assertGreater(graph.nbytes(), upper_bytes)
+        self.assertIs(graph.build_reverse_index(), graph._lower)
+
+    def test_unknown_users(self):
+        """Test the mode and user validation"""
+        with self.assertRaises(ValueError):
+            GraphView(self.connections, "mixed")
+        with self.assertRaises(ValueError):
+            GraphView(None)
+        view = GraphView(self.connections)
+        with self.assertRaises(ValueError):
+            view.has_edge("unknown", "user4")
+        graph = UpperTriangularGraph.from_connections(self.connections)
+        self.assertFalse(graph.has_edge("user4", "unknown"))
+        with self.assertRaises(ValueError):
+            graph.is_second_degree("unknown", "user4")
+
+if __name__ == '__main__':
+    unittest.main()
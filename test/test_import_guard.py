@@ -0,0 +1,27 @@
+import unittest
+import subprocess
+import sys
+from benchmarks.bench_import import HEAVY_MODULES, ROOT, loaded_heavy_modules
+
+class TestImportGuard(unittest.TestCase):
+    def test_skeleton_loads_no_heavy_modules(self):
+        """Test that importing skeleton loads none of the heavy back ends"""
+        self.assertEqual(loaded_heavy_modules("skeleton"), [])
+
+    def test_deferred_modules_load_on_use(self):
+        """Test that the back ends are still importable when a feature is first used"""
+        code = ("import sys, skeleton, parallel, streaming\n"
+                "parallel.configure('thread', max_workers=2, min_parallel_size=1)\n"
+                "assert parallel.parallel_intersection({1, 2, 3}, {2, 3, 4}) == {2, 3}\n"
+                "parallel.shutdown()\n"
+                "assert list(streaming.iter_sorted(['b', 'a\\\\n'], memory_budget=1)) == ['a\\\\n', 'b']\n"
+                "print(','.join(name for name in %r if name in sys.modules))" % (HEAVY_MODULES,))
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        loaded = completed.stdout.strip().split(",")
+        self.assertIn("concurrent.futures", loaded)
+        self.assertIn("tempfile", loaded)
+        self.assertIn("re", loaded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import random
+from benchmarks.synthetic import random_connections
+from kcore import CoreIndex, core_numbers, k_core
+from graph_core import CompactGraph
+from test import reference
+
+def naive_cores(connections):
+    """Core numbers by repeatedly peeling the lowest-degree user."""
+    adjacency = {}
+    for user, friends in connections.items():
+        adjacency.setdefault(user, set())
+        for friend in friends:
+            if friend != user:
+                adjacency[user].add(friend)
+                adjacency.setdefault(friend, set()).add(user)
+    cores = {}
+    k = 0
+    while adjacency:
+        user = min(adjacency, key=lambda name: len(adjacency[name]))
+        k = max(k, len(adjacency[user]))
+        cores[user] = k
+        for friend in adjacency.pop(user):
+            adjacency[friend].discard(user)
+    return cores
+
+class TestCoreNumbers(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph and a random graph"""
+        self.sample = reference.sample_connections()
+        self.random = random_connections(200, 8, seed=11)
+
+    def test_core_numbers_match_peeling(self):
+        """Test that the bucket algorithm matches naive peeling"""
+        for connections in (self.sample, self.random):
+            graph = CompactGraph.from_connections(connections, undirected=True)
+            cores = core_numbers(graph)
+            expected = naive_cores(connections)
+            self.assertEqual({name: cores[uid] for uid, name in enumerate(graph.interner.names)}, expected)
+
+    def test_k_core(self):
+        """Test that k_core returns the users with core number at least k"""
+        expected = naive_cores(self.sample)
+        self.assertEqual(k_core(self.sample, 2), {user for user, core in expected.items() if core >= 2})
+        with self.assertRaises(ValueError):
+            k_core(self.sample, -1)
+
+    def test_incremental_updates_match_recomputation(self):
+        """Test that CoreIndex stays equal to a full recomputation under edge updates"""
+        rng = random.Random(5)
+        connections = {user: set(friends) for user, friends in self.random.items()}
+        index = CoreIndex(connections)
+        users = sorted(connections)
+        for step in range(300):
+            user_a, user_b = rng.sample(users, 2)
+            if step % 2 and connections[user_a]:
+                user_b = rng.choice(sorted(connections[user_a]))
+                index.remove_edge(user_a, user_b)
+                connections[user_a].discard(user_b)
+                connections[user_b].discard(user_a)
+            else:
+                index.add_edge(user_a, user_b)
+                connections[user_a].add(user_b)
+                connections[user_b].add(user_a)
+            if step % 25 == 0:
+                expected = naive_cores(connections)
+                self.assertEqual({user: index.core_number(user) for user in users}, expected)
+
+    def test_unknown_user(self):
+        """Test that unknown users raise the usual error"""
+        with self.assertRaises(ValueError):
+            CoreIndex(self.sample).core_number("user99")
+
+if __name__ == '__main__':
+    unittest.main()
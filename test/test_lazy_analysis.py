@@ -0,0 +1,53 @@
+import unittest
+from benchmarks.synthetic import random_connections, random_groups
+from lazy_analysis import iter_all_connections, iter_bridge_users, iter_recommendations, iter_users_in_any_group
+from test import reference
+
+class TestLazyAnalysis(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph, a random graph and random groups"""
+        self.sample = reference.sample_connections()
+        self.random = random_connections(300, 6, seed=13)
+        # A hub connected to everyone exercises the deduplication
+        self.random["user1"] = set(self.random) - {"user1"}
+        self.groups = random_groups(sorted(self.random), 5, 80, seed=13)
+
+    def test_all_connections_match_reference(self):
+        """Test that the iterator yields the reference connections exactly once"""
+        for connections in (self.sample, self.random):
+            for user in sorted(connections)[:30]:
+                for depth in (1, 2, 3):
+                    results = list(iter_all_connections(user, connections, depth))
+                    self.assertEqual(len(results), len(set(results)))
+                    self.assertEqual(set(results), reference.all_connections(user, connections, depth))
+
+    def test_recommendations_match_reference(self):
+        """Test that recommendations match the reference and come without duplicates"""
+        for connections in (self.sample, self.random):
+            for user in sorted(connections)[:30]:
+                results = list(iter_recommendations(user, connections))
+                self.assertEqual(len(results), len(set(results)))
+                self.assertEqual(set(results), reference.recommendations(user, connections))
+
+    def test_paging(self):
+        """Test that limit and offset slice the same sequence"""
+        everything = list(iter_all_connections("user1", self.random, 2))
+        self.assertEqual(list(iter_all_connections("user1", self.random, 2, limit=10, offset=5)), everything[5:15])
+        with self.assertRaises(ValueError):
+            list(iter_all_connections("user1", self.random, 2, offset=-1))
+
+    def test_bridge_users_match_reference(self):
+        """Test that bridge users are yielded once with all their communities"""
+        results = list(iter_bridge_users(self.groups))
+        self.assertEqual(len(results), len({user for user, _ in results}))
+        self.assertEqual(dict(results), reference.bridge_users(self.groups))
+
+    def test_users_in_any_group(self):
+        """Test that the union iterator yields every user once"""
+        group_a, group_b = self.groups["group_0"], self.groups["group_1"]
+        results = list(iter_users_in_any_group(group_a, group_b))
+        self.assertEqual(len(results), len(set(results)))
+        self.assertEqual(set(results), group_a | group_b)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph
+from msbfs import batch_find_all_connections
+from test import reference
+
+class TestBatchFindAllConnections(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph and a random graph"""
+        self.sample = reference.sample_connections()
+        self.random = random_connections(300, 4, seed=33)
+
+    def test_matches_reference(self):
+        """Test every seed and depth against single-source traversal"""
+        for connections in (self.sample, self.random):
+            seeds = sorted(connections)[:80]
+            for depth in (1, 2, 3):
+                for word_bits in (1, 7, 64):
+                    result = batch_find_all_connections(seeds, connections, depth, word_bits=word_bits)
+                    self.assertEqual(set(result), set(seeds))
+                    for seed in seeds:
+                        self.assertEqual(result[seed], reference.all_connections(seed, connections, depth))
+
+    def test_counts_and_compact_graph(self):
+        """Test counts_only and CompactGraph input"""
+        graph = CompactGraph.from_connections(self.random)
+        seeds = ["user1", "user2", "user1"]
+        counts = batch_find_all_connections(seeds, graph, 2, counts_only=True)
+        self.assertEqual(counts, {seed: len(reference.all_connections(seed, self.random, 2))
+                                  for seed in ("user1", "user2")})
+
+    def test_invalid_input(self):
+        """Test unknown seeds and bad arguments"""
+        with self.assertRaises(ValueError):
+            batch_find_all_connections(["nobody"], self.sample)
+        with self.assertRaises(ValueError):
+            batch_find_all_connections(["user1"], self.sample, 0)
+        with self.assertRaises(ValueError):
+            batch_find_all_connections(["user1"], self.sample, word_bits=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import statistics
+import tempfile
+import skeleton
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph, SNAPSHOT_HEADER, save_snapshot
+from out_of_core import BufferPool, OutOfCoreGraph
+from test import reference
+
+def components(connections):
+    """Connected components of the plain dict, ignoring edge direction"""
+    undirected = {}
+    for user, friends in connections.items():
+        undirected.setdefault(user, set()).update(friends)
+        for friend in friends:
+            undirected.setdefault(friend, set()).add(user)
+    seen, found = set(), []
+    for user in undirected:
+        if user not in seen:
+            component = {user} | reference.all_connections(user, undirected, len(undirected))
+            seen |= component
+            found.append(component)
+    return found
+
+class TestOutOfCoreGraph(unittest.TestCase):
+    def setUp(self):
+        """Write a random directed graph with a few isolated users to a snapshot"""
+        self.directory = tempfile.mkdtemp(prefix="ooc-test-")
+        self.connections = random_connections(400, 2, seed=46)
+        for user in ("user1", "user2"):
+            self.connections[user] = set()
+            for friends in self.connections.values():
+                friends.discard(user)
+        self.path = os.path.join(self.directory, "graph.snap")
+        save_snapshot(CompactGraph.from_connections(self.connections), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_traversal_matches_reference(self):
+        """Test BFS through a tiny buffer pool against plain traversal"""
+        with OutOfCoreGraph(self.path, page_size=64, max_pages=2) as graph:
+            for user in sorted(self.connections)[:50]:
+                for depth in (1, 2, 4):
+                    self.assertEqual(skeleton.find_all_connections(user, graph, depth),
+                                     reference.all_connections(user, self.connections, depth))
+            self.assertGreater(graph.io_stats["reads"], graph.pool.max_pages)
+
+    def test_components_and_degrees_match_reference(self):
+        """Test the sequential scans against the plain dict"""
+        with OutOfCoreGraph(self.path, page_size=128, max_pages=3) as graph:
+            expected = components(self.connections)
+            self.assertEqual(sorted(map(sorted, graph.connected_components())), sorted(map(sorted, expected)))
+            degrees = [len(friends) for friends in self.connections.values()]
+            stats = graph.degree_stats()
+            self.assertEqual(stats["edges"], sum(degrees))
+            self.assertEqual((stats["min"], stats["max"]), (min(degrees), max(degrees)))
+            self.assertEqual(stats["median"], statistics.median_low(degrees))
+
+    def test_scans_stay_within_the_pool_budget(self):
+        """Test that scans read pieces of at most half the pool and each page about once"""
+        with OutOfCoreGraph(self.path, page_size=64, max_pages=2) as graph:
+            sizes = []
+            read = graph.pool.read
+
+            def recording_read(offset, size):
+                sizes.append(size)
+                return read(offset, size)
+
+            graph.pool.read = recording_read
+            before = graph.io_stats["reads"]
+            labels = graph.component_labels()
+            graph.degree_stats()
+            self.assertLessEqual(max(sizes), 64)
+            array_pages = 8 * (graph.num_users + 1 + graph.num_targets) // 64
+            self.assertLessEqual(graph.io_stats["reads"] - before, 2 * (array_pages + 2))
+            expected = components(self.connections)
+            self.assertEqual(len(set(labels)), len(expected))
+
+    def test_truncated_snapshot_raises(self):
+        """Test that reads past the end of the file raise instead of looping"""
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size // 2)
+        with self.assertRaises(ValueError):
+            OutOfCoreGraph(self.path, page_size=64)
+
+    def test_reads_past_end_raise(self):
+        """Test short reads inside one page and across pages"""
+        size = os.path.getsize(self.path)
+        pool = BufferPool(self.path, page_size=64, max_pages=2)
+        try:
+            self.assertEqual(len(pool.read(size - 10, 10)), 10)
+            with open(self.path, "rb") as f:
+                self.assertEqual(pool.read(0, SNAPSHOT_HEADER.size), f.read(SNAPSHOT_HEADER.size))
+            with self.assertRaises(ValueError):
+                pool.read(size - 10, 11)
+            with self.assertRaises(ValueError):
+                pool.read(size - 100, 300)
+            with self.assertRaises(ValueError):
+                pool.read(size + 1000, 8)
+        finally:
+            pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
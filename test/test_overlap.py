@@ -0,0 +1,67 @@
+import unittest
+import random
+from itertools import combinations
+from overlap import overlap_matrix, top_k_overlaps
+from test import reference
+
+class TestOverlapMatrix(unittest.TestCase):
+    def setUp(self):
+        """Build the sample groups and random overlapping groups"""
+        self.sample = reference.sample_groups()
+        rng = random.Random(31)
+        users = [f"user{i}" for i in range(300)]
+        self.random = {f"group{g}": set(rng.sample(users, rng.randint(0, 120))) for g in range(12)}
+
+    def test_pair_sizes_match_set_operations(self):
+        """Test every pair measure against plain set operations"""
+        for groups in (self.sample, self.random):
+            matrix = overlap_matrix(groups)
+            for a, b in combinations(groups, 2):
+                shared = len(groups[a] & groups[b])
+                union = len(groups[a] | groups[b])
+                self.assertEqual(matrix.intersection_size(a, b), shared)
+                self.assertEqual(matrix.intersection_size(b, a), shared)
+                self.assertEqual(matrix.union_size(a, b), union)
+                self.assertAlmostEqual(matrix.jaccard(a, b), shared / union if union else 0.0)
+            for name, members in groups.items():
+                self.assertEqual(matrix.value(name, name), len(members))
+
+    def test_dense_matrix(self):
+        """Test that the dense matrix is symmetric and ordered like the names"""
+        matrix = overlap_matrix(self.sample)
+        dense = matrix.dense("union")
+        names = matrix.names
+        for i, a in enumerate(names):
+            for j, b in enumerate(names):
+                self.assertEqual(dense[i][j], len(self.sample[a] | self.sample[b]))
+        with self.assertRaises(ValueError):
+            matrix.dense("overlap")
+
+    def test_top_k(self):
+        """Test that top-k pairs are the k largest overlaps"""
+        for measure in ("intersection", "jaccard"):
+            expected = []
+            for a, b in combinations(self.random, 2):
+                shared = len(self.random[a] & self.random[b])
+                if shared:
+                    value = shared if measure == "intersection" else shared / len(self.random[a] | self.random[b])
+                    expected.append(value)
+            expected.sort(reverse=True)
+            result = top_k_overlaps(self.random, 5, measure)
+            self.assertEqual([value for _, _, value in result], expected[:5])
+            for a, b, value in result:
+                self.assertTrue(self.random[a] & self.random[b])
+
+    def test_invalid_input(self):
+        """Test None groups and bad arguments"""
+        with self.assertRaises(ValueError):
+            overlap_matrix(None)
+        with self.assertRaises(ValueError):
+            overlap_matrix({"a": None})
+        with self.assertRaises(ValueError):
+            top_k_overlaps(self.sample, -1)
+        with self.assertRaises(ValueError):
+            top_k_overlaps(self.sample, 1, "union")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import random
+import parallel
+from benchmarks.synthetic import random_connections
+from test import reference
+
+class TestParallelOperations(unittest.TestCase):
+    def setUp(self):
+        """Build asymmetric connections and random groups"""
+        rng = random.Random(36)
+        self.connections = random_connections(400, 6, seed=36)
+        for _ in range(300):
+            self.connections[f"user{rng.randint(1, 400)}"].add(f"user{rng.randint(1, 400)}")
+        self.connections["user1"].add("user1")
+        self.users = set(rng.sample(sorted(self.connections), 250)) | {"user1"}
+        self.group_a = {f"user{rng.randrange(3000)}" for _ in range(1500)}
+        self.group_b = {f"user{rng.randrange(3000)}" for _ in range(1000)}
+        self.pairs = [(rng.choice(sorted(self.connections)), rng.choice(sorted(self.connections)))
+                      for _ in range(200)]
+
+    def tearDown(self):
+        parallel.configure()
+
+    def test_every_backend_matches_reference(self):
+        """Test every backend against plain set operations and the reference density"""
+        for backend in parallel.BACKENDS:
+            parallel.configure(backend, max_workers=2, min_parallel_size=1)
+            self.assertEqual(parallel.parallel_intersection(self.group_a, self.group_b), self.group_a & self.group_b)
+            self.assertEqual(parallel.parallel_union(self.group_a, self.group_b), self.group_a | self.group_b)
+            self.assertAlmostEqual(parallel.parallel_network_density(self.users, self.connections),
+                                   reference.network_density(self.users, self.connections))
+            self.assertEqual(parallel.batch_mutual_connections(self.pairs, self.connections),
+                             [reference.mutual_connections(a, b, self.connections) for a, b in self.pairs])
+
+    def test_density_matches_sample_graph(self):
+        """Test the sample graph and subsets whose users connect outside the subset"""
+        connections = reference.sample_connections()
+        for users in (set(connections), {"user5", "user8", "user9"}, {"user1"}):
+            self.assertAlmostEqual(parallel.parallel_network_density(users, connections),
+                                   reference.network_density(users, connections))
+        parallel.configure("thread", max_workers=3, min_parallel_size=1)
+        self.assertAlmostEqual(parallel.parallel_network_density(set(connections), connections),
+                               reference.network_density(set(connections), connections))
+
+    def test_configuration(self):
+        """Test thresholds and invalid settings"""
+        parallel.configure("thread", min_parallel_size=10)
+        self.assertFalse(parallel.should_parallelize(4, 5))
+        self.assertTrue(parallel.should_parallelize(5, 5))
+        with self.assertRaises(ValueError):
+            parallel.configure("gpu")
+        with self.assertRaises(ValueError):
+            parallel.configure(min_parallel_size=0)
+        with self.assertRaises(ValueError):
+            parallel.batch_mutual_connections([("user1", "nobody")], self.connections)
+
+if __name__ == '__main__':
+    unittest.main()
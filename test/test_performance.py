@@ -0,0 +1,234 @@
+import unittest
+import os
+import importlib
+import io
+import json
+import contextlib
+import statistics
+import time
+import tracemalloc
+from benchmarks.synthetic import random_connections, random_groups
+from test import reference
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "performance_baselines.json")
+RUN_ENV = "PERF_TESTS"
+UPDATE_ENV = "PERF_UPDATE_BASELINES"
+DEFAULT_RUNS = 15
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.25
+MAD_THRESHOLD = 3.0
+# Differences below this are timer and interpreter noise for sub-microsecond calls
+MIN_DIFFERENCE_US = 1.0
+TARGET_RUN_SECONDS = 0.01
+CALIBRATION_LOOPS = 20
+CALIBRATION = []
+# Baselines come from the plain-dict reference where there is one, so a
+# solution fails only if it is clearly slower than the straightforward version
+REFERENCE_FUNCTIONS = {
+    "find_mutual_connections": reference.mutual_connections,
+    "find_exclusive_connections": reference.exclusive_connections,
+    "find_all_connections": reference.all_connections,
+    "find_common_group_members": reference.common_group_members,
+    "find_users_in_any_group": reference.users_in_any_group,
+    "is_direct_connection": reference.is_direct_connection,
+    "is_second_degree_connection": reference.is_second_degree_connection,
+    "identify_bridge_users": reference.bridge_users,
+    "calculate_network_density": reference.network_density,
+    "find_isolated_users": reference.isolated_users,
+    "recommend_connections": reference.recommendations,
+    "format_users_for_display": reference.format_users_for_display,
+}
+
+def safely_import_module(module_name):
+    """Safely import a module, returning None if import fails."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+def check_function_exists(module, function_name):
+    """Check if a function exists in a module."""
+    return hasattr(module, function_name) and callable(getattr(module, function_name))
+
+def load_module_dynamically():
+    """Load the student's module for testing"""
+    module_obj = safely_import_module("skeleton")
+    if module_obj is None:
+        module_obj = safely_import_module("solution")
+    return module_obj
+
+def build_workloads():
+    """Build one fixed-seed call (function name, args) per analysis function."""
+    connections = random_connections(5_000, 20, seed=101)
+    users = sorted(connections)
+    groups = random_groups(users, 3, 2_000, seed=101)
+    group_a, group_b, group_c = (groups[name] for name in sorted(groups))
+    communities = {"tech": group_a, "gaming": group_b, "arts": group_c}
+    sample = set(users[:500])
+    return [
+        ("initialize_data", ()),
+        ("find_mutual_connections", ("user1", "user2", connections)),
+        ("find_exclusive_connections", ("user1", "user2", connections)),
+        ("find_all_connections", ("user1", connections, 2)),
+        ("find_common_group_members", (group_a, group_b)),
+        ("find_users_in_any_group", (group_a, group_b)),
+        ("is_direct_connection", ("user1", "user2", connections)),
+        ("is_second_degree_connection", ("user1", "user2", connections)),
+        ("identify_bridge_users", (communities,)),
+        ("calculate_network_density", (sample, connections)),
+        ("find_isolated_users", (set(users), connections)),
+        ("recommend_connections", ("user1", connections, 2)),
+        ("format_users_for_display", ("Tech Group", group_a)),
+        ("display_analysis_result", ("Union", group_a, group_b, group_a | group_b)),
+        ("display_data", ({"Network A": group_a, "Network B": group_b}, "networks")),
+    ]
+
+def calibrate_loops(func, args):
+    """Find a loop count that makes one timing run last about TARGET_RUN_SECONDS."""
+    loops = 1
+    while True:
+        elapsed = time_loops(func, args, loops)
+        if elapsed >= TARGET_RUN_SECONDS or loops >= 1_000_000:
+            return loops
+        loops *= 10 if elapsed < TARGET_RUN_SECONDS / 10 else 2
+
+def time_loops(func, args, loops):
+    """Time loops calls of func with stdout suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        return time.perf_counter() - start
+
+def measure_time(func, args, runs, loops):
+    """
+    Return the median and median absolute deviation of the per-call time in
+    microseconds, and the fastest run of the calibration workload timed
+    between the runs of func.
+    """
+    calibration_func, calibration_args = calibration_workload()
+    samples, calibration = [], []
+    for _ in range(runs):
+        calibration.append(1e6 * time_loops(calibration_func, calibration_args, CALIBRATION_LOOPS) / CALIBRATION_LOOPS)
+        samples.append(1e6 * time_loops(func, args, loops) / loops)
+    median = statistics.median(samples)
+    mad = statistics.median(abs(sample - median) for sample in samples)
+    # The fastest calibration run is the least disturbed estimate of the machine speed
+    return median, mad, min(calibration)
+
+def measure_peak_memory(func, args):
+    """Return the peak traced allocation of one call in KiB."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak / 1024
+
+def calibration_workload():
+    """Fixed pure-Python workload that measures the current speed of the machine."""
+    if not CALIBRATION:
+        connections = random_connections(2_000, 10, seed=7)
+        CALIBRATION.extend((reference.all_connections, (sorted(connections)[0], connections, 3)))
+    return CALIBRATION
+
+def is_time_regression(baseline, median, mad, tolerance, scale=1.0):
+    """
+    A slowdown counts only if the median exceeds the baseline, scaled to this
+    machine, by more than the relative tolerance and by more than the noise.
+    """
+    expected = scale * baseline["median_us"]
+    noise = max(MAD_THRESHOLD * max(scale * baseline["mad_us"], mad), MIN_DIFFERENCE_US)
+    return median > expected * (1 + tolerance) and median - expected > noise
+
+def load_baselines():
+    """Load the stored baselines, or an empty set if there are none yet."""
+    if not os.path.exists(BASELINE_FILE):
+        return {"runs": DEFAULT_RUNS, "time_tolerance": DEFAULT_TIME_TOLERANCE,
+                "memory_tolerance": DEFAULT_MEMORY_TOLERANCE, "functions": {}}
+    with open(BASELINE_FILE, "r") as f:
+        return json.load(f)
+
+def save_baselines(baselines):
+    """Write the baselines file."""
+    with open(BASELINE_FILE, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def record_baselines(module_obj):
+    """Measure every workload, preferring the reference version, and store the results."""
+    baselines = load_baselines()
+    functions = {}
+    for function_name, args in build_workloads():
+        func = REFERENCE_FUNCTIONS.get(function_name) or getattr(module_obj, function_name)
+        loops = calibrate_loops(func, args)
+        median, mad, calibration = measure_time(func, args, baselines["runs"], loops)
+        functions[function_name] = {
+            "calibration_us": round(calibration, 3),
+            "loops": loops,
+            "median_us": round(median, 3),
+            "mad_us": round(mad, 3),
+            "peak_kib": round(measure_peak_memory(func, args), 3),
+        }
+    # Calibration is stored per function; drop the old file-wide value
+    baselines.pop("calibration_us", None)
+    baselines["functions"] = functions
+    save_baselines(baselines)
+    return baselines
+
+@unittest.skipUnless(os.environ.get(RUN_ENV) == "1" or os.environ.get(UPDATE_ENV) == "1",
+                     f"set {RUN_ENV}=1 to run the performance tier")
+class TestPerformance(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the module and the baselines, or record new baselines once"""
+        cls.module_obj = load_module_dynamically()
+        if cls.module_obj is None:
+            raise unittest.SkipTest("No skeleton or solution module to measure")
+        if os.environ.get(UPDATE_ENV) == "1":
+            record_baselines(cls.module_obj)
+            raise unittest.SkipTest(f"Recorded new baselines in {BASELINE_FILE}")
+        cls.baselines = load_baselines()
+        if not cls.baselines["functions"]:
+            raise unittest.SkipTest(f"No baselines yet; set {UPDATE_ENV}=1 to record them")
+
+    def test_function_timings(self):
+        """Test that no analysis function is clearly slower than its stored baseline"""
+        regressions = []
+        for function_name, args in build_workloads():
+            baseline = self.baselines["functions"].get(function_name)
+            if baseline is None or not check_function_exists(self.module_obj, function_name):
+                regressions.append(function_name)
+                continue
+            func = getattr(self.module_obj, function_name)
+            median, mad, calibration = measure_time(func, args, self.baselines["runs"], baseline["loops"])
+            # Stored times are scaled by how fast the machine ran the calibration workload meanwhile
+            scale = calibration / baseline["calibration_us"]
+            expected = scale * baseline["median_us"]
+            print(f"{function_name}: median {median:.2f} us (MAD {mad:.2f}), "
+                  f"baseline {expected:.2f} us (MAD {scale * baseline['mad_us']:.2f}, scale {scale:.2f}), "
+                  f"{median / expected - 1 if expected else 0.0:+.1%}")
+            if is_time_regression(baseline, median, mad, self.baselines["time_tolerance"], scale):
+                regressions.append(function_name)
+        self.assertEqual(regressions, [], "Timing regressions")
+
+    def test_memory_usage(self):
+        """Test that no analysis function allocates clearly more than its stored baseline"""
+        regressions = []
+        tolerance = self.baselines["memory_tolerance"]
+        for function_name, args in build_workloads():
+            baseline = self.baselines["functions"].get(function_name)
+            if baseline is None or not check_function_exists(self.module_obj, function_name):
+                regressions.append(function_name)
+                continue
+            peak = measure_peak_memory(getattr(self.module_obj, function_name), args)
+            print(f"{function_name}: peak {peak:.1f} KiB, baseline {baseline['peak_kib']:.1f} KiB")
+            # Small absolute slack keeps near-zero baselines from failing on interpreter noise
+            if peak > baseline["peak_kib"] * (1 + tolerance) + 1:
+                regressions.append(function_name)
+        self.assertEqual(regressions, [], "Memory regressions")
+
+if __name__ == '__main__':
+    unittest.main()
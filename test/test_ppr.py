@@ -0,0 +1,81 @@
+import unittest
+from benchmarks.synthetic import random_connections
+from ppr import batch_ppr_recommendations, forward_push_scores, ppr_recommendations, random_walk_scores
+from test import reference
+
+def exact_ppr(user, connections, alpha=0.15, steps=200):
+    """Personalized PageRank by propagating all mass for a fixed number of steps."""
+    scores = {}
+    mass = {user: 1.0}
+    for _ in range(steps):
+        next_mass = {}
+        for member, value in mass.items():
+            neighbors = connections.get(member, ())
+            if not neighbors:
+                scores[member] = scores.get(member, 0.0) + value
+                continue
+            scores[member] = scores.get(member, 0.0) + alpha * value
+            share = (1 - alpha) * value / len(neighbors)
+            for neighbor in neighbors:
+                next_mass[neighbor] = next_mass.get(neighbor, 0.0) + share
+        mass = next_mass
+    return scores
+
+class TestPersonalizedPageRank(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph with a dangling user and a random graph"""
+        self.sample = reference.sample_connections()
+        self.sample["user10"] = set()
+        self.random = random_connections(200, 5, seed=42)
+
+    def assertScoresClose(self, scores, expected, tolerance):
+        for member in set(scores) | set(expected):
+            self.assertAlmostEqual(scores.get(member, 0.0), expected.get(member, 0.0), delta=tolerance, msg=member)
+
+    def test_forward_push_matches_exact(self):
+        """Test forward push against exact propagation"""
+        for connections in (self.sample, self.random):
+            for user in ("user1", "user8"):
+                scores = forward_push_scores(user, connections, epsilon=1e-7)
+                self.assertScoresClose(scores, exact_ppr(user, connections), 1e-3)
+
+    def test_random_walks_match_exact(self):
+        """Test seeded random walks against exact propagation"""
+        scores = random_walk_scores("user1", self.sample, num_walks=20000, seed=1)
+        self.assertScoresClose(scores, exact_ppr("user1", self.sample), 0.02)
+        self.assertEqual(scores, random_walk_scores("user1", self.sample, num_walks=20000, seed=1))
+
+    def test_recommendations_exclude_user_and_friends(self):
+        """Test that recommendations are ranked non-friends"""
+        for method in ("push", "walk"):
+            result = ppr_recommendations("user1", self.random, k=5, method=method)
+            self.assertLessEqual(len(result), 5)
+            users = [member for member, _ in result]
+            self.assertNotIn("user1", users)
+            self.assertFalse(set(users) & self.random["user1"])
+            self.assertEqual([score for _, score in result], sorted((score for _, score in result), reverse=True))
+        batch = batch_ppr_recommendations(["user1", "user2"], self.random, k=3)
+        self.assertEqual(batch["user1"], ppr_recommendations("user1", self.random, k=3))
+
+    def test_seed_is_accepted_by_every_method(self):
+        """Test that push ignores the seed and seeded walks repeat"""
+        self.assertEqual(ppr_recommendations("user1", self.random, k=5, seed=7),
+                         ppr_recommendations("user1", self.random, k=5))
+        walks = ppr_recommendations("user1", self.random, k=5, method="walk", seed=7, num_walks=500)
+        self.assertEqual(walks, ppr_recommendations("user1", self.random, k=5, method="walk", seed=7, num_walks=500))
+
+    def test_invalid_input(self):
+        """Test unknown users and bad arguments"""
+        with self.assertRaises(ValueError):
+            ppr_recommendations("nobody", self.sample)
+        with self.assertRaises(ValueError):
+            ppr_recommendations("user1", self.sample, method="exact")
+        with self.assertRaises(ValueError):
+            forward_push_scores("user1", self.sample, alpha=1.0)
+        with self.assertRaises(ValueError):
+            random_walk_scores("user1", self.sample, num_walks=0)
+        with self.assertRaises(ValueError):
+            batch_ppr_recommendations(["user1", "nobody"], self.sample)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from benchmarks.synthetic import random_connections
+from recommend_query import query_recommendations
+from test import reference
+
+def naive_query(user, connections, depth=2, within=None, exclude=(), min_mutual=0, predicate=None):
+    """Filter plain recommendations after traversing without the excluded users."""
+    if exclude:
+        connections = {name: friends - set(exclude) for name, friends in connections.items()
+                       if name not in exclude or name == user}
+    if min_mutual > 0:
+        depth = min(depth, 2)
+    candidates = reference.recommendations(user, connections, depth)
+    result = {}
+    for candidate in candidates:
+        if within is not None and candidate not in within:
+            continue
+        if predicate is not None and not predicate(candidate):
+            continue
+        mutual = len(connections[user] & connections.get(candidate, set())) if depth >= 2 else 0
+        if mutual >= min_mutual:
+            result[candidate] = mutual
+    return result
+
+class TestQueryRecommendations(unittest.TestCase):
+    def setUp(self):
+        """Build the sample graph and a random graph"""
+        self.sample = reference.sample_connections()
+        self.random = random_connections(300, 6, seed=35)
+
+    def test_plain_query_matches_reference(self):
+        """Test that an unconstrained query matches recommendations"""
+        for connections in (self.sample, self.random):
+            for user in sorted(connections)[:30]:
+                for depth in (1, 2, 3):
+                    result = query_recommendations(user, connections, depth)
+                    self.assertEqual(result.users, reference.recommendations(user, connections, depth))
+
+    def test_constraints_match_filtering(self):
+        """Test pushed-down constraints against filtering afterwards"""
+        within = {f"user{i}" for i in range(1, 300, 2)}
+        exclude = {f"user{i}" for i in range(5, 300, 7)}
+        predicate = lambda name: not name.endswith("3")
+        for user in ("user1", "user2", "user10"):
+            for kwargs in ({"within": within}, {"predicate": predicate}, {"min_mutual": 2},
+                           {"exclude": exclude, "depth": 3}, {"within": within, "min_mutual": 1, "depth": 3}):
+                result = query_recommendations(user, self.random, **kwargs)
+                expected = naive_query(user, self.random, **kwargs)
+                self.assertEqual(result.users, set(expected))
+                if kwargs.get("depth", 2) == 2 or "min_mutual" in kwargs:
+                    self.assertEqual(result.mutual_counts, expected)
+
+    def test_invalid_input(self):
+        """Test unknown users and bad arguments"""
+        with self.assertRaises(ValueError):
+            query_recommendations("nobody", self.sample)
+        with self.assertRaises(ValueError):
+            query_recommendations("user1", self.sample, 0)
+        with self.assertRaises(ValueError):
+            query_recommendations("user1", self.sample, min_mutual=-1)
+
+if __name__ == '__main__':
+    unittest.main()
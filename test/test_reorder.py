@@ -0,0 +1,50 @@
+import unittest
+import os
+import tempfile
+from benchmarks.synthetic import planted_partition_connections
+from graph_core import CompactGraph, load_snapshot, save_snapshot
+from reorder import ORDERINGS, edge_locality, order_to_permutation, rcm_order, reorder
+
+class TestReorder(unittest.TestCase):
+    def setUp(self):
+        """Build a graph whose planted communities are interleaved in ID order"""
+        self.connections, _ = planted_partition_connections(300, 6, 8, 1, seed=41)
+        self.connections["loner"] = set()
+        self.graph = CompactGraph.from_connections(self.connections)
+
+    def test_orderings_are_permutations(self):
+        """Test that every ordering lists each user ID exactly once"""
+        for method, ordering in ORDERINGS.items():
+            order = ordering(self.graph)
+            self.assertEqual(sorted(order), list(range(self.graph.num_users)), method)
+
+    def test_reordered_graph_keeps_connections(self):
+        """Test that names keep their own neighbors after relabeling"""
+        for method in ORDERINGS:
+            graph, permutation = reorder(self.connections, method)
+            self.assertEqual(dict(graph), self.connections, method)
+            for old, new in enumerate(permutation):
+                self.assertEqual(graph.interner.name_of(new), self.graph.interner.name_of(old))
+        with self.assertRaises(ValueError):
+            reorder(self.connections, "random")
+        with self.assertRaises(ValueError):
+            self.graph.relabel([0] * self.graph.num_users)
+
+    def test_rcm_improves_locality(self):
+        """Test that RCM lowers the mean ID gap of edges"""
+        graph = self.graph.relabel(order_to_permutation(rcm_order(self.graph)))
+        self.assertLess(edge_locality(graph), edge_locality(self.graph))
+
+    def test_snapshot_round_trip(self):
+        """Test that a reordered snapshot keeps the graph and its permutation"""
+        graph, permutation = reorder(self.connections, "degree")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "graph.snap")
+        save_snapshot(graph, path, permutation)
+        loaded, loaded_permutation = load_snapshot(path)
+        self.assertEqual(dict(loaded), self.connections)
+        self.assertEqual(list(loaded_permutation), permutation)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import random
+from set_algebra import Group, Intersect, QueryPlanner, Union, INTERSECT, SCAN, UNION
+from test import reference
+
+def evaluate(expr, groups):
+    """Evaluate an expression with plain set operators"""
+    if isinstance(expr, Group):
+        return set(groups[expr.name])
+    if isinstance(expr, Intersect):
+        return set.intersection(*(evaluate(operand, groups) for operand in expr.operands))
+    if isinstance(expr, Union):
+        return set.union(*(evaluate(operand, groups) for operand in expr.operands))
+    return evaluate(expr.left, groups) - evaluate(expr.right, groups)
+
+def random_expr(rng, names, depth):
+    """Build a random expression tree over the named groups"""
+    if depth == 0 or rng.random() < 0.3:
+        return Group(rng.choice(names))
+    left, right = random_expr(rng, names, depth - 1), random_expr(rng, names, depth - 1)
+    return rng.choice((left & right, left | right, left - right))
+
+class TestQueryPlanner(unittest.TestCase):
+    def setUp(self):
+        """Build random groups of very different sizes and the sample groups"""
+        rng = random.Random(50)
+        users = [f"user{i}" for i in range(2_000)]
+        self.groups = {f"g{size}": set(rng.sample(users, size)) for size in (5, 40, 300, 900, 1500)}
+        self.names = sorted(self.groups)
+
+    def test_random_expressions_match_plain_sets(self):
+        """Test probe, bitmap and auto evaluation against plain set operators"""
+        rng = random.Random(50)
+        planner = QueryPlanner(self.groups)
+        for step in range(300):
+            expr = random_expr(rng, self.names, 4)
+            expected = evaluate(expr, self.groups)
+            self.assertEqual(planner.evaluate(expr, "probe"), expected, repr(expr))
+            if step == 150:
+                planner.build_bitmaps()
+            self.assertEqual(planner.evaluate(expr), expected, repr(expr))
+            self.assertEqual(planner.evaluate(expr, "bitmap"), expected, repr(expr))
+
+    def test_sample_groups_match_reference(self):
+        """Test the sample groups against the reference group operations"""
+        groups = reference.sample_groups()
+        planner = QueryPlanner(groups)
+        tech, gaming = Group("tech_group"), Group("gaming_group")
+        self.assertEqual(planner.evaluate(tech & gaming),
+                         reference.common_group_members(groups["tech_group"], groups["gaming_group"]))
+        self.assertEqual(planner.evaluate(tech | gaming, "bitmap"),
+                         reference.users_in_any_group(groups["tech_group"], groups["gaming_group"]))
+        self.assertEqual(planner.universe_size, len(set().union(*groups.values())))
+
+    def test_results_do_not_alias_groups(self):
+        """Test that a scan returns a copy the caller may change"""
+        planner = QueryPlanner(self.groups)
+        result = planner.evaluate(Group("g5"), "probe")
+        result.add("intruder")
+        self.assertNotIn("intruder", self.groups["g5"])
+
+    def test_plan_shape(self):
+        """Test smallest-first intersections and differences pushed into excludes"""
+        planner = QueryPlanner(self.groups)
+        a, b, c, d = (Group(name) for name in ("g1500", "g5", "g300", "g40"))
+        node = planner.plan(a & b & c)
+        self.assertEqual(node.op, INTERSECT)
+        self.assertEqual([child.group for child in node.children], ["g5", "g300", "g1500"])
+
+        node = planner.plan((a | c) - (b | d))
+        self.assertEqual(node.op, UNION)
+        for child in node.children:
+            self.assertEqual(child.op, INTERSECT)
+            self.assertEqual(len(child.children), 1)
+            self.assertEqual({exclude.group for exclude in child.excludes}, {"g5", "g40"})
+            self.assertEqual(child.children[0].op, SCAN)
+
+        lines = planner.explain(a & b).splitlines()
+        self.assertIn("probe", lines[0])
+        self.assertEqual(lines[2].strip(), "Drive Scan g5  rows=5")
+
+    def test_invalid_input(self):
+        """Test the validation of groups, expressions and methods"""
+        with self.assertRaises(ValueError):
+            QueryPlanner(None)
+        planner = QueryPlanner(self.groups)
+        with self.assertRaises(ValueError):
+            planner.evaluate(Group("missing"))
+        with self.assertRaises(ValueError):
+            planner.evaluate(Group("g5"), "hash")
+        with self.assertRaises(ValueError):
+            Intersect(Group("g5"))
+        with self.assertRaises(ValueError):
+            Union(Group("g5"))
+
+if __name__ == '__main__':
+    unittest.main()
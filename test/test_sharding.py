@@ -0,0 +1,62 @@
+import unittest
+from benchmarks.synthetic import random_connections
+from sharding import ShardedGraph, edge_cut, hash_shard, partition
+from test import reference
+
+class TestShardedGraph(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start one sharded graph for all tests"""
+        cls.connections = random_connections(200, 5, seed=17)
+        cls.connections["loner"] = set()
+        cls.graph = ShardedGraph(iter(cls.connections.items()), num_shards=3, start_method="spawn", load_batch=16)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.graph.close()
+
+    def test_rows_land_on_hash_shards(self):
+        """Test that every shard holds exactly the users routed to it"""
+        expected = [0, 0, 0]
+        for user in self.connections:
+            expected[hash_shard(user, 3)] += 1
+        self.assertEqual(self.graph.shard_sizes, expected)
+        self.assertFalse(hasattr(self.graph, "assignment"))
+
+    def test_queries_match_reference(self):
+        """Test that routed queries match the plain-dict reference"""
+        users = sorted(self.connections)[:25]
+        for user_a in users:
+            for depth in (1, 2, 3):
+                self.assertEqual(self.graph.find_all_connections(user_a, depth),
+                                 reference.all_connections(user_a, self.connections, depth))
+            for user_b in users:
+                self.assertEqual(self.graph.is_direct_connection(user_a, user_b),
+                                 reference.is_direct_connection(user_a, user_b, self.connections))
+                self.assertEqual(self.graph.find_mutual_connections(user_a, user_b),
+                                 reference.mutual_connections(user_a, user_b, self.connections))
+
+    def test_unknown_user_in_single_round_trip(self):
+        """Test that unknown users are reported by the query reply itself"""
+        self.graph.reset_stats()
+        with self.assertRaises(ValueError):
+            self.graph.is_direct_connection("nobody", "user1")
+        self.assertEqual(self.graph.stats["requests"], 1)
+        with self.assertRaises(ValueError):
+            self.graph.find_all_connections("nobody", 2)
+        with self.assertRaises(ValueError):
+            self.graph.find_mutual_connections("user1", "nobody")
+        self.assertEqual(self.graph.find_all_connections("loner"), set())
+
+class TestPartitioning(unittest.TestCase):
+    def test_ldg_cuts_fewer_edges_than_hash(self):
+        """Test that streaming LDG placement beats hashing on edge cut"""
+        connections = reference.sample_connections()
+        hash_cut, total = edge_cut(connections, partition(connections, 2, "hash"))
+        ldg_cut, _ = edge_cut(connections, partition(connections, 2, "ldg"))
+        self.assertLessEqual(ldg_cut, hash_cut)
+        with self.assertRaises(ValueError):
+            partition(connections, 2, "unknown")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import random
+from benchmarks.synthetic import random_connections
+from graph_core import CompactGraph
+from sorted_kernels import (gallop, intersect_gallop, intersect_merge, intersect_sorted,
+                            symmetric_difference_gallop, symmetric_difference_merge,
+                            symmetric_difference_sorted)
+from test import reference
+
+class TestSortedKernels(unittest.TestCase):
+    def setUp(self):
+        """Build sorted ID arrays with size ratios from 1 to 1000"""
+        rng = random.Random(39)
+        self.cases = [([], []), ([], [1, 2]), ([5], [5])]
+        for small, large in ((50, 50), (10, 200), (3, 3000), (1, 1000)):
+            universe = range(4 * large)
+            self.cases.append((sorted(rng.sample(universe, small)), sorted(rng.sample(universe, large))))
+
+    def test_kernels_match_set_operations(self):
+        """Test every kernel against set & and ^"""
+        for a, b in self.cases:
+            expected_and = sorted(set(a) & set(b))
+            expected_xor = sorted(set(a) ^ set(b))
+            self.assertEqual(list(intersect_merge(a, b)), expected_and)
+            self.assertEqual(list(intersect_sorted(a, b)), expected_and)
+            self.assertEqual(list(intersect_sorted(b, a)), expected_and)
+            self.assertEqual(list(symmetric_difference_merge(a, b)), expected_xor)
+            self.assertEqual(list(symmetric_difference_sorted(a, b)), expected_xor)
+            self.assertEqual(list(symmetric_difference_sorted(b, a)), expected_xor)
+            small, large = (a, b) if len(a) <= len(b) else (b, a)
+            self.assertEqual(list(intersect_gallop(small, large)), expected_and)
+            self.assertEqual(list(symmetric_difference_gallop(small, large)), expected_xor)
+
+    def test_gallop_finds_insertion_point(self):
+        """Test that gallop returns the first position not below the target"""
+        values = [1, 3, 3, 7, 9, 12]
+        for target in range(14):
+            expected = next((i for i, value in enumerate(values) if value >= target), len(values))
+            self.assertEqual(gallop(values, target, 0, len(values)), expected)
+
+    def test_compact_graph_neighbors_match_reference(self):
+        """Test CompactGraph mutual and exclusive neighbors against plain sets"""
+        connections = random_connections(300, 8, seed=39)
+        graph = CompactGraph.from_connections(connections)
+        names = sorted(connections)[:40]
+        for user_a in names:
+            for user_b in names[:10]:
+                self.assertEqual(graph.mutual_neighbors(user_a, user_b),
+                                 reference.mutual_connections(user_a, user_b, connections))
+                self.assertEqual(graph.exclusive_neighbors(user_a, user_b),
+                                 reference.exclusive_connections(user_a, user_b, connections))
+
+if __name__ == '__main__':
+    unittest.main()
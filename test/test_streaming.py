@@ -0,0 +1,67 @@
+import unittest
+import io
+import contextlib
+import skeleton
+from streaming import iter_sorted, stream_display_data, write_users_for_display
+from test import reference
+
+def in_memory_display(data, data_type):
+    """Build the display output with plain in-memory formatting."""
+    headers = {"networks": "Networks", "connections": "Connections", "bridge_users": "Bridge Users"}
+    lines = ["", f"{headers[data_type]}:"]
+    keys = data if data_type == "networks" else sorted(data)
+    for key in keys:
+        line = reference.format_users_for_display(key, data[key])
+        if data_type == "connections":
+            line = line.replace(": ", " → ", 1)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        """Load the sample data"""
+        self.connections = reference.sample_connections()
+        self.groups = reference.sample_groups()
+
+    def test_iter_sorted_matches_sorted(self):
+        """Test that the external merge returns the same order as sorted()"""
+        names = {"a\rb", "a", "ab", "c", "a b", "a\tb", "a\nb", "a\\nb", "\\", "", "é", "user10", "user2"}
+        self.assertEqual(list(iter_sorted(names, memory_budget=2)), sorted(names))
+        self.assertEqual(list(iter_sorted(names, memory_budget=100)), sorted(names))
+        many = {f"user{i}" for i in range(1000)}
+        self.assertEqual(list(iter_sorted(many, memory_budget=64)), sorted(many))
+
+    def test_stream_matches_in_memory_output(self):
+        """Test that streamed output is byte for byte the in-memory output"""
+        bridges = reference.bridge_users(self.groups)
+        for data, data_type in ((self.groups, "networks"), (self.connections, "connections"),
+                                (bridges, "bridge_users")):
+            for budget in (1, 3, 1000):
+                out = io.StringIO()
+                stream_display_data(data, data_type, out, chunk_size=2, memory_budget=budget)
+                self.assertEqual(out.getvalue(), in_memory_display(data, data_type))
+
+    def test_write_users_matches_format(self):
+        """Test that a streamed line equals format_users_for_display"""
+        for users in (set(), {"user1"}, self.groups["tech_group"]):
+            out = io.StringIO()
+            write_users_for_display("Tech Group", users, out, chunk_size=2, memory_budget=2)
+            self.assertEqual(out.getvalue(), reference.format_users_for_display("Tech Group", users) + "\n")
+
+    def test_display_data_none(self):
+        """Test that display_data keeps its None handling for streamed types"""
+        for data_type in ("networks", "connections", "bridge_users"):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                skeleton.display_data(None, data_type)
+            self.assertEqual(out.getvalue(), "No data to display.\n")
+
+    def test_display_data_streams(self):
+        """Test that display_data streams networks to stdout"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            skeleton.display_data(self.groups, "networks")
+        self.assertEqual(out.getvalue(), in_memory_display(self.groups, "networks"))
+
+if __name__ == '__main__':
+    unittest.main()
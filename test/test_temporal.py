@@ -0,0 +1,145 @@
+import unittest
+import random
+from temporal import TemporalGraph, SlidingWindow, decay_weight
+from test import reference
+
+def windowed(events, users, start, end):
+    """Plain connections dict of the events in start < t <= end"""
+    connections = {user: set() for user in users}
+    for timestamp, user_a, user_b in events:
+        if (start is None or timestamp > start) and (end is None or timestamp <= end):
+            connections[user_a].add(user_b)
+    return connections
+
+class TestTemporalGraph(unittest.TestCase):
+    def setUp(self):
+        """Stream random events, some of them out of order, into a temporal graph"""
+        rng = random.Random(48)
+        self.users = [f"user{i}" for i in range(1, 41)]
+        self.events = []
+        self.graph = TemporalGraph()
+        clock = 0.0
+        for _ in range(1500):
+            clock += rng.expovariate(1.0)
+            timestamp = clock - rng.random() * 5 if rng.random() < 0.2 else clock
+            user_a, user_b = rng.sample(self.users, 2)
+            self.events.append((timestamp, user_a, user_b))
+            self.graph.add_edge(user_a, user_b, timestamp)
+        self.end = clock
+
+    def latest(self):
+        times = {}
+        for timestamp, user_a, user_b in self.events:
+            key = (user_a, user_b)
+            times[key] = max(times.get(key, timestamp), timestamp)
+        return times
+
+    def test_rows_stay_time_sorted(self):
+        """Test that out-of-order events are inserted at their place in the row"""
+        for user in self.graph:
+            times = list(self.graph._times[user])
+            self.assertEqual(times, sorted(times))
+        self.assertEqual(dict(self.graph), windowed(self.events, self.users, None, None))
+
+    def test_window_views_match_reference(self):
+        """Test window views and analyses over them against the filtered plain dict"""
+        for start, end in ((None, 400.0), (300.0, 900.0), (self.end - 30, self.end), (500.0, 500.0)):
+            view = self.graph.window(start, end)
+            plain = windowed(self.events, self.users, start, end)
+            self.assertEqual(dict(view), plain)
+            for user_a, user_b in zip(self.users, self.users[1:]):
+                self.assertEqual(view[user_a] & view[user_b], reference.mutual_connections(user_a, user_b, plain))
+                self.assertEqual(reference.recommendations(user_a, view), reference.recommendations(user_a, plain))
+        self.assertEqual(dict(self.graph.last(30, now=self.end)), windowed(self.events, self.users, self.end - 30, self.end))
+
+    def test_sliding_window_matches_recomputed_window(self):
+        """Test incremental advancement against recomputing the window from scratch"""
+        graph = TemporalGraph()
+        window = SlidingWindow(graph, width=25.0, now=0.0)
+        arrived = []
+        position = 0
+        now = 0.0
+        while position < len(self.events):
+            now += 7.0
+            # Events arrive once the clock has passed them, late ones in a later batch
+            while position < len(self.events) and self.events[position][0] <= now:
+                timestamp, user_a, user_b = self.events[position]
+                graph.add_edge(user_a, user_b, timestamp)
+                arrived.append(self.events[position])
+                position += 1
+            window.advance(now)
+            expected = windowed(arrived, {user for user in graph}, now - 25.0, now)
+            self.assertEqual({user: set(window[user]) for user in graph}, expected)
+        with self.assertRaises(ValueError):
+            window.advance(now - 1)
+
+    def test_sliding_window_holds_only_live_events(self):
+        """Test a window opened on a filled graph, its bounded state and read-only rows"""
+        now = self.end / 2
+        window = SlidingWindow(self.graph, width=40.0, now=now)
+        self.assertEqual({user: set(window[user]) for user in self.graph},
+                         windowed(self.events, self.users, now - 40.0, now))
+        self.assertEqual(len(window._pending) + len(window._expiry),
+                         sum(1 for timestamp, _, _ in self.events if timestamp > now - 40.0))
+        window.advance(self.end)
+        self.assertEqual(len(window._pending) + len(window._expiry),
+                         sum(1 for timestamp, _, _ in self.events if timestamp > self.end - 40.0))
+        user = next(user for user in self.users if window[user])
+        self.assertIsInstance(window[user], frozenset)
+
+    def test_graph_keeps_no_log_for_closed_windows(self):
+        """Test that events reach live windows only and dropped windows unsubscribe"""
+        window = SlidingWindow(self.graph, width=10.0, now=self.end)
+        self.graph.add_edge("user1", "user2", self.end + 1)
+        self.assertEqual(len(window._arrivals), 1)
+        del window
+        self.assertEqual(len(self.graph._windows), 0)
+        self.graph.add_edge("user1", "user3", self.end + 2)
+        self.assertFalse(hasattr(self.graph, "_log"))
+
+    def test_decayed_scores_match_brute_force(self):
+        """Test decay-weighted mutual scores and recommendations against the latest event times"""
+        latest = self.latest()
+        half_life = 50.0
+        now = self.end
+        plain = windowed(self.events, self.users, None, None)
+
+        def weight(user_a, user_b):
+            return decay_weight(now - latest[(user_a, user_b)], half_life)
+
+        for user_a, user_b in zip(self.users, self.users[3:]):
+            expected = sum(weight(user_a, friend) * weight(user_b, friend)
+                           for friend in reference.mutual_connections(user_a, user_b, plain))
+            self.assertAlmostEqual(self.graph.decayed_mutual_score(user_a, user_b, now, half_life), expected)
+
+        user = self.users[0]
+        scores = {}
+        for friend in plain[user]:
+            for candidate in plain[friend]:
+                if candidate != user and candidate not in plain[user]:
+                    scores[candidate] = scores.get(candidate, 0.0) + weight(user, friend) * weight(friend, candidate)
+        self.assertEqual(set(scores), reference.recommendations(user, plain))
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:5]
+        result = self.graph.decayed_recommendations(user, now, half_life, k=5)
+        self.assertEqual([name for name, _ in result], [name for name, _ in ranked])
+        for (_, score), (_, expected) in zip(result, ranked):
+            self.assertAlmostEqual(score, expected)
+
+    def test_invalid_arguments(self):
+        """Test the validation of users, windows and decay parameters"""
+        with self.assertRaises(ValueError):
+            self.graph.window(10.0, 5.0)
+        with self.assertRaises(ValueError):
+            self.graph.last(-1)
+        with self.assertRaises(ValueError):
+            self.graph.row_in_window("unknown", None, None)
+        with self.assertRaises(ValueError):
+            self.graph.decayed_mutual_score("user1", "unknown", 0.0, 10.0)
+        with self.assertRaises(ValueError):
+            self.graph.decayed_recommendations("user1", 0.0, 0.0)
+        with self.assertRaises(ValueError):
+            SlidingWindow(self.graph, 0)
+        self.assertIsNone(self.graph.connection_time("user1", "unknown"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import random
+from benchmarks.synthetic import random_connections
+from two_hop_index import TwoHopIndex
+from test import reference
+
+class TestTwoHopIndex(unittest.TestCase):
+    def setUp(self):
+        """Build a random graph and a plain copy of it"""
+        self.connections = random_connections(150, 5, seed=43)
+        self.plain = {user: set(friends) for user, friends in self.connections.items()}
+
+    def check_invariants(self, index):
+        for user in index.indexed_users:
+            self.assertEqual(index._paths[user], index._build(user))
+        path_entries = sum(len(paths) for paths in index._paths.values())
+        self.assertEqual(index.entries, path_entries + len(index._frequency))
+        self.assertLessEqual(index.entries, index.max_entries)
+        self.assertLessEqual(len(index._frequency), index.max_counters)
+
+    def test_queries_match_reference_under_updates(self):
+        """Test answers and stored paths against plain traversal while edges change"""
+        rng = random.Random(43)
+        users = sorted(self.plain)
+        index = TwoHopIndex(self.connections, max_entries=400, admit_after=2)
+        for step in range(1500):
+            user = users[min(int(rng.expovariate(0.05)), len(users) - 1)]
+            other = rng.choice(users)
+            if step % 5 == 0:
+                if other in self.plain[user] and rng.random() < 0.5:
+                    index.remove_edge(user, other)
+                    self.plain[user].discard(other)
+                else:
+                    index.add_edge(user, other)
+                    self.plain[user].add(other)
+            self.assertEqual(index.recommendations(user), reference.recommendations(user, self.plain))
+            self.assertEqual(index.is_second_degree(user, other),
+                             reference.is_second_degree_connection(user, other, self.plain))
+        self.assertGreater(index.stats["hits"], 0)
+        self.assertGreater(index.stats["evicted"], 0)
+        self.assertGreater(index.stats["aged"], 0)
+        self.check_invariants(index)
+
+    def test_eviction_removes_least_queried(self):
+        """Test that room is made by evicting the least frequently queried user"""
+        index = TwoHopIndex(self.connections, max_entries=10 ** 6, admit_after=1)
+        for user, queries in (("user1", 5), ("user2", 1), ("user3", 3)):
+            for _ in range(queries):
+                index.recommendations(user)
+        index.max_entries = index.entries + len(index._build("user4")) - 1
+        index.index_users(["user4"])
+        self.assertEqual(index.indexed_users, {"user1", "user3", "user4"})
+        self.check_invariants(index)
+
+    def test_index_users_outrank_queries(self):
+        """Test that explicitly indexed users get the highest frequency"""
+        index = TwoHopIndex(self.connections, admit_after=100)
+        for _ in range(7):
+            index.recommendations("user1")
+        self.assertEqual(index.index_users(["user2", "user3"]), 2)
+        self.assertEqual(index._frequency["user2"], 8)
+        self.assertEqual(index._frequency["user3"], 9)
+        with self.assertRaises(ValueError):
+            index.index_users(["nobody"])
+
+if __name__ == '__main__':
+    unittest.main()
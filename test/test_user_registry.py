@@ -0,0 +1,80 @@
+import unittest
+import random
+from datetime import date
+from user_registry import UserRegistry
+
+class TestUserRegistry(unittest.TestCase):
+    def setUp(self):
+        """Create a registry and the same records as plain dicts"""
+        rng = random.Random(34)
+        first_day = date(2020, 1, 1).toordinal()
+        self.records = {}
+        for i in range(500):
+            self.records[f"user{i}"] = {
+                "join_date": date.fromordinal(first_day + rng.randrange(1000)) if rng.random() < 0.9 else None,
+                "region": rng.choice(["eu", "us", "apac", None]),
+                "activity_score": round(rng.random(), 3),
+            }
+        self.registry = UserRegistry.from_records(self.records)
+
+    def naive_filter(self, users=None, region=None, min_activity=None, joined_after=None):
+        result = set()
+        for name, record in self.records.items():
+            if users is not None and name not in users:
+                continue
+            if region is not None and record["region"] not in ({region} if isinstance(region, str) else region):
+                continue
+            if min_activity is not None and record["activity_score"] < min_activity:
+                continue
+            if joined_after is not None and (record["join_date"] is None or record["join_date"] < joined_after):
+                continue
+            result.add(name)
+        return result
+
+    def test_records_round_trip(self):
+        """Test that record views return the stored attributes"""
+        for name, attributes in self.records.items():
+            record = self.registry[name]
+            self.assertEqual(record.name, name)
+            self.assertEqual(record.join_date, attributes["join_date"])
+            self.assertEqual(record.region, attributes["region"])
+            self.assertEqual(record.activity_score, attributes["activity_score"])
+        self.assertEqual(len(self.registry), len(self.records))
+
+    def test_filter_matches_naive_scan(self):
+        """Test column filters against a scan over the record dicts"""
+        group = {f"user{i}" for i in range(0, 500, 3)} | {"unknown"}
+        cases = [
+            {"region": "eu"},
+            {"region": {"us", "apac"}, "min_activity": 0.5},
+            {"users": group, "joined_after": date(2021, 6, 1)},
+            {"users": group, "region": "us", "min_activity": 0.2, "joined_after": date(2020, 3, 1)},
+        ]
+        for conditions in cases:
+            self.assertEqual(self.registry.filter(**conditions), self.naive_filter(**conditions))
+
+    def test_updates_through_views(self):
+        """Test that setters write through to the columns"""
+        record = self.registry["user1"]
+        record.region = "mars"
+        record.activity_score = 2.0
+        record.join_date = None
+        self.assertEqual(self.registry.filter(region="mars"), {"user1"})
+        self.assertEqual(self.registry.filter(min_activity=1.5), {"user1"})
+        self.assertNotIn("user1", self.registry.filter(joined_after=date(1, 1, 1)))
+        self.assertIn("user1", self.registry)
+        self.assertNotIn("nobody", self.registry)
+
+    def test_region_codes_widen_past_two_bytes(self):
+        """Test more regions than a two-byte code can hold"""
+        record = self.registry["user1"]
+        for index in range(70_000):
+            record.region = f"region{index}"
+        self.assertEqual(record.region, "region69999")
+        self.assertEqual(self.registry.filter(region="region69999"), {"user1"})
+        for name, attributes in self.records.items():
+            if name != "user1":
+                self.assertEqual(self.registry[name].region, attributes["region"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import random
+from versioned_graph import PersistentMap, PersistentSet, VersionedGraph
+from test import reference
+
+class Colliding:
+    """Key whose hash is shared by every instance."""
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.name == self.name
+
+class TestHashTrie(unittest.TestCase):
+    def test_map_matches_dict(self):
+        """Test random sets and deletes against a dict, keeping old versions intact"""
+        rng = random.Random(32)
+        current, expected = PersistentMap(), {}
+        history = []
+        for step in range(3000):
+            key = rng.randrange(500)
+            if key in expected and rng.random() < 0.4:
+                current = current.delete(key)
+                del expected[key]
+            else:
+                current = current.set(key, step)
+                expected[key] = step
+            if step % 500 == 0:
+                history.append((current, dict(expected)))
+        self.assertEqual(dict(current.items()), expected)
+        self.assertEqual(len(current), len(expected))
+        for version, snapshot in history:
+            self.assertEqual(dict(version.items()), snapshot)
+        with self.assertRaises(KeyError):
+            current.delete(-1)
+
+    def test_set_matches_set(self):
+        """Test bulk build, add and discard against a plain set"""
+        rng = random.Random(7)
+        members = {f"user{rng.randrange(10000)}" for _ in range(2000)}
+        persistent = PersistentSet.from_iterable(members)
+        original = persistent
+        plain = set(members)
+        for _ in range(2000):
+            member = f"user{rng.randrange(10000)}"
+            if rng.random() < 0.5:
+                persistent, plain = persistent.add(member), plain | {member}
+            else:
+                persistent, plain = persistent.discard(member), plain - {member}
+        self.assertEqual(set(persistent), plain)
+        self.assertEqual(len(persistent), len(plain))
+        self.assertEqual(set(original), members)
+        self.assertEqual(persistent & {"user1", "user2"}, plain & {"user1", "user2"})
+        self.assertEqual(len(PersistentSet.from_iterable(["a"])), 1)
+        self.assertIn("a", PersistentSet.from_iterable(["a"]))
+
+    def test_hash_collisions(self):
+        """Test keys with identical hashes"""
+        keys = [Colliding(name) for name in "abcd"]
+        persistent = PersistentSet.from_iterable(keys[:3]).add(keys[3])
+        self.assertEqual(len(persistent), 4)
+        self.assertTrue(all(key in persistent for key in keys))
+        persistent = persistent.discard(keys[0]).discard(keys[1]).discard(keys[2])
+        self.assertEqual(list(persistent), [keys[3]])
+        mapping = PersistentMap().set(keys[0], 1).set(keys[1], 2).delete(keys[0])
+        self.assertEqual(dict(mapping.items()), {keys[1]: 2})
+
+class TestVersionedGraph(unittest.TestCase):
+    def setUp(self):
+        """Create a versioned graph from the sample data"""
+        self.connections = reference.sample_connections()
+        self.graph = VersionedGraph(self.connections, reference.sample_groups(), timestamp=0)
+
+    def test_snapshots_are_immutable(self):
+        """Test that edits after a commit do not change earlier versions"""
+        self.graph.add_edge("user9", "user1")
+        self.graph.remove_edge("user1", "user2")
+        self.graph.add_member("tech_group", "user9")
+        self.graph.commit(10)
+        old, new = self.graph.as_of(5), self.graph.as_of(10)
+        self.assertEqual(dict(old), self.connections)
+        self.assertEqual(new["user9"], {"user8", "user1"})
+        self.assertEqual(new["user1"], {"user3", "user5"})
+        self.assertNotIn("user9", old.group("tech_group"))
+        self.assertIn("user9", new.communities["tech_group"])
+
+    def test_snapshot_rows_are_shared_frozensets(self):
+        """Test that lookups return one read-only set per unchanged row"""
+        old = self.graph.snapshot()
+        self.graph.add_edge("user9", "user1")
+        self.graph.commit(10)
+        new = self.graph.snapshot()
+        self.assertIsInstance(old["user1"], frozenset)
+        self.assertIs(old["user1"], old["user1"])
+        self.assertIs(new["user1"], old["user1"])
+        self.assertIsNot(new["user9"], old["user9"])
+        self.assertIs(new.group("tech_group"), old.group("tech_group"))
+        self.assertEqual(old.group("missing"), frozenset())
+
+    def test_snapshot_works_as_connections(self):
+        """Test that analysis on a snapshot matches the plain dict"""
+        snapshot = self.graph.snapshot()
+        self.assertEqual(reference.all_connections("user1", snapshot, 3),
+                         reference.all_connections("user1", self.connections, 3))
+        self.assertEqual(reference.bridge_users(snapshot.communities),
+                         reference.bridge_users(reference.sample_groups()))
+
+    def test_invalid_operations(self):
+        """Test missing edges, members and versions"""
+        with self.assertRaises(ValueError):
+            self.graph.remove_edge("user1", "user9")
+        with self.assertRaises(ValueError):
+            self.graph.remove_member("tech_group", "user2")
+        with self.assertRaises(ValueError):
+            self.graph.snapshot(5)
+        with self.assertRaises(ValueError):
+            self.graph.as_of(-1)
+        with self.assertRaises(ValueError):
+            self.graph.commit(-1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import os
+import random
+import shutil
+import tempfile
+import time
+from wal import ADD_EDGE, DurableGraph, WriteAheadLog, read_checkpoint, read_records, recover, write_checkpoint
+from test import reference
+
+class TestDurableGraph(unittest.TestCase):
+    def setUp(self):
+        """Create an empty log directory"""
+        self.directory = tempfile.mkdtemp(prefix="wal-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def last_segment(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(".log"))
+        return os.path.join(self.directory, names[-1])
+
+    def mutate(self, graph, expected, rng, count):
+        users = [f"user{i}" for i in range(30)]
+        for _ in range(count):
+            user_a, user_b = rng.choice(users), rng.choice(users)
+            if user_b in expected.get(user_a, ()) and rng.random() < 0.3:
+                graph.remove_edge(user_a, user_b)
+                expected[user_a].discard(user_b)
+            else:
+                graph.add_edge(user_a, user_b)
+                expected.setdefault(user_a, set()).add(user_b)
+
+    def test_recovery_matches_applied_mutations(self):
+        """Test recovery from checkpoints plus log tail against a plain dict"""
+        rng = random.Random(37)
+        expected = {}
+        with DurableGraph(self.directory, checkpoint_every=150) as graph:
+            self.mutate(graph, expected, rng, 400)
+        connections, last_lsn = recover(self.directory)
+        self.assertEqual(connections, expected)
+        self.assertEqual(last_lsn, 400)
+        with DurableGraph(self.directory) as graph:
+            self.assertEqual(graph.connections, expected)
+            self.mutate(graph, expected, rng, 50)
+        self.assertEqual(recover(self.directory), (expected, 450))
+
+    def test_torn_tail_is_dropped_and_overwritten(self):
+        """Test that a half-written last record is ignored and truncated on reopen"""
+        with DurableGraph(self.directory, "always") as graph:
+            graph.add_edge("user1", "user2")
+            graph.add_edge("user1", "user3")
+        path = self.last_segment()
+        _, valid = read_records(path)
+        with open(path, "r+b") as handle:
+            handle.truncate(valid - 3)
+        self.assertEqual(recover(self.directory), ({"user1": {"user2"}}, 1))
+
+        with DurableGraph(self.directory, "always") as graph:
+            self.assertEqual(graph.connections, {"user1": {"user2"}})
+            graph.add_edge("user2", "user4")
+        records, valid = read_records(path)
+        self.assertEqual(valid, os.path.getsize(path))
+        self.assertEqual([(lsn, names) for lsn, _, names in records], [(1, ["user1", "user2"]), (2, ["user2", "user4"])])
+        self.assertEqual(recover(self.directory), ({"user1": {"user2"}, "user2": {"user4"}}, 2))
+
+    def test_corrupt_record_ends_log(self):
+        """Test that a checksum mismatch stops replay at that record"""
+        with DurableGraph(self.directory, "none") as graph:
+            for friend in ("user2", "user3", "user4"):
+                graph.add_edge("user1", friend)
+        path = self.last_segment()
+        with open(path, "r+b") as handle:
+            data = bytearray(handle.read())
+            data[-1] ^= 0xFF
+            handle.seek(0)
+            handle.write(data)
+        self.assertEqual(recover(self.directory), ({"user1": {"user2", "user3"}}, 2))
+
+    def test_checkpoint_round_trip(self):
+        """Test that checkpoints keep users with and without rows"""
+        connections = reference.sample_connections()
+        connections["user11"] = set()
+        connections["user1"].add("user12")
+        write_checkpoint(self.directory, connections, 7)
+        self.assertEqual(read_checkpoint(self.directory), (connections, 7))
+
+    def test_idle_records_are_synced(self):
+        """Test that a burst below batch_size is synced after batch_interval of idle time"""
+        log = WriteAheadLog(self.directory, "batch", batch_size=1000, batch_interval=0.02)
+        try:
+            for _ in range(3):
+                log.append(ADD_EDGE, "user1", "user2")
+            deadline = time.monotonic() + 2
+            while log.syncs == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(log.syncs, 1)
+        finally:
+            log.close()
+
+if __name__ == '__main__':
+    unittest.main()
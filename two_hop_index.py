@@ -0,0 +1,319 @@
+"""
+Two-Hop Index
+This module materializes the friend-of-friend neighborhoods of frequently
+queried users and keeps them fresh as connections change.
+"""
+
+import heapq
+from collections.abc import Mapping
+
+from lazy_analysis import iter_recommendations
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_ADMIT_AFTER = 3
+# Share of the memory budget that query counters may use before they are aged
+COUNTER_SHARE = 0.1
+
+
+class TwoHopIndex(Mapping):
+   """
+   Connections mapping with materialized 2-hop neighborhoods for hot users.
+
+   For every indexed user the index stores how many of the user's friends
+   link to each other user (the number of 2-hop paths). Second-degree checks
+   and depth-2 recommendations for indexed users are then answered without
+   traversal; all other users fall back to the usual traversal.
+
+   Users are admitted once they have been queried admit_after times. The
+   memory budget is counted in stored entries: one per (user, 2-hop user)
+   pair and one per query counter. When it is exceeded the least frequently
+   queried users are evicted. Counters may use COUNTER_SHARE of the budget;
+   when they fill it, every counter is halved and cold users whose counter
+   reaches zero are forgotten. Edge changes must go through
+   add_edge/remove_edge to keep the index fresh.
+   """
+
+   # add_edge/remove_edge update connections too, so GraphBatch routes edges here
+   owns_adjacency = True
+
+   def __init__(self, connections, max_entries=DEFAULT_MAX_ENTRIES, admit_after=DEFAULT_ADMIT_AFTER, users=None):
+      if connections is None:
+         raise ValueError("Connections data cannot be None")
+      if max_entries < 0:
+         raise ValueError("Memory budget must be non-negative")
+      self.connections = connections
+      self.max_entries = max_entries
+      self.admit_after = admit_after
+      self.entries = 0
+      self.max_counters = int(max_entries * COUNTER_SHARE) or min(max_entries, 1)
+      self.stats = {"hits": 0, "misses": 0, "admitted": 0, "evicted": 0, "aged": 0}
+      self._paths = {}
+      self._watchers = {}
+      self._frequency = {}
+      self._max_frequency = 0
+      # (frequency, user) of indexed users; entries whose frequency changed
+      # or whose user was evicted are skipped when they reach the top
+      self._heap = []
+      if users:
+         self.index_users(users)
+
+   @property
+   def indexed_users(self):
+      """set: Users whose 2-hop neighborhood is materialized."""
+      return set(self._paths)
+
+   def _build(self, user):
+      """Count the 2-hop paths from a user."""
+      paths = {}
+      for friend in self.connections[user]:
+         for member in self.connections.get(friend, ()):
+            paths[member] = paths.get(member, 0) + 1
+      return paths
+
+   def _evict(self, user):
+      paths = self._paths.pop(user)
+      self.entries -= len(paths)
+      for friend in self.connections.get(user, ()):
+         watchers = self._watchers.get(friend)
+         if watchers is not None:
+            watchers.discard(user)
+            if not watchers:
+               del self._watchers[friend]
+      self.stats["evicted"] += 1
+
+   def _count(self, user, frequency):
+      """Store the query counter of a user, aging the counters when they are full."""
+      if user not in self._frequency:
+         if len(self._frequency) >= self.max_counters:
+            self._age()
+            if len(self._frequency) >= self.max_counters:
+               return
+         self.entries += 1
+      self._frequency[user] = frequency
+      self._max_frequency = max(self._max_frequency, frequency)
+      if user in self._paths:
+         heapq.heappush(self._heap, (frequency, user))
+         if len(self._heap) > 2 * len(self._paths) + 16:
+            self._rebuild_heap()
+
+   def _age(self):
+      """Halve every counter until at most half the counters are left or none drop out."""
+      while len(self._frequency) > self.max_counters // 2:
+         kept = {}
+         for user, frequency in self._frequency.items():
+            if frequency > 1 or user in self._paths:
+               kept[user] = max(1, frequency // 2)
+         dropped = len(self._frequency) - len(kept)
+         self._frequency = kept
+         self.entries -= dropped
+         self.stats["aged"] += 1
+         if not dropped:
+            break
+      self._max_frequency = max(self._frequency.values(), default=0)
+      self._rebuild_heap()
+
+   def _rebuild_heap(self):
+      self._heap = [(self._frequency.get(user, 0), user) for user in self._paths]
+      heapq.heapify(self._heap)
+
+   def _coldest(self):
+      """Get the least frequently queried indexed user, or None."""
+      heap = self._heap
+      while heap:
+         frequency, user = heap[0]
+         if user in self._paths and self._frequency.get(user, 0) == frequency:
+            return user
+         heapq.heappop(heap)
+      return None
+
+   def _make_room(self, needed, protect=None):
+      """Evict least frequently queried users until needed entries fit."""
+      while self.entries + needed > self.max_entries:
+         victim = self._coldest()
+         if victim is None:
+            return False
+         if protect is not None and self._frequency.get(victim, 0) >= self._frequency.get(protect, 0):
+            return False
+         heapq.heappop(self._heap)
+         self._evict(victim)
+      return True
+
+   def _admit(self, user):
+      """Materialize a user if it fits the budget; return its paths or None."""
+      paths = self._build(user)
+      if len(paths) > self.max_entries or not self._make_room(len(paths), protect=user):
+         return None
+      self._paths[user] = paths
+      self.entries += len(paths)
+      heapq.heappush(self._heap, (self._frequency.get(user, 0), user))
+      for friend in self.connections[user]:
+         self._watchers.setdefault(friend, set()).add(user)
+      self.stats["admitted"] += 1
+      return paths
+
+   def index_users(self, users):
+      """
+      Materialize the 2-hop neighborhoods of the given users.
+
+      Args:
+          users (iterable): Users to index, most important first
+
+      Returns:
+          int: Number of users that fit within the memory budget
+      """
+      indexed = 0
+      for user in users:
+         if user not in self.connections:
+            raise ValueError(f"User {user} not found in connections")
+         # Explicitly requested users outrank everything queried so far
+         self._count(user, self._max_frequency + 1)
+         if user in self._paths or self._admit(user) is not None:
+            indexed += 1
+      return indexed
+
+   def index_hot_users(self, fraction=0.01):
+      """
+      Materialize the most frequently queried users.
+
+      Args:
+          fraction (float): Share of all users to index
+
+      Returns:
+          int: Number of users that fit within the memory budget
+      """
+      if not 0 <= fraction <= 1:
+         raise ValueError("Fraction must be between 0 and 1")
+      count = int(len(self.connections) * fraction)
+      hot = sorted(self._frequency, key=lambda user: (-self._frequency[user], user))[:count]
+      indexed = 0
+      for user in hot:
+         if user in self._paths or self._admit(user) is not None:
+            indexed += 1
+      return indexed
+
+   def _lookup(self, user):
+      """Record a query and return the user's 2-hop paths, or None if not indexed."""
+      frequency = self._frequency.get(user, 0) + 1
+      self._count(user, frequency)
+      paths = self._paths.get(user)
+      if paths is None and frequency >= self.admit_after:
+         paths = self._admit(user)
+      self.stats["hits" if paths is not None else "misses"] += 1
+      return paths
+
+   def is_second_degree(self, user_a, user_b):
+      """
+      Check if two users are connected through a mutual friend.
+
+      Args:
+          user_a (str): First user
+          user_b (str): Second user
+
+      Returns:
+          bool: True if second-degree connected, False otherwise
+      """
+      if user_a not in self.connections:
+         raise ValueError(f"User {user_a} not found in connections")
+      direct = self.connections[user_a]
+      if user_a == user_b or user_b in direct:
+         return False
+      paths = self._lookup(user_a)
+      if paths is not None:
+         return user_b in paths
+      return any(user_b in self.connections.get(friend, ()) for friend in direct)
+
+   def recommendations(self, user, depth=2):
+      """
+      Recommend new connections based on friends of friends.
+
+      Args:
+          user (str): User to make recommendations for
+          depth (int): Connection depth for recommendations
+
+      Returns:
+          set: Set of recommended connections
+      """
+      if user not in self.connections:
+         raise ValueError(f"User {user} not found in connections")
+      paths = self._lookup(user) if depth == 2 else None
+      if paths is None:
+         return set(iter_recommendations(user, self.connections, depth))
+      direct = self.connections[user]
+      return {member for member in paths if member != user and member not in direct}
+
+   def _bump(self, paths, member, delta):
+      value = paths.get(member, 0) + delta
+      if value:
+         if member not in paths:
+            self.entries += 1
+         paths[member] = value
+      else:
+         del paths[member]
+         self.entries -= 1
+
+   def add_user(self, user):
+      """
+      Add a user without connections.
+
+      Args:
+          user (str): User name
+      """
+      self.connections.setdefault(user, set())
+
+   def add_edge(self, user_a, user_b):
+      """
+      Add a connection from user_a to user_b and update affected indexed users.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      friends = self.connections.setdefault(user_a, set())
+      if user_b in friends:
+         return
+      friends.add(user_b)
+      # Indexed users with user_a as a friend gain a path to user_b
+      for watcher in tuple(self._watchers.get(user_a, ())):
+         self._bump(self._paths[watcher], user_b, 1)
+      # An indexed user_a gains paths to all of user_b's friends
+      paths = self._paths.get(user_a)
+      if paths is not None:
+         for member in self.connections.get(user_b, ()):
+            self._bump(paths, member, 1)
+         self._watchers.setdefault(user_b, set()).add(user_a)
+      self._make_room(0)
+
+   def remove_edge(self, user_a, user_b):
+      """
+      Remove the connection from user_a to user_b and update affected indexed users.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      friends = self.connections.get(user_a, ())
+      if user_b not in friends:
+         raise ValueError(f"User {user_b} is not a connection of {user_a}")
+      paths = self._paths.get(user_a)
+      if paths is not None:
+         for member in self.connections.get(user_b, ()):
+            self._bump(paths, member, -1)
+         watchers = self._watchers[user_b]
+         watchers.discard(user_a)
+         if not watchers:
+            del self._watchers[user_b]
+      for watcher in tuple(self._watchers.get(user_a, ())):
+         self._bump(self._paths[watcher], user_b, -1)
+      friends.discard(user_b)
+
+   def __getitem__(self, user):
+      return self.connections[user]
+
+   def __iter__(self):
+      return iter(self.connections)
+
+   def __len__(self):
+      return len(self.connections)
+
+   def __contains__(self, user):
+      return user in self.connections
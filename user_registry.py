@@ -0,0 +1,213 @@
+"""
+User Registry
+This module stores per-user attributes column-wise in typed arrays indexed by
+interned user ID, with lightweight record views and column-at-a-time filters.
+"""
+
+from array import array
+from datetime import date
+
+from graph_core import UserInterner
+
+NO_DATE = 0
+NO_REGION = 0
+
+
+class UserRecord:
+   """
+   View of one user's attributes stored in a UserRegistry.
+   """
+
+   __slots__ = ("_registry", "uid")
+
+   def __init__(self, registry, uid):
+      self._registry = registry
+      self.uid = uid
+
+   @property
+   def name(self):
+      """str: User name."""
+      return self._registry.interner.name_of(self.uid)
+
+   @property
+   def join_date(self):
+      """date: Join date, or None if unknown."""
+      day = self._registry.join_days[self.uid]
+      return date.fromordinal(day) if day != NO_DATE else None
+
+   @join_date.setter
+   def join_date(self, value):
+      self._registry.join_days[self.uid] = value.toordinal() if value is not None else NO_DATE
+
+   @property
+   def region(self):
+      """str: Region, or None if unknown."""
+      return self._registry.regions[self._registry.region_codes[self.uid]]
+
+   @region.setter
+   def region(self, value):
+      self._registry.region_codes[self.uid] = self._registry.region_code(value)
+
+   @property
+   def activity_score(self):
+      """float: Activity score."""
+      return self._registry.activity_scores[self.uid]
+
+   @activity_score.setter
+   def activity_score(self, value):
+      self._registry.activity_scores[self.uid] = value
+
+   def __repr__(self):
+      return (f"UserRecord({self.name!r}, join_date={self.join_date!r}, "
+              f"region={self.region!r}, activity_score={self.activity_score!r})")
+
+
+class UserRegistry:
+   """
+   Per-user attributes stored as one typed array per attribute.
+
+   Join dates are day ordinals, regions are small integer codes into a
+   shared vocabulary and activity scores are doubles, so a user costs a few
+   bytes per attribute instead of a dict. Region codes take two bytes and
+   widen to four once the vocabulary outgrows them.
+   """
+
+   def __init__(self, interner=None):
+      self.interner = interner if interner is not None else UserInterner()
+      self.join_days = array("l", [NO_DATE] * len(self.interner))
+      self.region_codes = array("H", [NO_REGION] * len(self.interner))
+      self.activity_scores = array("d", [0.0] * len(self.interner))
+      self.regions = [None]
+      self._region_ids = {None: NO_REGION}
+
+   @classmethod
+   def from_records(cls, records):
+      """
+      Build a registry from a dict of per-user attribute dicts.
+
+      Args:
+          records (dict): Dictionary with users as keys and dicts with
+              "join_date", "region" and "activity_score" as values
+
+      Returns:
+          UserRegistry: The populated registry
+      """
+      registry = cls()
+      for name, attributes in records.items():
+         registry.add_user(name, **attributes)
+      return registry
+
+   def region_code(self, region):
+      """
+      Get the code of a region, adding it to the vocabulary if new.
+
+      Args:
+          region (str): Region name, or None for unknown
+
+      Returns:
+          int: Region code
+      """
+      code = self._region_ids.get(region)
+      if code is None:
+         code = len(self.regions)
+         if code >= 1 << 8 * self.region_codes.itemsize:
+            self.region_codes = array("I", self.region_codes)
+         self.regions.append(region)
+         self._region_ids[region] = code
+      return code
+
+   def add_user(self, name, join_date=None, region=None, activity_score=0.0):
+      """
+      Add a user or overwrite the attributes of an existing one.
+
+      Args:
+          name (str): User name
+          join_date (date): Join date
+          region (str): Region name
+          activity_score (float): Activity score
+
+      Returns:
+          UserRecord: View of the user's attributes
+      """
+      uid = self.interner.intern(name)
+      while len(self.join_days) <= uid:
+         self.join_days.append(NO_DATE)
+         self.region_codes.append(NO_REGION)
+         self.activity_scores.append(0.0)
+      record = UserRecord(self, uid)
+      record.join_date = join_date
+      record.region = region
+      record.activity_score = activity_score
+      return record
+
+   def __getitem__(self, name):
+      uid = self.interner.id_of(name)
+      if uid >= len(self.join_days):
+         raise ValueError(f"User {name} has no registered attributes")
+      return UserRecord(self, uid)
+
+   def __contains__(self, name):
+      return name in self.interner and self.interner.id_of(name) < len(self.join_days)
+
+   def __len__(self):
+      return len(self.join_days)
+
+   def select_ids(self, users=None, region=None, min_activity=None, max_activity=None,
+                  joined_after=None, joined_before=None):
+      """
+      Find the IDs of users matching every given condition.
+
+      Conditions are applied one column at a time to the surviving IDs.
+
+      Args:
+          users (set): Restrict to these users (unknown users are ignored)
+          region (str or set): Required region or set of regions
+          min_activity (float): Minimum activity score
+          max_activity (float): Maximum activity score
+          joined_after (date): Earliest join date (inclusive)
+          joined_before (date): Latest join date (inclusive)
+
+      Returns:
+          list: Matching user IDs in ascending order
+      """
+      count = len(self.join_days)
+      if users is None:
+         ids = range(count)
+      else:
+         ids = sorted(uid for uid in map(self.interner.get, users)
+                      if uid is not None and uid < count)
+
+      if region is not None:
+         wanted = {region} if isinstance(region, str) else set(region)
+         codes = {self._region_ids[name] for name in wanted if name in self._region_ids}
+         column = self.region_codes
+         ids = [uid for uid in ids if column[uid] in codes]
+      if min_activity is not None:
+         column = self.activity_scores
+         ids = [uid for uid in ids if column[uid] >= min_activity]
+      if max_activity is not None:
+         column = self.activity_scores
+         ids = [uid for uid in ids if column[uid] <= max_activity]
+      if joined_after is not None:
+         first_day = joined_after.toordinal()
+         column = self.join_days
+         ids = [uid for uid in ids if column[uid] != NO_DATE and column[uid] >= first_day]
+      if joined_before is not None:
+         last_day = joined_before.toordinal()
+         column = self.join_days
+         ids = [uid for uid in ids if column[uid] != NO_DATE and column[uid] <= last_day]
+      return list(ids)
+
+   def filter(self, users=None, **conditions):
+      """
+      Find users matching every given condition, e.g. active users in tech_group.
+
+      Args:
+          users (set): Restrict to these users
+          **conditions: Conditions accepted by select_ids
+
+      Returns:
+          set: Set of matching users
+      """
+      names = self.interner.names
+      return {names[uid] for uid in self.select_ids(users, **conditions)}
@@ -0,0 +1,507 @@
+"""
+Versioned Graph Store
+This module keeps a history of connections and group memberships in
+persistent hash tries, so snapshots share every block that did not change.
+"""
+
+import time
+from bisect import bisect_right
+from collections.abc import Mapping, Set
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+
+
+class _Entry:
+   __slots__ = ("key", "value", "hash")
+
+   def __init__(self, key, value, key_hash):
+      self.key = key
+      self.value = value
+      self.hash = key_hash
+
+
+class _Node:
+   """Bitmap-indexed trie node holding only its occupied slots."""
+
+   __slots__ = ("bitmap", "slots")
+
+   def __init__(self, bitmap, slots):
+      self.bitmap = bitmap
+      self.slots = slots
+
+
+class _Collision:
+   """Entries whose 64-bit hashes are identical."""
+
+   __slots__ = ("entries",)
+
+   def __init__(self, entries):
+      self.entries = entries
+
+
+def _hash(key):
+   return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _lookup(node, shift, key_hash, key):
+   while node is not None:
+      if isinstance(node, _Collision):
+         for entry in node.entries:
+            if entry.key == key:
+               return entry
+         return None
+      bit = 1 << ((key_hash >> shift) & _MASK)
+      if not node.bitmap & bit:
+         return None
+      slot = node.slots[(node.bitmap & (bit - 1)).bit_count()]
+      if isinstance(slot, _Entry):
+         return slot if slot.key == key else None
+      node = slot
+      shift += _BITS
+   return None
+
+
+def _merge(shift, first, second):
+   """Build the smallest subtree holding two entries with different keys."""
+   if shift >= _HASH_BITS:
+      return _Collision((first, second))
+   index_a = (first.hash >> shift) & _MASK
+   index_b = (second.hash >> shift) & _MASK
+   if index_a == index_b:
+      return _Node(1 << index_a, (_merge(shift + _BITS, first, second),))
+   if index_a < index_b:
+      return _Node((1 << index_a) | (1 << index_b), (first, second))
+   return _Node((1 << index_a) | (1 << index_b), (second, first))
+
+
+def _assoc(node, shift, entry):
+   """Return a copy of the path to entry.key with the entry replaced or added."""
+   if node is None:
+      return _Node(1 << ((entry.hash >> shift) & _MASK), (entry,))
+   if isinstance(node, _Collision):
+      kept = tuple(old for old in node.entries if old.key != entry.key)
+      return _Collision(kept + (entry,))
+
+   bit = 1 << ((entry.hash >> shift) & _MASK)
+   position = (node.bitmap & (bit - 1)).bit_count()
+   if not node.bitmap & bit:
+      slots = node.slots[:position] + (entry,) + node.slots[position:]
+      return _Node(node.bitmap | bit, slots)
+
+   slot = node.slots[position]
+   if isinstance(slot, _Entry):
+      replacement = entry if slot.key == entry.key else _merge(shift + _BITS, slot, entry)
+   else:
+      replacement = _assoc(slot, shift + _BITS, entry)
+   return _Node(node.bitmap, node.slots[:position] + (replacement,) + node.slots[position + 1:])
+
+
+def _dissoc(node, shift, key_hash, key):
+   """Return a copy of the path without key, or None if the node becomes empty."""
+   if isinstance(node, _Collision):
+      kept = tuple(entry for entry in node.entries if entry.key != key)
+      if len(kept) == 1:
+         return kept[0]
+      return _Collision(kept) if kept else None
+
+   bit = 1 << ((key_hash >> shift) & _MASK)
+   position = (node.bitmap & (bit - 1)).bit_count()
+   slot = node.slots[position]
+   if isinstance(slot, _Entry):
+      replacement = None
+   else:
+      replacement = _dissoc(slot, shift + _BITS, key_hash, key)
+      if isinstance(replacement, _Node) and len(replacement.slots) == 1 \
+            and isinstance(replacement.slots[0], _Entry):
+         replacement = replacement.slots[0]
+
+   if replacement is None:
+      if node.bitmap == bit:
+         return None
+      return _Node(node.bitmap & ~bit, node.slots[:position] + node.slots[position + 1:])
+   return _Node(node.bitmap, node.slots[:position] + (replacement,) + node.slots[position + 1:])
+
+
+def _build(entries, shift):
+   """Build a trie from entries with distinct keys in one pass."""
+   # The root is always a node; below it a lone entry sits directly in its slot
+   if len(entries) == 1 and shift:
+      return entries[0]
+   if shift >= _HASH_BITS:
+      return _Collision(tuple(entries))
+   buckets = {}
+   for entry in entries:
+      buckets.setdefault((entry.hash >> shift) & _MASK, []).append(entry)
+   bitmap = 0
+   for index in buckets:
+      bitmap |= 1 << index
+   slots = tuple(_build(buckets[index], shift + _BITS) for index in sorted(buckets))
+   return _Node(bitmap, slots)
+
+
+def _iter_entries(node):
+   if node is None:
+      return
+   if isinstance(node, _Collision):
+      yield from node.entries
+      return
+   for slot in node.slots:
+      if isinstance(slot, _Entry):
+         yield slot
+      else:
+         yield from _iter_entries(slot)
+
+
+class PersistentMap(Mapping):
+   """
+   Immutable hash array mapped trie.
+
+   ``set`` and ``delete`` return a new map that copies only the trie path to
+   the changed key and shares every other node with the original.
+   """
+
+   __slots__ = ("_root", "_size")
+
+   def __init__(self, root=None, size=0):
+      self._root = root
+      self._size = size
+
+   def set(self, key, value):
+      """
+      Get a copy of the map with key set to value.
+
+      Args:
+          key: Hashable key
+          value: Value to store
+
+      Returns:
+          PersistentMap: The updated map
+      """
+      key_hash = _hash(key)
+      existed = _lookup(self._root, 0, key_hash, key) is not None
+      root = _assoc(self._root, 0, _Entry(key, value, key_hash))
+      return PersistentMap(root, self._size if existed else self._size + 1)
+
+   def delete(self, key):
+      """
+      Get a copy of the map without key.
+
+      Args:
+          key: Hashable key
+
+      Returns:
+          PersistentMap: The updated map
+      """
+      key_hash = _hash(key)
+      if _lookup(self._root, 0, key_hash, key) is None:
+         raise KeyError(key)
+      return PersistentMap(_dissoc(self._root, 0, key_hash, key), self._size - 1)
+
+   def __getitem__(self, key):
+      entry = _lookup(self._root, 0, _hash(key), key)
+      if entry is None:
+         raise KeyError(key)
+      return entry.value
+
+   def __contains__(self, key):
+      return _lookup(self._root, 0, _hash(key), key) is not None
+
+   def __iter__(self):
+      return (entry.key for entry in _iter_entries(self._root))
+
+   def __len__(self):
+      return self._size
+
+   def items(self):
+      return ((entry.key, entry.value) for entry in _iter_entries(self._root))
+
+
+class PersistentSet(Set):
+   """
+   Immutable set stored in the same hash trie as PersistentMap.
+
+   ``add`` and ``discard`` copy only the trie path to the changed member, so
+   changing one connection of a user with many friends does not copy the
+   other friends.
+   """
+
+   __slots__ = ("_root", "_size", "_frozen")
+
+   def __init__(self, root=None, size=0):
+      self._root = root
+      self._size = size
+      self._frozen = None
+
+   @classmethod
+   def from_iterable(cls, members):
+      """
+      Build a set from an iterable of members.
+
+      Args:
+          members (iterable): Hashable members
+
+      Returns:
+          PersistentSet: The new set
+      """
+      entries = [_Entry(member, None, _hash(member)) for member in dict.fromkeys(members)]
+      if not entries:
+         return _EMPTY_SET
+      return cls(_build(entries, 0), len(entries))
+
+   @classmethod
+   def _from_iterable(cls, members):
+      # Results of the inherited &, | and - operators
+      return cls.from_iterable(members)
+
+   def add(self, member):
+      """
+      Get a copy of the set with member added.
+
+      Args:
+          member: Hashable member
+
+      Returns:
+          PersistentSet: The updated set (self if member was present)
+      """
+      member_hash = _hash(member)
+      if _lookup(self._root, 0, member_hash, member) is not None:
+         return self
+      return PersistentSet(_assoc(self._root, 0, _Entry(member, None, member_hash)), self._size + 1)
+
+   def discard(self, member):
+      """
+      Get a copy of the set without member.
+
+      Args:
+          member: Hashable member
+
+      Returns:
+          PersistentSet: The updated set (self if member was absent)
+      """
+      member_hash = _hash(member)
+      if _lookup(self._root, 0, member_hash, member) is None:
+         return self
+      return PersistentSet(_dissoc(self._root, 0, member_hash, member), self._size - 1)
+
+   def frozen(self):
+      """
+      Get the members as a frozenset, built on the first call and kept.
+
+      Returns:
+          frozenset: The members
+      """
+      if self._frozen is None:
+         self._frozen = frozenset(self)
+      return self._frozen
+
+   def __contains__(self, member):
+      return _lookup(self._root, 0, _hash(member), member) is not None
+
+   def __iter__(self):
+      return (entry.key for entry in _iter_entries(self._root))
+
+   def __len__(self):
+      return self._size
+
+
+_EMPTY_SET = PersistentSet()
+
+
+class GraphSnapshot(Mapping):
+   """
+   Read-only connections and groups as of one committed version.
+
+   The snapshot is a mapping from user to a frozenset of connections, so it
+   can be passed as ``connections`` to every analysis function. Rows that
+   did not change between versions share one frozenset.
+   """
+
+   __slots__ = ("version", "timestamp", "_adjacency", "_groups")
+
+   def __init__(self, version, timestamp, adjacency, groups):
+      self.version = version
+      self.timestamp = timestamp
+      self._adjacency = adjacency
+      self._groups = groups
+
+   @property
+   def communities(self):
+      """dict: Group sets as of this snapshot, ready for identify_bridge_users."""
+      return {name: set(members) for name, members in self._groups.items()}
+
+   def group(self, name):
+      """
+      Get the members of one group as of this snapshot.
+
+      Args:
+          name (str): Group name
+
+      Returns:
+          frozenset: Set of group members
+      """
+      members = self._groups.get(name)
+      return frozenset() if members is None else members.frozen()
+
+   def __getitem__(self, user):
+      return self._adjacency[user].frozen()
+
+   def __contains__(self, user):
+      return user in self._adjacency
+
+   def __iter__(self):
+      return iter(self._adjacency)
+
+   def __len__(self):
+      return len(self._adjacency)
+
+
+class VersionedGraph:
+   """
+   Mutable graph whose committed versions stay readable.
+
+   Mutations build new persistent maps and ``commit`` records the current
+   maps under a timestamp, so a snapshot costs one list entry. Neighbour
+   sets and group members are PersistentSets too, so every version only
+   owns the trie paths to the users and members that changed.
+   """
+
+   def __init__(self, connections=None, groups=None, timestamp=None):
+      adjacency = PersistentMap()
+      for user, friends in (connections or {}).items():
+         adjacency = adjacency.set(user, PersistentSet.from_iterable(friends))
+      group_map = PersistentMap()
+      for name, members in (groups or {}).items():
+         group_map = group_map.set(name, PersistentSet.from_iterable(members))
+      self._adjacency = adjacency
+      self._groups = group_map
+      self._timestamps = []
+      self._versions = []
+      if connections is not None or groups is not None:
+         self.commit(timestamp)
+
+   def add_user(self, user):
+      """
+      Add a user with no connections.
+
+      Args:
+          user (str): User to add
+      """
+      if user not in self._adjacency:
+         self._adjacency = self._adjacency.set(user, _EMPTY_SET)
+
+   def add_edge(self, user_a, user_b):
+      """
+      Add a connection from user_a to user_b.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      friends = self._adjacency.get(user_a, _EMPTY_SET)
+      if user_b not in friends:
+         self._adjacency = self._adjacency.set(user_a, friends.add(user_b))
+
+   def remove_edge(self, user_a, user_b):
+      """
+      Remove the connection from user_a to user_b.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      friends = self._adjacency.get(user_a)
+      if friends is None or user_b not in friends:
+         raise ValueError(f"User {user_b} is not a connection of {user_a}")
+      self._adjacency = self._adjacency.set(user_a, friends.discard(user_b))
+
+   def add_member(self, group, user):
+      """
+      Add a user to a group.
+
+      Args:
+          group (str): Group name
+          user (str): User to add
+      """
+      members = self._groups.get(group, _EMPTY_SET)
+      if user not in members:
+         self._groups = self._groups.set(group, members.add(user))
+
+   def remove_member(self, group, user):
+      """
+      Remove a user from a group.
+
+      Args:
+          group (str): Group name
+          user (str): User to remove
+      """
+      members = self._groups.get(group)
+      if members is None or user not in members:
+         raise ValueError(f"User {user} is not a member of {group}")
+      self._groups = self._groups.set(group, members.discard(user))
+
+   def commit(self, timestamp=None):
+      """
+      Record the current state as a new version.
+
+      Args:
+          timestamp: Comparable time of the version (default: time.time())
+
+      Returns:
+          int: Version number
+      """
+      if timestamp is None:
+         timestamp = time.time()
+      if self._timestamps and timestamp < self._timestamps[-1]:
+         raise ValueError("Versions must be committed in timestamp order")
+      self._timestamps.append(timestamp)
+      self._versions.append((self._adjacency, self._groups))
+      return len(self._versions) - 1
+
+   @property
+   def num_versions(self):
+      """int: Number of committed versions."""
+      return len(self._versions)
+
+   def snapshot(self, version=-1):
+      """
+      Get a committed version by number.
+
+      Args:
+          version (int): Version number (default: latest)
+
+      Returns:
+          GraphSnapshot: Read-only view of that version
+      """
+      if not self._versions:
+         raise ValueError("No versions have been committed")
+      number = version if version >= 0 else len(self._versions) + version
+      if not 0 <= number < len(self._versions):
+         raise ValueError(f"Version {version} does not exist")
+      adjacency, groups = self._versions[number]
+      return GraphSnapshot(number, self._timestamps[number], adjacency, groups)
+
+   def as_of(self, timestamp):
+      """
+      Get the latest version committed at or before a timestamp.
+
+      Args:
+          timestamp: Point in time to read
+
+      Returns:
+          GraphSnapshot: Read-only view of that version
+      """
+      number = bisect_right(self._timestamps, timestamp) - 1
+      if number < 0:
+         raise ValueError(f"No version exists as of {timestamp}")
+      return self.snapshot(number)
+
+   def head(self):
+      """
+      Get a read-only view of the uncommitted current state.
+
+      Returns:
+          GraphSnapshot: View of the current state
+      """
+      return GraphSnapshot(None, None, self._adjacency, self._groups)
@@ -0,0 +1,419 @@
+"""
+Write-Ahead Log
+This module makes graph mutations durable with an append-only log, group
+commit fsync batching and periodic binary checkpoints. Recovery loads the
+last checkpoint and replays only the log records written after it.
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+ADD_USER = 1
+ADD_EDGE = 2
+REMOVE_EDGE = 3
+
+FSYNC_POLICIES = ("always", "batch", "none")
+
+CHECKPOINT_NAME = "checkpoint.bin"
+_CHECKPOINT_MAGIC = b"SNGC0001"
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+_RECORD_HEADER = struct.Struct("<II")
+_RECORD_FIXED = struct.Struct("<QB")
+_NAME_LENGTH = struct.Struct("<H")
+_CHECKPOINT_HEADER = struct.Struct("<8sQI")
+
+
+def _encode_names(names):
+   parts = []
+   for name in names:
+      data = name.encode("utf-8")
+      parts.append(_NAME_LENGTH.pack(len(data)))
+      parts.append(data)
+   return b"".join(parts)
+
+
+def _decode_names(payload, offset):
+   names = []
+   while offset < len(payload):
+      (length,) = _NAME_LENGTH.unpack_from(payload, offset)
+      offset += _NAME_LENGTH.size
+      names.append(payload[offset:offset + length].decode("utf-8"))
+      offset += length
+   return names
+
+
+def _segment_path(directory, start_lsn):
+   return os.path.join(directory, f"{_SEGMENT_PREFIX}{start_lsn:020d}{_SEGMENT_SUFFIX}")
+
+
+def _segments(directory):
+   """List (start_lsn, path) of the log segments in LSN order."""
+   found = []
+   for name in os.listdir(directory):
+      if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+         found.append((int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]), os.path.join(directory, name)))
+   return sorted(found)
+
+
+def _fsync_directory(directory):
+   fd = os.open(directory, os.O_RDONLY)
+   try:
+      os.fsync(fd)
+   finally:
+      os.close(fd)
+
+
+def read_records(path):
+   """
+   Read the valid records of one log segment.
+
+   Reading stops at the first torn or corrupt record, which marks the end of
+   what was durably written.
+
+   Args:
+       path (str): Segment file path
+
+   Returns:
+       tuple: (list of (lsn, op, names) records, byte length of the valid prefix)
+   """
+   with open(path, "rb") as handle:
+      data = handle.read()
+   records = []
+   offset = 0
+   while offset + _RECORD_HEADER.size <= len(data):
+      length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+      start = offset + _RECORD_HEADER.size
+      payload = data[start:start + length]
+      if len(payload) < length or zlib.crc32(payload) != checksum:
+         break
+      lsn, op = _RECORD_FIXED.unpack_from(payload)
+      records.append((lsn, op, _decode_names(payload, _RECORD_FIXED.size)))
+      offset = start + length
+   return records, offset
+
+
+def apply_record(connections, op, names):
+   """
+   Apply one logged mutation to a connections dict.
+
+   Args:
+       connections (dict): Dictionary of user connections
+       op (int): ADD_USER, ADD_EDGE or REMOVE_EDGE
+       names (list): User names of the record
+   """
+   if op == ADD_USER:
+      connections.setdefault(names[0], set())
+   elif op == ADD_EDGE:
+      connections.setdefault(names[0], set()).add(names[1])
+   elif op == REMOVE_EDGE:
+      connections.get(names[0], set()).discard(names[1])
+   else:
+      raise ValueError(f"Unknown log operation {op}")
+
+
+def _id_bytes(ids):
+   ids = array("I", ids)
+   if sys.byteorder == "big":
+      ids.byteswap()
+   return ids.tobytes()
+
+
+def _bytes_ids(data):
+   ids = array("I")
+   ids.frombytes(data)
+   if sys.byteorder == "big":
+      ids.byteswap()
+   return ids
+
+
+def write_checkpoint(directory, connections, lsn):
+   """
+   Atomically write a binary snapshot of connections.
+
+   Args:
+       directory (str): Log directory
+       connections (dict): Dictionary of user connections
+       lsn (int): Last log sequence number included in the snapshot
+   """
+   names = set(connections)
+   for friends in connections.values():
+      names.update(friends)
+   names = sorted(names)
+   ids = {name: uid for uid, name in enumerate(names)}
+
+   body = [_encode_names(names)]
+   for name in names:
+      friends = connections.get(name)
+      if friends is None:
+         body.append(struct.pack("<i", -1))
+         continue
+      body.append(struct.pack("<i", len(friends)))
+      body.append(_id_bytes(sorted(ids[friend] for friend in friends)))
+   names_size = len(body[0])
+   payload = struct.pack("<Q", names_size) + b"".join(body)
+
+   path = os.path.join(directory, CHECKPOINT_NAME)
+   tmp_path = path + ".tmp"
+   with open(tmp_path, "wb") as handle:
+      handle.write(_CHECKPOINT_HEADER.pack(_CHECKPOINT_MAGIC, lsn, len(names)))
+      handle.write(payload)
+      handle.write(struct.pack("<I", zlib.crc32(payload)))
+      handle.flush()
+      os.fsync(handle.fileno())
+   os.replace(tmp_path, path)
+   _fsync_directory(directory)
+
+
+def read_checkpoint(directory):
+   """
+   Load the binary snapshot of a log directory.
+
+   Args:
+       directory (str): Log directory
+
+   Returns:
+       tuple: (connections dict, last included LSN), or ({}, 0) without a checkpoint
+   """
+   path = os.path.join(directory, CHECKPOINT_NAME)
+   if not os.path.exists(path):
+      return {}, 0
+   with open(path, "rb") as handle:
+      data = handle.read()
+   magic, lsn, count = _CHECKPOINT_HEADER.unpack_from(data)
+   if magic != _CHECKPOINT_MAGIC:
+      raise ValueError(f"{path} is not a graph checkpoint")
+   payload = data[_CHECKPOINT_HEADER.size:-4]
+   if zlib.crc32(payload) != struct.unpack("<I", data[-4:])[0]:
+      raise ValueError(f"Checkpoint {path} is corrupt")
+
+   (names_size,) = struct.unpack_from("<Q", payload)
+   offset = 8
+   names = _decode_names(payload[offset:offset + names_size], 0)
+   offset += names_size
+   connections = {}
+   for name in names:
+      (degree,) = struct.unpack_from("<i", payload, offset)
+      offset += 4
+      if degree < 0:
+         continue
+      ids = _bytes_ids(payload[offset:offset + 4 * degree])
+      offset += 4 * degree
+      connections[name] = {names[uid] for uid in ids}
+   if len(names) != count:
+      raise ValueError(f"Checkpoint {path} is corrupt")
+   return connections, lsn
+
+
+def recover(directory):
+   """
+   Rebuild connections from the last checkpoint and the log tail after it.
+
+   Args:
+       directory (str): Log directory
+
+   Returns:
+       tuple: (connections dict, last recovered LSN)
+   """
+   connections, last_lsn = read_checkpoint(directory)
+   for _, path in _segments(directory):
+      records, _ = read_records(path)
+      for lsn, op, names in records:
+         if lsn > last_lsn:
+            apply_record(connections, op, names)
+            last_lsn = lsn
+   return connections, last_lsn
+
+
+class WriteAheadLog:
+   """
+   Append-only log of graph mutations.
+
+   With the "batch" policy, records are group-committed: one fsync covers
+   every record appended since the previous one, issued after batch_size
+   records or when sync() is called. A background flusher thread also syncs
+   records that have waited batch_interval seconds, so a burst followed by
+   idle time is still made durable.
+   """
+
+   def __init__(self, directory, fsync_policy="batch", batch_size=1024, batch_interval=0.05, next_lsn=1):
+      if fsync_policy not in FSYNC_POLICIES:
+         raise ValueError(f"Unknown fsync policy {fsync_policy!r}")
+      self.directory = directory
+      self.fsync_policy = fsync_policy
+      self.batch_size = batch_size
+      self.batch_interval = batch_interval
+      self.next_lsn = next_lsn
+      self.syncs = 0
+      self._pending = 0
+      self._last_sync = time.monotonic()
+      self._lock = threading.Lock()
+      self._closed = threading.Event()
+      self._handle = None
+      self._open_segment()
+      self._flusher = None
+      if fsync_policy == "batch":
+         self._flusher = threading.Thread(target=self._flush_idle, name="wal-flusher", daemon=True)
+         self._flusher.start()
+
+   def _open_segment(self):
+      segments = _segments(self.directory)
+      if segments:
+         path = segments[-1][1]
+         _, valid = read_records(path)
+         with open(path, "r+b") as handle:
+            handle.truncate(valid)
+      else:
+         path = _segment_path(self.directory, self.next_lsn)
+      self._handle = open(path, "ab")
+
+   def append(self, op, *names):
+      """
+      Append one mutation record.
+
+      Args:
+          op (int): ADD_USER, ADD_EDGE or REMOVE_EDGE
+          *names (str): User names of the mutation
+
+      Returns:
+          int: Log sequence number of the record
+      """
+      with self._lock:
+         lsn = self.next_lsn
+         payload = _RECORD_FIXED.pack(lsn, op) + _encode_names(names)
+         self._handle.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+         self._handle.write(payload)
+         self.next_lsn += 1
+         self._pending += 1
+
+         if self.fsync_policy == "always":
+            self._sync()
+         elif self.fsync_policy == "batch":
+            if self._pending >= self.batch_size or time.monotonic() - self._last_sync >= self.batch_interval:
+               self._sync()
+      return lsn
+
+   def _flush_idle(self):
+      """Sync records left pending for batch_interval seconds until the log closes."""
+      while not self._closed.wait(self.batch_interval):
+         with self._lock:
+            if self._pending and time.monotonic() - self._last_sync >= self.batch_interval:
+               self._sync()
+
+   def sync(self):
+      """Flush and fsync every record appended so far."""
+      with self._lock:
+         self._sync()
+
+   def _sync(self):
+      self._handle.flush()
+      if self.fsync_policy != "none" and self._pending:
+         os.fsync(self._handle.fileno())
+         self.syncs += 1
+      self._pending = 0
+      self._last_sync = time.monotonic()
+
+   def rotate(self):
+      """Start a new segment and delete the segments before it."""
+      with self._lock:
+         self._sync()
+         old_path = self._handle.name
+         self._handle.close()
+         self._handle = open(_segment_path(self.directory, self.next_lsn), "ab")
+         new_path = self._handle.name
+      for _, path in _segments(self.directory):
+         if path != new_path and path <= old_path:
+            os.remove(path)
+      _fsync_directory(self.directory)
+
+   def close(self):
+      """Sync and close the log."""
+      self._closed.set()
+      if self._flusher is not None:
+         self._flusher.join()
+      if self._handle is not None:
+         self.sync()
+         self._handle.close()
+         self._handle = None
+
+
+class DurableGraph:
+   """
+   Connections dict whose mutations are logged before they are applied.
+
+   Opening a directory recovers the previous state. checkpoint() writes a
+   snapshot and drops the log segments it covers; with checkpoint_every set,
+   this happens automatically after that many mutations.
+   """
+
+   def __init__(self, directory, fsync_policy="batch", checkpoint_every=None, **log_options):
+      os.makedirs(directory, exist_ok=True)
+      self.directory = directory
+      self.connections, last_lsn = recover(directory)
+      self.checkpoint_every = checkpoint_every
+      self._since_checkpoint = 0
+      self.log = WriteAheadLog(directory, fsync_policy, next_lsn=last_lsn + 1, **log_options)
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc_info):
+      self.close()
+
+   def _mutate(self, op, *names):
+      self.log.append(op, *names)
+      apply_record(self.connections, op, names)
+      self._since_checkpoint += 1
+      if self.checkpoint_every and self._since_checkpoint >= self.checkpoint_every:
+         self.checkpoint()
+
+   def add_user(self, user):
+      """
+      Add a user with no connections.
+
+      Args:
+          user (str): User to add
+      """
+      self._mutate(ADD_USER, user)
+
+   def add_edge(self, user_a, user_b):
+      """
+      Add a connection from user_a to user_b.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      self._mutate(ADD_EDGE, user_a, user_b)
+
+   def remove_edge(self, user_a, user_b):
+      """
+      Remove the connection from user_a to user_b.
+
+      Args:
+          user_a (str): Source user
+          user_b (str): Target user
+      """
+      if user_b not in self.connections.get(user_a, ()):
+         raise ValueError(f"User {user_b} is not a connection of {user_a}")
+      self._mutate(REMOVE_EDGE, user_a, user_b)
+
+   def sync(self):
+      """Make every applied mutation durable."""
+      self.log.sync()
+
+   def checkpoint(self):
+      """Write a snapshot of the current state and drop the covered log."""
+      self.log.sync()
+      write_checkpoint(self.directory, self.connections, self.log.next_lsn - 1)
+      self.log.rotate()
+      self._since_checkpoint = 0
+
+   def close(self):
+      """Sync and close the log."""
+      self.log.close()